@@ -127,7 +127,7 @@ sudo chown "$USER:$USER" "$SERVICE_DIR/ecosystem.config.js"
 echo -e "${BLUE}🔥 Firewall-Regeln prüfen...${NC}"
 if command -v ufw &> /dev/null; then
     sudo ufw allow 6969/tcp comment "PIMIC Audio Web Interface"
-    sudo ufw allow 420:520/tcp comment "PIMIC Audio Streams"
+    sudo ufw allow 9419/tcp comment "PIMIC Audio Ingest"
     echo -e "${GREEN}✅ UFW Regeln hinzugefügt${NC}"
 fi
 
@@ -156,7 +156,7 @@ if [[ "$PM2_STATUS" == "online" ]]; then
     echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo ""
     echo -e "${YELLOW}📡 Web Interface: http://$IP:6969${NC}"
-    echo -e "${YELLOW}🎧 Stream Ports:  420+${NC}"
+    echo -e "${YELLOW}🎧 Ingest Port:   9419${NC}"
     echo -e "${YELLOW}🐍 Python Service: PM2 Managed${NC}"
     echo -e "${YELLOW}🚀 No Dependencies: Standard Library Only${NC}"
     echo -e "${YELLOW}📁 Templates:     $SERVICE_DIR/templates/${NC}"
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+PIMIC Audio Streaming Service - Micro-Benchmarks
+Misst Hot-Path-Funktionen des Servers ohne externe Dependencies
+
+Usage:
+    python3 pimic_benchmark.py unmask
+    python3 pimic_benchmark.py keepalive [--tls] [--mode threaded]
+    python3 pimic_benchmark.py routes
+    python3 pimic_benchmark.py levels
+    python3 pimic_benchmark.py stress [--threads 32]
+    python3 pimic_benchmark.py ingest [--mode threaded]
+    python3 pimic_benchmark.py ports [--streams 400]
+    python3 pimic_benchmark.py logging
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pimic_minimal_server as server
+
+
+def measure_throughput(func, payload_size: int, min_seconds: float = 0.5) -> float:
+    """Run func repeatedly for at least min_seconds and return MB/s"""
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        func()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    return (payload_size * iterations) / elapsed / (1024 * 1024)
+
+
+def legacy_unmask(payload: bytes, mask: bytes) -> bytes:
+    """Byte-at-a-time unmasking as used before the fast path"""
+    return bytes(payload[i] ^ mask[i % 4] for i in range(len(payload)))
+
+
+def int_xor_unmask(payload: bytes, mask: bytes) -> bytes:
+    """Stdlib fast path forced regardless of NumPy availability"""
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(key, 'little')).to_bytes(length, 'little')
+
+
+def bench_unmask(args):
+    """WebSocket payload unmasking throughput for 1 KB, 64 KB and 1 MB frames"""
+    mask = os.urandom(4)
+    variants = [('legacy generator', legacy_unmask), ('int xor', int_xor_unmask)]
+    if server.numpy is not None:
+        variants.append(('numpy / auto', server.unmask_websocket_payload))
+    else:
+        print("NumPy not installed - skipping NumPy variant")
+
+    print(f"{'frame size':>12}  {'variant':<18} {'MB/s':>10}")
+    for size in (1024, 64 * 1024, 1024 * 1024):
+        payload = os.urandom(size)
+        expected = legacy_unmask(payload, mask)
+        for name, func in variants:
+            if func(payload, mask) != expected:
+                print(f"{name} produced wrong output for {size} bytes")
+                return 1
+            # The legacy loop is slow enough that one pass gives a stable figure
+            seconds = 0.2 if func is legacy_unmask else args.seconds
+            throughput = measure_throughput(lambda: func(payload, mask), size, seconds)
+            print(f"{size:>12}  {name:<18} {throughput:>10.1f}")
+    return 0
+
+
+def legacy_level(data: bytes) -> tuple:
+    """Byte-average "level" over the newest 1 KB as computed before metering"""
+    sample = data[-1024:]
+    level = min(100, (sum(abs(b - 128) for b in sample) / len(sample) / 128.0) * 100)
+    peak = max(abs(b - 128) for b in sample) / 128.0 * 100
+    return level, peak
+
+
+def bench_levels(args):
+    """Level metering cost per 20 ms block and per /api/audio/levels call"""
+    frame = os.urandom(960 * 2)  # 20 ms of 48 kHz mono s16le
+    opus_frame = bytes([0xfc]) + os.urandom(159)
+    meter = server.LevelMeter()
+    opus_meter = server.LevelMeter()
+    variants = [
+        ('legacy byte loop', lambda: legacy_level(frame)),
+        ('meter pcm', lambda: meter.add_pcm(frame)),
+        ('meter opus-bitrate', lambda: opus_meter.add_opus_frame(opus_frame, 128000)),
+    ]
+    print(f"NumPy: {'yes' if server.numpy is not None else 'no'}")
+    print(f"{'variant':<22} {'blocks/s':>12} {'us/block':>10}")
+    for name, func in variants:
+        rate = measure_throughput(func, 1024 * 1024, args.seconds)
+        print(f"{name:<22} {rate:>12.0f} {1e6 / rate:>10.1f}")
+    
+    handler = server.AudioStreamHandler()
+    for index in range(20):
+        client_ip = f"10.0.0.{index}"
+        handler.handle_config_message({'format': 'audio/pcm', 'clientIP': client_ip}, client_ip)
+        handler.handle_stream_audio_data(frame, client_ip)
+    rate = measure_throughput(handler.get_audio_levels, 1024 * 1024, args.seconds)
+    print(f"{'get_audio_levels (20 clients)':<30} {rate:>8.0f} calls/s")
+    return 0
+
+
+def bench_stress(args):
+    """Concurrent ingest, API reads and registry churn; fails if any bytes are lost"""
+    logging.disable(logging.WARNING)
+    handler = server.AudioStreamHandler()
+    streamer = server.RTPStreamer()
+    clients = [f"10.99.0.{index}" for index in range(args.clients)]
+    for client_ip in clients:
+        handler.remove_client(client_ip)
+    chunk = os.urandom(1920)  # 20 ms of 48 kHz mono s16le
+    sent = {client_ip: 0 for client_ip in clients}
+    sent_lock = threading.Lock()
+    errors = []
+    stop = threading.Event()
+    
+    def ingest(worker: int):
+        # Workers start together on clients without state, so state creation races too
+        counts = dict.fromkeys(clients, 0)
+        try:
+            for round_index in range(args.rounds):
+                client_ip = clients[(worker + round_index) % len(clients)]
+                if worker % 2:
+                    handler.handle_http_audio_data(chunk, client_ip)
+                else:
+                    handler.handle_stream_audio_data(chunk, client_ip)
+                counts[client_ip] += len(chunk)
+        except Exception as e:
+            errors.append(f"ingest: {e!r}")
+        with sent_lock:
+            for client_ip, count in counts.items():
+                sent[client_ip] += count
+    
+    def read_api():
+        # The read-mostly endpoints iterate the registries while they change
+        try:
+            while not stop.is_set():
+                json.dumps(handler.get_audio_levels())
+                json.dumps(handler.get_ingest_stats())
+                json.dumps(server.get_public_streams())
+                json.dumps(streamer.get_active_streams())
+                json.dumps(server.audio_levels.snapshot())
+        except Exception as e:
+            errors.append(f"reader: {e!r}")
+    
+    def churn(worker: int):
+        # Short-lived streams and clients next to the measured ones
+        try:
+            index = 0
+            while not stop.is_set():
+                stream_id = f"stress-{worker}-{index % 8}"
+                server.active_streams[stream_id] = {'id': stream_id, 'port': 0, 'client_id': stream_id}
+                server.audio_levels[stream_id] = {'level': index % 100, 'db': -20, 'timestamp': time.time()}
+                server.active_streams.pop(f"stress-{worker}-{(index + 4) % 8}", None)
+                server.audio_levels.pop(f"stress-{worker}-{(index + 4) % 8}", None)
+                ephemeral = f"10.98.{worker}.{index % 8}"
+                handler.handle_config_message({'format': 'audio/pcm', 'clientIP': ephemeral}, ephemeral)
+                handler.remove_client(f"10.98.{worker}.{(index + 4) % 8}")
+                index += 1
+        except Exception as e:
+            errors.append(f"churn: {e!r}")
+    
+    background = [threading.Thread(target=read_api) for _ in range(args.readers)]
+    background += [threading.Thread(target=churn, args=(worker,)) for worker in range(2)]
+    writers = [threading.Thread(target=ingest, args=(worker,)) for worker in range(args.threads)]
+    for thread in background:
+        thread.start()
+    start = time.perf_counter()
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in background:
+        thread.join()
+    
+    lost = 0
+    for client_ip in clients:
+        client_data = handler.audio_clients.get(client_ip)
+        received = client_data['buffer'].write_pos if client_data is not None else 0
+        lost += sent[client_ip] - received
+    total = sum(sent.values())
+    print(f"{args.threads} ingest threads, {args.readers} API readers, 2 churn threads, {len(clients)} clients")
+    print(f"sent {total} bytes in {elapsed:.2f} s ({total / elapsed / (1024 * 1024):.1f} MB/s), lost {lost} bytes")
+    for error in errors[:10]:
+        print(error)
+    for client_ip in clients:
+        handler.remove_client(client_ip)
+    return 1 if lost or errors else 0
+
+
+def legacy_route(path: str) -> str:
+    """The if/elif chain do_GET used before the routing table"""
+    request_path = path.split('?')[0]
+    if path == '/':
+        return 'serve_index'
+    elif path == '/api/streams':
+        return 'serve_streams_api'
+    elif path == '/api/config':
+        return 'serve_config_api'
+    elif path == '/api/network':
+        return 'serve_network_api'
+    elif request_path == '/api/events':
+        return 'serve_events_stream'
+    elif path == '/health':
+        return 'serve_health'
+    elif path == '/api/rtp/streams':
+        return 'serve_rtp_streams_api'
+    elif path == '/api/audio/levels':
+        return 'serve_audio_levels_api'
+    elif path == '/api/audio/ingest':
+        return 'serve_audio_ingest_api'
+    elif path.startswith('/static/'):
+        return 'serve_static_file'
+    elif request_path.startswith('/client/') and request_path.endswith('/stream'):
+        return 'serve_client_stream'
+    elif request_path.startswith('/client/') and request_path.endswith('/audio'):
+        return 'serve_client_audio_player'
+    elif request_path.startswith('/client/') and request_path.endswith('/wav'):
+        return 'serve_client_wav_stream'
+    elif path == '/ws/audio-stream':
+        return 'handle_audio_websocket_upgrade'
+    elif path == '/ws':
+        return 'handle_websocket_upgrade'
+    return None
+
+
+def bench_routes(args):
+    """GET route lookups per second: if/elif chain vs routing table"""
+    paths = ['/', '/health', '/api/audio/levels', '/static/app.js',
+             '/client/192.168.1.20/stream', '/client/192.168.1.20/wav', '/ws', '/missing']
+    
+    def table_route(path: str):
+        route, _params = server.HTTP_ROUTES.match(path)
+        return route['methods']['GET'] if route is not None else None
+    
+    print(f"{'path':<30} {'if/elif (k/s)':>14} {'table (k/s)':>12}")
+    for path in paths:
+        if legacy_route(path) != table_route(path):
+            print(f"Route mismatch for {path}: {legacy_route(path)} vs {table_route(path)}")
+            return 1
+        rates = []
+        for func in (legacy_route, table_route):
+            # With a "payload" of 1 MiB, MB/s equals calls per second
+            rates.append(measure_throughput(lambda: func(path), 1024 * 1024, args.seconds) / 1000)
+        print(f"{path:<30} {rates[0]:>14.0f} {rates[1]:>12.0f}")
+    return 0
+
+
+def start_benchmark_server(mode: str, ssl_context=None) -> int:
+    """Start the HTTP server in-process on a free port and return the port"""
+    # Request logging would dominate the measurement
+    logging.disable(logging.WARNING)
+    server.HTTPHandler.log_message = lambda self, *args: None
+    
+    if mode == 'threaded':
+        http_server = server.ThreadingHTTPServer(('127.0.0.1', 0), server.HTTPHandler)
+        if ssl_context is not None:
+            http_server.socket = ssl_context.wrap_socket(http_server.socket, server_side=True)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        return http_server.server_address[1]
+    
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    async_server = server.AsyncPimicServer(ssl_context)
+    server.global_async_server = async_server
+    threading.Thread(target=async_server.run, args=([('127.0.0.1', port, ssl_context is not None)],),
+                     daemon=True).start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return port
+
+
+def benchmark_ssl_context(cert_file: str, key_file: str):
+    """Server TLS context from the given files or a throwaway self-signed cert"""
+    if not (cert_file and key_file and Path(cert_file).exists() and Path(key_file).exists()):
+        temp_dir = tempfile.mkdtemp(prefix='pimic-bench-')
+        cert_file = os.path.join(temp_dir, 'server.crt')
+        key_file = os.path.join(temp_dir, 'server.key')
+        try:
+            subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                            '-subj', '/CN=localhost', '-keyout', key_file, '-out', cert_file],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Cannot create a test certificate ({e}) - pass --cert/--key")
+            return None
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_file, key_file)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    return context
+
+
+def check_unread_bodies(port: int, client_context=None) -> list:
+    """Keep-alive framing when a route answers without reading the body
+
+    Each probe sends a request whose body looks like another request,
+    followed by a real ``GET /health``. The body must be skipped (or the
+    connection closed), never answered as a request of its own.
+    """
+    smuggled = b'GET /evil HTTP/1.1\r\nHost: x\r\n\r\n'
+    probes = [
+        ('OPTIONS', '/api/network', 200),
+        ('POST', '/api/network', 405),
+        ('GET', '/api/stream/stop', 405),
+    ]
+    failures = []
+    for method, path, expected in probes:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+        if client_context is not None:
+            sock = client_context.wrap_socket(sock)
+        sock.sendall(
+            f'{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(smuggled)}\r\n\r\n'.encode()
+            + smuggled + b'GET /health HTTP/1.1\r\nHost: x\r\n\r\n'
+        )
+        sock.settimeout(1.0)
+        received = b''
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                received += data
+        except socket.timeout:
+            pass
+        sock.close()
+        statuses = [int(line.split()[1]) for line in received.split(b'\r\n') if line.startswith(b'HTTP/1.1 ')]
+        # The follow-up GET is answered (200) unless the server chose to close
+        if not statuses or statuses[0] != expected or statuses[1:] not in ([], [200]):
+            failures.append(f"{method} {path}: responses {statuses}")
+    return failures
+
+
+def bench_keepalive(args):
+    """Requests/s and CPU per request with a new connection per request vs keep-alive"""
+    server_context = benchmark_ssl_context(args.cert, args.key) if args.tls else None
+    if args.tls and server_context is None:
+        return 1
+    port = start_benchmark_server(args.mode, server_context)
+    
+    def new_connection():
+        if server_context is None:
+            return http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        client_context = ssl._create_unverified_context()
+        return http.client.HTTPSConnection('127.0.0.1', port, timeout=10, context=client_context)
+    
+    def one_per_connection():
+        # Behaviour before keep-alive: every request paid for a TCP (and TLS) handshake
+        connection = new_connection()
+        connection.request('GET', args.path, headers={'Connection': 'close'})
+        connection.getresponse().read()
+        connection.close()
+    
+    failures = check_unread_bodies(port, ssl._create_unverified_context() if server_context else None)
+    for failure in failures:
+        print(f"Unread request body desynced the connection - {failure}")
+    if failures:
+        return 1
+    
+    persistent = new_connection()
+    
+    def keep_alive():
+        persistent.request('GET', args.path)
+        response = persistent.getresponse()
+        response.read()
+        if response.getheader('Connection', '').lower() == 'close':
+            persistent.close()
+    
+    scheme = 'https' if server_context else 'http'
+    print(f"{args.mode} server, {scheme}, GET {args.path}, {args.requests} requests per variant")
+    print("CPU time covers client and server, both run in this process")
+    print(f"{'variant':<20} {'req/s':>10} {'CPU ms/req':>12}")
+    for name, func in (('new connection', one_per_connection), ('keep-alive', keep_alive)):
+        func()  # warm up
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        for _ in range(args.requests):
+            func()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        print(f"{name:<20} {args.requests / wall:>10.0f} {cpu * 1000 / args.requests:>12.3f}")
+    persistent.close()
+    return 0
+
+
+def bench_ingest(args):
+    """Audio chunks/s via one HTTP upload per chunk vs a TCP stream port"""
+    port = start_benchmark_server(args.mode)
+    chunk = os.urandom(1920)  # 20 ms of 48 kHz mono s16le
+    
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request('POST', '/api/stream/start', json.dumps({'port': args.stream_port, 'format': 'audio/pcm'}),
+                       {'Content-Type': 'application/json'})
+    stream = json.loads(connection.getresponse().read())
+    if not stream.get('success'):
+        print(f"Stream start failed: {stream.get('error')}")
+        return 1
+    client_ip = stream['config']['client_ip']
+    
+    def http_chunks():
+        for _ in range(args.chunks):
+            connection.request('POST', '/api/audio/raw', chunk, {
+                'Content-Type': 'application/octet-stream',
+                'X-Client-IP': client_ip
+            })
+            connection.getresponse().read()
+    
+    def tcp_stream():
+        with socket.create_connection(('127.0.0.1', stream['port'])) as ingest:
+            if stream.get('handshake'):
+                # Shared ingest port: name the stream, wait for "OK"
+                ingest.sendall(stream['handshake'].encode())
+                ingest.makefile('rb').readline()
+            for _ in range(args.chunks):
+                ingest.sendall(chunk)
+        # Wait until the server has taken in everything
+        deadline = time.monotonic() + 10
+        while stream_ingest()['bytes_received'] < args.chunks * len(chunk) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    def stream_ingest():
+        connection.request('GET', f"/api/streams/{stream['streamId']}")
+        return json.loads(connection.getresponse().read())['stream']['ingest']
+    
+    print(f"{args.mode} server, {args.chunks} chunks of {len(chunk)} bytes per variant")
+    print(f"{'variant':<20} {'chunks/s':>10} {'CPU us/chunk':>14}")
+    for name, func in (('HTTP per chunk', http_chunks), ('TCP stream port', tcp_stream)):
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        func()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        print(f"{name:<20} {args.chunks / wall:>10.0f} {cpu * 1e6 / args.chunks:>14.1f}")
+    
+    connection.request('POST', '/api/stream/stop', json.dumps({'streamId': stream['streamId']}),
+                       {'Content-Type': 'application/json'})
+    connection.getresponse().read()
+    connection.close()
+    return 0
+
+
+def legacy_rtp_port(active_rtp_streams: dict) -> int:
+    """RTP port search of start_rtp_stream before the port pool"""
+    rtp_port = 5004
+    while rtp_port in [stream['port'] for stream in active_rtp_streams.values()]:
+        rtp_port += 2
+    return rtp_port
+
+
+def bench_ports(args):
+    """RTP stream start latency as the number of running streams grows"""
+    logging.disable(logging.WARNING)
+    streamer = server.RTPStreamer()
+    handler = server.AudioStreamHandler()
+    destination = [{'host': '127.0.0.1', 'port': 9}]
+    legacy_streams = {}
+    checkpoints = sorted({count for count in (1, 50, 100, 200, 400, args.streams) if count <= args.streams})
+    print(f"{'streams':>8} {'linear scan (us)':>17} {'start_rtp_stream (us)':>22}")
+    errors = 0
+    try:
+        for index in range(1, args.streams + 1):
+            client_ip = f"10.{index // 250}.{index % 250}.1"
+            started = time.perf_counter()
+            legacy_streams[client_ip] = {'port': legacy_rtp_port(legacy_streams)}
+            legacy_us = (time.perf_counter() - started) * 1e6
+            
+            started = time.perf_counter()
+            result = streamer.start_rtp_stream(client_ip, handler, destination)
+            start_us = (time.perf_counter() - started) * 1e6
+            if not result['success']:
+                errors += 1
+                print(f"Start failed at stream {index}: {result['error']}")
+                break
+            if index in checkpoints:
+                print(f"{index:>8} {legacy_us:>17.1f} {start_us:>22.1f}")
+        print(f"Port pool: {server.rtp_port_pool.stats()}")
+    finally:
+        for client_ip in list(streamer.active_rtp_streams):
+            streamer.stop_rtp_stream(client_ip)
+    return 1 if errors else 0
+
+
+def bench_logging(args):
+    """Cost of the per-chunk log line: synchronous f-string vs queued, rate-limited"""
+    log_dir = tempfile.mkdtemp(prefix='pimic-log-bench-')
+    devnull = open(os.devnull, 'w')
+    formatter = logging.Formatter(server.LoggingService.FORMAT)
+    
+    def bench_logger(name: str, handlers: list) -> logging.Logger:
+        bench = logging.getLogger(f'pimic-bench-{name}')
+        bench.propagate = False
+        bench.setLevel(logging.INFO)
+        for handler in handlers:
+            bench.addHandler(handler)
+        return bench
+    
+    def writers(name: str) -> list:
+        handlers = [logging.FileHandler(os.path.join(log_dir, f'{name}.log')), logging.StreamHandler(devnull)]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        return handlers
+    
+    legacy = bench_logger('legacy', writers('legacy'))
+    log_queue = queue.Queue(server.CONFIG['log_queue_size'])
+    queue_handler = server.DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(server.LogRateLimiter(server.CONFIG['log_rate_limits']))
+    listener = logging.handlers.QueueListener(log_queue, *writers('queued'))
+    listener.start()
+    queued = bench_logger('queued', [queue_handler])
+    
+    data = b'\x00' * 4096
+    buffer_size = 1024 * 1024
+    variants = [
+        ('legacy INFO f-string', lambda: legacy.info(
+            f"HTTP audio data received from 10.0.0.1: {len(data)} bytes, buffer size: {buffer_size} bytes")),
+        ('queued INFO, 1/s sampled', lambda: queued.info(
+            "HTTP audio data received from %s: %d bytes, buffer size: %d bytes",
+            '10.0.0.1', len(data), buffer_size, extra={'event': 'audio_chunk'})),
+        ('DEBUG (level off)', lambda: queued.debug(
+            "HTTP audio data received from %s: %d bytes, buffer size: %d bytes",
+            '10.0.0.1', len(data), buffer_size, extra={'event': 'audio_chunk'})),
+    ]
+    print(f"{'variant':<26} {'calls/s':>12} {'us/call':>10}")
+    try:
+        for name, func in variants:
+            rate = measure_throughput(func, 1024 * 1024, args.seconds)
+            print(f"{name:<26} {rate:>12.0f} {1e6 / rate:>10.2f}")
+    finally:
+        listener.stop()
+        devnull.close()
+        shutil.rmtree(log_dir, ignore_errors=True)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PIMIC hot path micro-benchmarks')
+    parser.add_argument('--seconds', type=float, default=0.5,
+                        help='Minimum measuring time per variant')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.add_parser('unmask', help=bench_unmask.__doc__)
+    subparsers.add_parser('routes', help=bench_routes.__doc__)
+    subparsers.add_parser('levels', help=bench_levels.__doc__)
+    stress_parser = subparsers.add_parser('stress', help=bench_stress.__doc__)
+    stress_parser.add_argument('--threads', type=int, default=32, help='Concurrent ingest threads')
+    stress_parser.add_argument('--readers', type=int, default=4, help='Threads polling the API views')
+    stress_parser.add_argument('--clients', type=int, default=8)
+    stress_parser.add_argument('--rounds', type=int, default=2000, help='Chunks sent per ingest thread')
+    keepalive_parser = subparsers.add_parser('keepalive', help=bench_keepalive.__doc__)
+    keepalive_parser.add_argument('--mode', choices=['asyncio', 'threaded'], default='asyncio')
+    keepalive_parser.add_argument('--tls', action='store_true', help='Measure over HTTPS')
+    keepalive_parser.add_argument('--cert', help='Certificate file (default: temporary self-signed)')
+    keepalive_parser.add_argument('--key', help='Key file for --cert')
+    keepalive_parser.add_argument('--requests', type=int, default=500)
+    keepalive_parser.add_argument('--path', default='/health')
+
+    ingest_parser = subparsers.add_parser('ingest', help=bench_ingest.__doc__)
+    ingest_parser.add_argument('--mode', choices=['asyncio', 'threaded'], default='asyncio')
+    ingest_parser.add_argument('--chunks', type=int, default=2000)
+    ingest_parser.add_argument('--stream-port', type=int, default=19420,
+                               help='TCP port for the test stream (per-stream port mode only)')
+    ports_parser = subparsers.add_parser('ports', help=bench_ports.__doc__)
+    ports_parser.add_argument('--streams', type=int, default=400, help='RTP streams to start')
+    subparsers.add_parser('logging', help=bench_logging.__doc__)
+
+    args = parser.parse_args()
+    benchmarks = {
+        'unmask': bench_unmask,
+        'keepalive': bench_keepalive,
+        'routes': bench_routes,
+        'levels': bench_levels,
+        'stress': bench_stress,
+        'ingest': bench_ingest,
+        'ports': bench_ports,
+        'logging': bench_logging,
+    }
+    if args.benchmark not in benchmarks:
+        parser.print_help()
+        return 1
+    return benchmarks[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
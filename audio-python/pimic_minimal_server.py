@@ -6,27 +6,65 @@ Port 6969 für Web Interface, Browser-basierte Audio-Verarbeitung
 """
 
 import asyncio
+import array
+import atexit
+import collections
+import collections.abc
+import ctypes
+import ctypes.util
+import errno
 import json
+import math
+import operator
 import os
+import queue
 import sys
 import time
 import signal
 import logging
+import logging.handlers
+import ssl
 import threading
 import socket
 import socket
 import subprocess
-import platform
+import random
+import ipaddress
+import selectors
 from datetime import datetime
 from typing import Dict, List, Optional, Set
 from pathlib import Path
 from http.server import HTTPServer, SimpleHTTPRequestHandler, ThreadingHTTPServer
 import socketserver
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, unquote
 import base64
 import hashlib
 import struct
 import hashlib
+import gzip
+import re
+import shutil
+import functools
+import heapq
+import http.client
+import io
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy
+except ImportError:  # Optional: vectorized paths fall back to the standard library
+    numpy = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: network info falls back to the host name
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:  # Optional: static assets are then precompressed with gzip only
+    brotli = None
 
 # Configuration
 CONFIG = {
@@ -36,129 +74,1104 @@ CONFIG = {
     'min_bitrate': 64,
     'sample_rate': 44100,
     'channels': 2,
-    'chunk_size': 1024
+    'chunk_size': 1024,
+    'client_buffer_size': 1024 * 1024,  # Ring buffer capacity per client (bytes)
+    'buffer_overflow_policy': 'drop_oldest',  # 'drop_oldest' or 'drop_newest'
+    'websocket_max_message_size': 1024 * 1024,  # Reassembled message limit (bytes)
+    'websocket_push_interval': 0.05,  # Max seconds a push socket waits before delivering events
+    'level_event_interval': 0.1,  # Seconds between pushed level updates
+    'event_queue_size': 64,  # Pending events per SSE/WebSocket client
+    'sse_heartbeat_interval': 15.0,  # Seconds between SSE keep-alive events
+    'server_mode': os.environ.get('PIMIC_SERVER_MODE', 'asyncio'),  # 'asyncio' or 'threaded'
+    'async_worker_threads': 4,  # Executor threads for non-streaming routes in asyncio mode
+    'http_idle_timeout': 15.0,  # Seconds an idle keep-alive connection stays open
+    'http_max_keepalive_requests': 100,  # Requests per connection before it is closed
+    'max_request_body': 16 * 1024 * 1024,  # Largest accepted request body (bytes)
+    'rtp_packet_time': 0.02,  # Seconds of audio per RTP packet (ptime)
+    'rtp_clock_rate': 48000,  # RTP media clock (Hz), fixed at 48 kHz for Opus
+    'rtp_max_catchup': 5,  # Late ticks sent back-to-back before the schedule resyncs
+    'opus_frame_queue': 250,  # Demuxed Opus frames held per client for RTP (250 x 20 ms)
+    'rtcp_interval': 5.0,  # Seconds between RTCP sender reports (RFC 3550 minimum)
+    'rtp_default_destination': {'host': '224.0.0.1', 'ttl': 1},  # Used when /api/rtp/start names no destinations
+    'ingest_jitter_factor': 4.0,  # Jitter buffer target in arrival-jitter multiples (higher = more robust, more latency)
+    'ingest_jitter_min_ms': 50,  # Lower bound of the jitter buffer target delay (reorder window)
+    'ingest_jitter_max_ms': 1000,  # Upper bound of the jitter buffer target delay
+    'static_cache_max_file_size': 1024 * 1024,  # Larger static files are read from disk per request
+    'network_info_ttl': 60.0,  # Seconds interface addresses are cached (netlink changes invalidate sooner)
+    'level_rms_window': 0.3,  # Seconds of audio averaged into the RMS level
+    'level_peak_window': 1.5,  # Seconds a sample/true peak is held by the meter
+    'opus_decoder': os.environ.get('PIMIC_OPUS_DECODER', 'auto'),  # 'auto', 'libopus', 'ffmpeg' or 'off'
+    'libopus_path': os.environ.get('PIMIC_LIBOPUS'),  # libopus shared library (default: system search)
+    'ffmpeg_binary': os.environ.get('PIMIC_FFMPEG', 'ffmpeg'),  # Decoder subprocess when libopus is missing
+    'ffmpeg_stop_timeout': 2.0,  # Seconds ffmpeg may take to exit after stdin EOF before it is killed
+    'pcm_buffer_seconds': 10.0,  # Decoded PCM kept per client for WAV, metering and L16 RTP
+    'stream_recv_buffer': 64 * 1024,  # Preallocated recv_into buffer per TCP ingest connection (bytes)
+    'stream_so_rcvbuf': 256 * 1024,  # SO_RCVBUF of TCP ingest sockets (0 = OS default)
+    'stream_tcp_nodelay': True,  # TCP_NODELAY on TCP ingest connections
+    'stream_ports': os.environ.get('PIMIC_STREAM_PORTS', 'shared'),  # 'shared' ingest port or 'per_stream' (compatibility)
+    'ingest_port': 9419,  # Shared TCP ingest port, connections name their stream in a handshake
+    'ingest_handshake_timeout': 5.0,  # Seconds a new ingest connection has to send its stream id
+    'rtp_port_range': (5004, 5999),  # RTP/RTCP port pairs (RTP on the even port)
+    'stream_port_range': (9420, 9519),  # Per-stream TCP ports when stream_ports is 'per_stream'
+    'port_probe_attempts': 8,  # Ports tried when the OS refuses a bind before start fails
+    'log_level': os.environ.get('PIMIC_LOG_LEVEL', 'INFO'),  # Initial level, changeable at runtime via /api/logging
+    'log_file': os.environ.get('PIMIC_LOG_FILE', '/tmp/pimic-audio.log'),  # Empty: stdout only
+    'log_max_bytes': 5 * 1024 * 1024,  # Log file size at which it is rotated
+    'log_backup_count': 3,  # Rotated log files kept next to the current one
+    'log_queue_size': 10000,  # Records waiting for the writer thread before new ones are dropped
+    'log_rate_limits': {'audio_chunk': 1.0, 'http_request': 5.0}  # Records/s per event type below WARNING (0 = none)
 }
 
+
+class CopyOnWriteDict(collections.abc.MutableMapping):
+    """Shared registry dict with lock-free reads and copy-on-write updates
+
+    The published mapping is never modified in place: writers copy it under
+    a lock and swap in the copy with one reference assignment. Readers -
+    API endpoints walking all clients or streams - iterate a consistent
+    snapshot without locking and never see "dictionary changed size during
+    iteration". Updates are O(n) and meant for rare changes (connect,
+    disconnect, start, stop); per-entry state keeps its own lock.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._data = dict(*args, **kwargs)
+        self._write_lock = threading.Lock()
+    
+    def __getitem__(self, key):
+        return self._data[key]
+    
+    def __contains__(self, key):
+        return key in self._data
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self._data!r})"
+    
+    def __setitem__(self, key, value):
+        with self._write_lock:
+            data = dict(self._data)
+            data[key] = value
+            self._data = data
+    
+    def __delitem__(self, key):
+        with self._write_lock:
+            data = dict(self._data)
+            del data[key]
+            self._data = data
+    
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+    
+    def keys(self):
+        return self._data.keys()
+    
+    def items(self):
+        return self._data.items()
+    
+    def values(self):
+        return self._data.values()
+    
+    def snapshot(self) -> dict:
+        """Shallow copy of the current entries (e.g. for JSON responses)"""
+        return dict(self._data)
+    
+    def pop(self, key, *default):
+        with self._write_lock:
+            if key not in self._data:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            data = dict(self._data)
+            value = data.pop(key)
+            self._data = data
+            return value
+    
+    def setdefault(self, key, default=None):
+        """Insert ``default`` unless the key exists; returns the stored value"""
+        with self._write_lock:
+            if key in self._data:
+                return self._data[key]
+            data = dict(self._data)
+            data[key] = default
+            self._data = data
+            return default
+    
+    def replace(self, key, value):
+        """Store ``value`` and return the previous value (or None) atomically"""
+        with self._write_lock:
+            data = dict(self._data)
+            previous = data.get(key)
+            data[key] = value
+            self._data = data
+            return previous
+    
+    def clear(self):
+        with self._write_lock:
+            self._data = {}
+
+
+class PortPool:
+    """Free-list allocator over a configured port range
+
+    Ports are handed out in O(1) from a deque of free slots; a bytearray
+    bitmap marks ports in use, so releasing and requesting a specific port
+    are O(1) too. With ``step=2`` the range is aligned to even ports and
+    each slot is an RTP/RTCP pair (``port``, ``port + 1``). The pool only
+    knows its own allocations, so ``allocate`` bind-probes: a port the OS
+    refuses (held by another process) goes to the back of the free list
+    and the next one is tried.
+    """
+    
+    def __init__(self, name: str, first: int, last: int, step: int = 1):
+        self.name = name
+        self.step = step
+        self.first = first + (-first % step)
+        self.size = max(0, (last - self.first + 1) // step)
+        self._used = bytearray(self.size)
+        self._queued = bytearray(b'\x01' * self.size)  # Slot has an entry in the free list
+        self._free = collections.deque(range(self.size))
+        self._in_use = 0
+        self.probe_failures = 0
+        self._lock = threading.Lock()
+    
+    def _slot(self, port) -> Optional[int]:
+        if not isinstance(port, int) or (port - self.first) % self.step:
+            return None
+        slot = (port - self.first) // self.step
+        return slot if 0 <= slot < self.size else None
+    
+    def _take(self, preferred=None) -> Optional[int]:
+        """Reserve a slot: the preferred port if free, else the next free one"""
+        with self._lock:
+            slot = self._slot(preferred)
+            if slot is None or self._used[slot]:
+                slot = None
+                while self._free:
+                    candidate = self._free.popleft()
+                    self._queued[candidate] = 0
+                    if not self._used[candidate]:  # Skip slots taken by preference
+                        slot = candidate
+                        break
+            if slot is None:
+                return None
+            self._used[slot] = 1
+            self._in_use += 1
+            return slot
+    
+    def _put(self, slot: int):
+        with self._lock:
+            if not self._used[slot]:
+                return
+            self._used[slot] = 0
+            self._in_use -= 1
+            if not self._queued[slot]:
+                self._queued[slot] = 1
+                self._free.append(slot)
+    
+    def allocate(self, bind, preferred: Optional[int] = None, attempts: Optional[int] = None):
+        """Reserve a port and bind it with ``bind(port)``; returns ``(port, bind result)``
+
+        ``bind`` raises OSError when the OS port is taken; up to
+        ``attempts`` ports are tried before OSError is raised to the caller.
+        """
+        attempts = attempts or CONFIG['port_probe_attempts']
+        for _ in range(attempts):
+            slot = self._take(preferred)
+            if slot is None:
+                raise OSError(errno.EADDRNOTAVAIL, f"No free {self.name} ports")
+            port = self.first + slot * self.step
+            preferred = None
+            try:
+                return port, bind(port)
+            except OSError as e:
+                self.probe_failures += 1
+                logger.warning(f"{self.name} port {port} not bindable ({e}), trying the next one")
+                self._put(slot)
+            except Exception:
+                self._put(slot)
+                raise
+        raise OSError(errno.EADDRINUSE, f"No bindable {self.name} port after {attempts} attempts")
+    
+    def release(self, port: int):
+        """Return a port handed out by ``allocate``"""
+        slot = self._slot(port)
+        if slot is not None:
+            self._put(slot)
+    
+    def stats(self) -> dict:
+        return {
+            'range': [self.first, self.first + self.size * self.step - 1],
+            'size': self.size,
+            'in_use': self._in_use,
+            'probe_failures': self.probe_failures
+        }
+
+
 # Global state
-active_streams: Dict[str, dict] = {}
+active_streams: Dict[str, dict] = CopyOnWriteDict()
 connected_clients: Set[str] = set()  # Changed from websocket objects to client IDs
-audio_levels: Dict[str, dict] = {}
+audio_levels: Dict[str, dict] = CopyOnWriteDict()
+rtp_port_pool = PortPool('RTP', *CONFIG['rtp_port_range'], step=2)
+stream_port_pool = PortPool('stream', *CONFIG['stream_port_range'])
 server_running = True
 
 # Global audio handler instance
 global_audio_handler = None
 global_rtp_streamer = None
+global_async_server = None
+global_ingest_server = None
 
 # Logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/pimic-audio.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+class LogRateLimiter(logging.Filter):
+    """Per-event token buckets for chatty log lines
+
+    Records logged with ``extra={'event': name}`` pass at most
+    ``rates[name]`` times per second (bursts up to one second's worth, a
+    rate below 1 samples one record every ``1 / rate`` seconds). The rest
+    are dropped before they are formatted or queued; the next record that
+    passes carries the number suppressed in between. Records without an
+    event and warnings or errors always pass.
+    """
+    
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = dict(rates)
+        self.suppressed = collections.Counter()
+        self._buckets = {}  # event -> [tokens, last refill, suppressed since last pass]
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, 'event', None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(event)
+        if rate is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            burst = max(rate, 1.0)
+            bucket = self._buckets.setdefault(event, [burst, now, 0])
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed[event] += 1
+                return False
+            bucket[0] -= 1.0
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+    
+    def set_rates(self, rates: dict):
+        with self._lock:
+            self.rates.update({event: float(rate) for event, rate in rates.items()})
+            self._buckets.clear()
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """Appends how many records of the same event the rate limiter dropped"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        return f"{message} (+{suppressed} suppressed)" if suppressed else message
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the writer falls behind"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingService:
+    """Log writing off the request and audio paths
+
+    Logging threads only build the record and put it on a bounded queue;
+    a QueueListener thread writes it to the size-rotated log file and
+    stdout. Disabled levels cost one level check, as messages use lazy
+    ``%`` arguments. The level and rate limits can be changed at runtime
+    through /api/logging.
+    """
+    
+    FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+    
+    def __init__(self):
+        self.queue = queue.Queue(CONFIG['log_queue_size'])
+        self.rate_limiter = LogRateLimiter(CONFIG['log_rate_limits'])
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.queue_handler.addFilter(self.rate_limiter)
+        self.listener = None
+    
+    def start(self):
+        """Attach the queue handler to the root logger and start the writer thread"""
+        handlers = []
+        if CONFIG['log_file']:
+            try:
+                handlers.append(logging.handlers.RotatingFileHandler(
+                    CONFIG['log_file'], maxBytes=CONFIG['log_max_bytes'], backupCount=CONFIG['log_backup_count']
+                ))
+            except OSError as e:
+                print(f"Log file {CONFIG['log_file']} not writable, logging to stdout only: {e}", file=sys.stderr)
+        handlers.append(logging.StreamHandler(sys.stdout))
+        formatter = SuppressedCountFormatter(self.FORMAT)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers)
+        self.listener.start()
+        logging.getLogger().addHandler(self.queue_handler)
+        self.set_level(CONFIG['log_level'])
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """Write out queued records and stop the writer thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+    
+    def set_level(self, level) -> str:
+        """Set the root log level by name (DEBUG, INFO, ...); ValueError if unknown"""
+        numeric_level = logging.getLevelName(str(level).upper())
+        if not isinstance(numeric_level, int):
+            raise ValueError(f"Unknown log level: {level}")
+        logging.getLogger().setLevel(numeric_level)
+        return logging.getLevelName(numeric_level)
+    
+    def status(self) -> dict:
+        return {
+            'level': logging.getLevelName(logging.getLogger().level),
+            'file': CONFIG['log_file'] or None,
+            'rate_limits': dict(self.rate_limiter.rates),
+            'suppressed': dict(self.rate_limiter.suppressed),
+            'queued': self.queue.qsize(),
+            'dropped': self.queue_handler.dropped
+        }
+
+
+logging_service = LoggingService()
+logging_service.start()
 logger = logging.getLogger(__name__)
 
+# Payloads below this size are unmasked with int XOR even when NumPy exists,
+# because array setup costs more than it saves on small frames
+NUMPY_UNMASK_THRESHOLD = 16 * 1024
+
+
+def unmask_websocket_payload(payload: bytes, mask: bytes) -> bytes:
+    """Apply a 4-byte WebSocket masking key to a payload (RFC 6455 5.3)
+
+    Treats the payload as one large integer and XORs it against the
+    repeated key, which runs in C instead of a per-byte Python loop.
+    Large payloads use NumPy on 32-bit words when it is installed.
+    """
+    length = len(payload)
+    if length == 0:
+        return b''
+    
+    if numpy is not None and length >= NUMPY_UNMASK_THRESHOLD:
+        words, tail = divmod(length, 4)
+        data = numpy.frombuffer(payload, dtype=numpy.uint8).copy()
+        key = numpy.frombuffer(mask, dtype=numpy.uint32)[0]
+        data[:words * 4].view(numpy.uint32)[:] ^= key
+        for i in range(tail):
+            data[words * 4 + i] ^= mask[i]
+        return data.tobytes()
+    
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(key, 'little')).to_bytes(length, 'little')
+
+
+def public_stream_config(stream: dict) -> dict:
+    """Serializable view of one stream (without server objects)"""
+    return {k: v for k, v in stream.items() if k not in ('server', 'session')}
+
+
+def get_public_streams() -> List[dict]:
+    """Serializable view of active streams (without server objects)"""
+    return [public_stream_config(stream) for stream in active_streams.values()]
+
+
+def format_sse_event(event: dict) -> bytes:
+    """Encode one SSE message (JSON data, with id when available)"""
+    message = f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    if 'id' in event:
+        message = f"id: {event['id']}\n" + message
+    return message.encode('utf-8')
+
+
+def parse_upload_metadata(sequence, timestamp):
+    """Sequence number and client timestamp of an uploaded chunk (None if unusable)"""
+    sequence = str(sequence or '').strip()
+    sequence = int(sequence) if sequence.isdigit() else None
+    try:
+        client_timestamp = float(timestamp) if timestamp else None
+    except ValueError:
+        client_timestamp = None
+    return sequence, client_timestamp
+
+
+def publish_streams_changed(event_type: str, stream_id: str):
+    """Announce a stream start/stop and the resulting stream list"""
+    bus = EventBus()
+    bus.publish(event_type, {'streamId': stream_id})
+    bus.publish('streams', {'streams': get_public_streams()}, coalesce_key='streams')
+
+
+class RTPScheduler:
+    """Paces all RTP streams from one monotonic clock
+
+    Deadlines are absolute (``start + n * packet_time``), so a late wakeup
+    shortens the next sleep instead of shifting every following packet.
+    Up to ``rtp_max_catchup`` missed ticks are sent back-to-back; beyond
+    that the schedule jumps forward and the skipped ticks only advance the
+    media clock. With no streams registered the thread blocks until one is
+    added instead of polling.
+    """
+    
+    def __init__(self, packet_time: float, max_catchup: int):
+        self.packet_time = packet_time
+        self.max_catchup = max_catchup
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.resyncs = 0
+    
+    def add(self, key, tick):
+        """Register ``tick(deadline, now)`` to be called once per packet time"""
+        with self.lock:
+            self.tasks[key] = tick
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='rtp-scheduler', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+    
+    def remove(self, key):
+        """Unregister a stream; takes effect before the next tick"""
+        with self.lock:
+            self.tasks.pop(key, None)
+        self.wakeup.set()
+    
+    def _run(self):
+        logger.info(f"RTP scheduler started ({self.packet_time * 1000:.0f} ms packet time)")
+        next_deadline = time.monotonic()
+        
+        while server_running:
+            with self.lock:
+                ticks = list(self.tasks.values())
+            if not ticks:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                next_deadline = time.monotonic()
+                continue
+            
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                if self.wakeup.wait(delay):
+                    # Stream set changed - re-read it, the deadline stays put
+                    self.wakeup.clear()
+                    continue
+            
+            now = time.monotonic()
+            missed = int((now - next_deadline) / self.packet_time)
+            if missed > self.max_catchup:
+                # Too far behind to catch up without a burst: skip ahead
+                next_deadline += missed * self.packet_time
+                self.resyncs += 1
+            
+            for tick in ticks:
+                try:
+                    tick(next_deadline, now)
+                except Exception as e:
+                    logger.debug(f"RTP scheduler tick error: {e}")
+            next_deadline += self.packet_time
+        
+        logger.info("RTP scheduler stopped")
+
+
+class RTPDestinations:
+    """Fan-out destination set of one RTP stream
+
+    Destinations are unicast ``host:port`` pairs or multicast groups with
+    their own TTL, outgoing interface and loopback setting. Multicast
+    options are socket options, so destinations are kept grouped by option
+    set and a socket's options are only changed when the group changes -
+    unicast-only sets never touch them. Each packet is passed as the same
+    list of buffers (header, payload) to one ``sendmsg`` per destination,
+    so it is built once and never concatenated.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.destinations = []
+        self._groups = []
+        self._applied = {}
+    
+    @staticmethod
+    def parse(spec, default_port: int) -> dict:
+        """Normalize ``"host:port"`` or ``{"host", "port", "ttl", "interface", "loopback"}``"""
+        if isinstance(spec, str):
+            host, _, port = spec.rpartition(':') if ':' in spec else (spec, '', '')
+            spec = {'host': host, 'port': port or default_port}
+        if not isinstance(spec, dict) or not spec.get('host'):
+            raise ValueError(f"Invalid RTP destination: {spec!r}")
+        
+        port = int(spec.get('port') or default_port)
+        if not 0 < port < 65535:
+            raise ValueError(f"Invalid RTP destination port: {port}")
+        try:
+            address = socket.gethostbyname(str(spec['host']))
+        except OSError:
+            raise ValueError(f"Cannot resolve RTP destination host: {spec['host']}")
+        
+        destination = {'host': address, 'port': port, 'multicast': ipaddress.ip_address(address).is_multicast}
+        if destination['multicast']:
+            destination['ttl'] = int(spec.get('ttl', 1))
+            if not 0 <= destination['ttl'] <= 255:
+                raise ValueError(f"Invalid multicast TTL: {destination['ttl']}")
+            destination['interface'] = spec.get('interface') or '0.0.0.0'
+            socket.inet_aton(destination['interface'])
+            destination['loopback'] = bool(spec.get('loopback', False))
+        destination['packets_sent'] = 0
+        destination['send_errors'] = 0
+        return destination
+    
+    @staticmethod
+    def _option_key(destination: dict):
+        if not destination['multicast']:
+            return None
+        return (destination['ttl'], destination['interface'], destination['loopback'])
+    
+    def add(self, specs: list, default_port: int) -> int:
+        """Add destinations (duplicates of host:port are replaced)"""
+        parsed = [self.parse(spec, default_port) for spec in specs]
+        with self.lock:
+            for destination in parsed:
+                self.destinations = [
+                    existing for existing in self.destinations
+                    if (existing['host'], existing['port']) != (destination['host'], destination['port'])
+                ]
+                self.destinations.append(destination)
+            self._regroup()
+        return len(parsed)
+    
+    def remove(self, specs: list, default_port: int) -> int:
+        """Remove destinations by host:port, returns how many were removed"""
+        targets = {(d['host'], d['port']) for d in (self.parse(spec, default_port) for spec in specs)}
+        with self.lock:
+            before = len(self.destinations)
+            self.destinations = [d for d in self.destinations if (d['host'], d['port']) not in targets]
+            self._regroup()
+            return before - len(self.destinations)
+    
+    def _regroup(self):
+        groups = {}
+        for destination in self.destinations:
+            groups.setdefault(self._option_key(destination), []).append(destination)
+        # Swapped in one assignment so senders never see a half-built list
+        self._groups = list(groups.items())
+    
+    def _apply_options(self, sock: socket.socket, key):
+        if key is None or self._applied.get(sock.fileno()) == key:
+            return
+        ttl, interface, loopback = key
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if loopback else 0)
+        self._applied[sock.fileno()] = key
+    
+    def send(self, sock: socket.socket, buffers: list, port_offset: int = 0, count: bool = True) -> int:
+        """Send one packet to every destination; returns successful sends
+
+        ``port_offset`` of 1 addresses the RTCP port next to each RTP port.
+        """
+        sent = 0
+        for key, destinations in self._groups:
+            try:
+                self._apply_options(sock, key)
+            except OSError as e:
+                logger.debug(f"Cannot apply multicast options {key}: {e}")
+            for destination in destinations:
+                address = (destination['host'], destination['port'] + port_offset)
+                try:
+                    if hasattr(sock, 'sendmsg'):
+                        sock.sendmsg(buffers, (), 0, address)
+                    else:
+                        sock.sendto(b''.join(buffers), address)
+                except OSError as e:
+                    if count:
+                        destination['send_errors'] += 1
+                    logger.debug(f"RTP send error to {address[0]}:{address[1]}: {e}")
+                    continue
+                if count:
+                    destination['packets_sent'] += 1
+                sent += 1
+        return sent
+    
+    def to_list(self) -> List[dict]:
+        return [dict(destination) for destination in self.destinations]
+    
+    def first_url(self) -> str:
+        destinations = self.destinations
+        if not destinations:
+            return ''
+        return f"rtp://{destinations[0]['host']}:{destinations[0]['port']}"
+
+
+class RTCPMonitor:
+    """RTCP for all RTP streams on one thread (RFC 3550 section 6)
+
+    Sends a compound SR + SDES(CNAME) per stream every ``rtcp_interval``
+    seconds (randomized by 0.5-1.5x as the RFC asks), and parses incoming
+    receiver reports into per-receiver loss, jitter and round-trip time.
+    A BYE is sent when a stream stops. Streams are added and removed from
+    other threads; a socketpair wakes the selector so it re-reads the set.
+    """
+    
+    PT_SR = 200
+    PT_RR = 201
+    PT_SDES = 202
+    PT_BYE = 203
+    SDES_CNAME = 1
+    # Seconds between 1900-01-01 (NTP epoch) and 1970-01-01 (Unix epoch)
+    NTP_EPOCH_OFFSET = 2208988800
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.streams = {}
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self.selector.register(self._wake_reader, selectors.EVENT_READ, None)
+        self.thread = None
+        self.cname = f"pimic@{socket.gethostname()}"
+    
+    def add(self, rtp_config: dict):
+        """Start RTCP for a stream whose ``rtcp_socket`` is already bound"""
+        rtp_config['rtcp'] = {
+            'reports_sent': 0,
+            'reports_received': 0,
+            'next_report': time.monotonic() + self._next_interval() / 2,
+            'receivers': {}
+        }
+        with self.lock:
+            self.streams[rtp_config['client_ip']] = rtp_config
+            self.selector.register(rtp_config['rtcp_socket'], selectors.EVENT_READ, rtp_config)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='rtcp-monitor', daemon=True)
+                self.thread.start()
+        self._wake()
+    
+    def remove(self, client_ip: str):
+        """Send BYE and stop RTCP for a stream (the caller closes the socket)"""
+        with self.lock:
+            rtp_config = self.streams.pop(client_ip, None)
+            if rtp_config is None:
+                return
+            try:
+                self.selector.unregister(rtp_config['rtcp_socket'])
+            except (KeyError, ValueError):
+                pass
+        self._send(rtp_config, self.build_bye(rtp_config['ssrc']))
+        self._wake()
+    
+    def _wake(self):
+        try:
+            self._wake_writer.send(b'\x00')
+        except OSError:
+            pass
+    
+    def _next_interval(self) -> float:
+        return self.interval * random.uniform(0.5, 1.5)
+    
+    def _run(self):
+        logger.info(f"RTCP monitor started ({self.interval:.1f} s report interval)")
+        while server_running:
+            with self.lock:
+                streams = list(self.streams.values())
+            now = time.monotonic()
+            timeout = min([stream['rtcp']['next_report'] for stream in streams], default=now + 60.0) - now
+            
+            for key, _ in self.selector.select(max(0.0, timeout)):
+                if key.data is None:
+                    try:
+                        self._wake_reader.recv(4096)
+                    except OSError:
+                        pass
+                    continue
+                self._receive(key.data)
+            
+            now = time.monotonic()
+            for rtp_config in streams:
+                rtcp = rtp_config['rtcp']
+                if now < rtcp['next_report'] or not rtp_config['running']:
+                    continue
+                rtcp['next_report'] = now + self._next_interval()
+                self._expire_receivers(rtcp)
+                if rtp_config['stats']['packets_sent'] and self._send(rtp_config, self.build_sender_report(rtp_config)):
+                    rtcp['reports_sent'] += 1
+        logger.info("RTCP monitor stopped")
+    
+    def _send(self, rtp_config: dict, packet: bytes) -> bool:
+        try:
+            return rtp_config['destinations'].send(rtp_config['rtcp_socket'], [packet], port_offset=1, count=False) > 0
+        except OSError as e:
+            logger.debug(f"RTCP send error for {rtp_config['client_ip']}: {e}")
+            return False
+    
+    def _receive(self, rtp_config: dict):
+        try:
+            data, address = rtp_config['rtcp_socket'].recvfrom(2048)
+        except OSError:
+            return
+        arrival_ntp = self.ntp_timestamp(time.time())
+        try:
+            packets = self.parse_compound(data)
+        except ValueError as e:
+            logger.debug(f"Ignoring malformed RTCP packet from {address[0]}: {e}")
+            return
+        
+        receivers = rtp_config['rtcp']['receivers']
+        for packet_type, sender_ssrc, payload in packets:
+            if sender_ssrc == rtp_config['ssrc']:
+                continue  # Our own SR looped back by multicast
+            if packet_type in (self.PT_RR, self.PT_SR):
+                for block in payload:
+                    if block['ssrc'] == rtp_config['ssrc']:
+                        self._update_receiver(receivers, sender_ssrc, address, block, arrival_ntp,
+                                              rtp_config['clock_rate'])
+                        rtp_config['rtcp']['reports_received'] += 1
+            elif packet_type == self.PT_SDES and sender_ssrc in receivers:
+                receivers[sender_ssrc]['cname'] = payload
+            elif packet_type == self.PT_BYE:
+                receivers.pop(sender_ssrc, None)
+    
+    def _update_receiver(self, receivers: dict, receiver_ssrc: int, address, block: dict, arrival_ntp: int,
+                         clock_rate: int):
+        receiver = receivers.setdefault(receiver_ssrc, {'ssrc': receiver_ssrc, 'cname': None, 'rtt_ms': None})
+        receiver['address'] = f"{address[0]}:{address[1]}"
+        receiver['fraction_lost'] = round(block['fraction_lost'] * 100 / 256, 2)
+        receiver['cumulative_lost'] = block['cumulative_lost']
+        receiver['highest_sequence'] = block['highest_sequence']
+        receiver['jitter_ms'] = round(block['jitter'] * 1000 / clock_rate, 3)
+        if block['last_sr']:
+            # RTT = A - LSR - DLSR, all in the middle 32 bits of NTP (1/65536 s)
+            middle = (arrival_ntp >> 16) & 0xFFFFFFFF
+            rtt = (middle - block['last_sr'] - block['delay_since_last_sr']) & 0xFFFFFFFF
+            if rtt < 0x80000000:
+                receiver['rtt_ms'] = round(rtt * 1000 / 65536, 3)
+        receiver['last_report'] = time.time()
+    
+    def _expire_receivers(self, rtcp: dict):
+        """Forget receivers that stopped reporting (five intervals, RFC 3550 6.3.5)"""
+        cutoff = time.time() - 5 * self.interval
+        for ssrc in [ssrc for ssrc, receiver in rtcp['receivers'].items() if receiver['last_report'] < cutoff]:
+            del rtcp['receivers'][ssrc]
+    
+    @classmethod
+    def ntp_timestamp(cls, unix_time: float) -> int:
+        """64-bit NTP timestamp (32.32 fixed point) for a Unix time"""
+        return int((unix_time + cls.NTP_EPOCH_OFFSET) * (1 << 32)) & 0xFFFFFFFFFFFFFFFF
+    
+    def build_sender_report(self, rtp_config: dict) -> bytes:
+        """Compound SR + SDES(CNAME) mapping wall clock to the RTP clock"""
+        now = time.time()
+        stats = rtp_config['stats']
+        # Extrapolate the RTP timestamp of the last packet to "now"
+        rtp_timestamp = rtp_config['timestamp']
+        if stats['last_send'] is not None:
+            elapsed = time.monotonic() - stats['last_send']
+            rtp_timestamp += int(elapsed * rtp_config['clock_rate'])
+        
+        sender_report = struct.pack(
+            '>BBHIQIII',
+            0x80, self.PT_SR, 6,
+            rtp_config['ssrc'],
+            self.ntp_timestamp(now),
+            rtp_timestamp & 0xFFFFFFFF,
+            stats['packets_sent'] & 0xFFFFFFFF,
+            stats['octets_sent'] & 0xFFFFFFFF
+        )
+        return sender_report + self.build_sdes(rtp_config['ssrc'], self.cname)
+    
+    @classmethod
+    def build_sdes(cls, ssrc: int, cname: str) -> bytes:
+        item = cname.encode('utf-8')[:255]
+        chunk = struct.pack('>IBB', ssrc, cls.SDES_CNAME, len(item)) + item + b'\x00'
+        chunk += b'\x00' * (-len(chunk) % 4)
+        return struct.pack('>BBH', 0x81, cls.PT_SDES, len(chunk) // 4) + chunk
+    
+    @classmethod
+    def build_bye(cls, ssrc: int) -> bytes:
+        # RTCP packets must be compound, so the BYE follows an empty RR
+        return struct.pack('>BBHI', 0x80, cls.PT_RR, 1, ssrc) + struct.pack('>BBHI', 0x81, cls.PT_BYE, 1, ssrc)
+    
+    @classmethod
+    def parse_compound(cls, data: bytes) -> List[tuple]:
+        """Split a compound RTCP packet into ``(type, sender_ssrc, payload)``
+
+        ``payload`` is the list of report blocks for SR/RR, the CNAME for
+        SDES and None for anything else.
+        """
+        packets = []
+        offset = 0
+        while offset + 8 <= len(data):
+            first, packet_type, length = struct.unpack_from('>BBH', data, offset)
+            if first >> 6 != 2:
+                raise ValueError("not RTCP version 2")
+            end = offset + (length + 1) * 4
+            if end > len(data):
+                raise ValueError("truncated packet")
+            count = first & 0x1F
+            sender_ssrc = struct.unpack_from('>I', data, offset + 4)[0]
+            
+            payload = None
+            if packet_type in (cls.PT_SR, cls.PT_RR):
+                blocks_start = offset + (28 if packet_type == cls.PT_SR else 8)
+                payload = [cls._parse_report_block(data, blocks_start + 24 * index)
+                           for index in range(count) if blocks_start + 24 * (index + 1) <= end]
+            elif packet_type == cls.PT_SDES:
+                payload = cls._parse_cname(data, offset + 8, end)
+            packets.append((packet_type, sender_ssrc, payload))
+            offset = end
+        return packets
+    
+    @staticmethod
+    def _parse_report_block(data: bytes, offset: int) -> dict:
+        ssrc, lost_word, highest, jitter, last_sr, delay = struct.unpack_from('>IIIIII', data, offset)
+        cumulative_lost = lost_word & 0xFFFFFF
+        if cumulative_lost & 0x800000:
+            cumulative_lost -= 0x1000000
+        return {
+            'ssrc': ssrc,
+            'fraction_lost': lost_word >> 24,
+            'cumulative_lost': cumulative_lost,
+            'highest_sequence': highest,
+            'jitter': jitter,
+            'last_sr': last_sr,
+            'delay_since_last_sr': delay
+        }
+    
+    @classmethod
+    def _parse_cname(cls, data: bytes, offset: int, end: int) -> Optional[str]:
+        """CNAME of the first SDES chunk"""
+        while offset + 2 <= end and data[offset] != 0:
+            item_type, length = data[offset], data[offset + 1]
+            if item_type == cls.SDES_CNAME:
+                return data[offset + 2:offset + 2 + length].decode('utf-8', 'replace')
+            offset += 2 + length
+        return None
+
 
 class RTPStreamer:
     """RTP Audio Streaming for professional audio tools"""
     
     def __init__(self):
-        self.active_rtp_streams = {}
-        self.rtp_base_port = 5004
+        self.active_rtp_streams = CopyOnWriteDict()
+        self.control_lock = threading.Lock()  # Serializes start/stop, never taken by the send path
+        self.scheduler = RTPScheduler(CONFIG['rtp_packet_time'], CONFIG['rtp_max_catchup'])
+        self.rtcp = RTCPMonitor(CONFIG['rtcp_interval'])
         
-    def start_rtp_stream(self, client_ip: str, audio_handler) -> dict:
-        """Start RTP stream for a client"""
-        try:
-            if client_ip in self.active_rtp_streams:
-                # Nur serialisierbare Felder zurückgeben
-                stream = self.active_rtp_streams[client_ip]
+    OPUS_PAYLOAD_TYPE = 96  # Dynamic payload type for Opus (RFC 7587: opus/48000/2)
+    L16_PAYLOAD_TYPE = 97  # Dynamic payload type for L16 at the client's rate (RFC 3551)
+    L16_MAX_PAYLOAD = 1200  # Bytes of PCM per packet, below the Ethernet MTU
+    
+    def start_rtp_stream(self, client_ip: str, audio_handler, destinations: Optional[list] = None,
+                         codec: str = 'opus') -> dict:
+        """Start RTP stream for a client
+
+        ``destinations`` lists unicast/multicast targets (see
+        RTPDestinations); without it the configured default group is used.
+        For a running stream, given destinations are added to it.
+        ``codec`` 'L16' sends the client's decoded PCM uncompressed instead
+        of passing its Opus frames through.
+        """
+        with self.control_lock:
+            try:
+                if client_ip in self.active_rtp_streams:
+                    # Nur serialisierbare Felder zurückgeben
+                    stream = self.active_rtp_streams[client_ip]
+                    if destinations:
+                        stream['destinations'].add(destinations, stream['port'])
+                    return {
+                        'success': True,
+                        'rtp_url': f"rtp://0.0.0.0:{stream['port']}",
+                        'rtcp_url': f"rtp://0.0.0.0:{stream['rtcp_port']}",
+                        'payload_type': stream['payload_type'],
+                        'encoding': stream['encoding'],
+                        'destinations': stream['destinations'].to_list(),
+                        'client_ip': client_ip
+                    }
+                
+                codec = str(codec or 'opus').lower()
+                if codec == 'l16':
+                    pcm_format = audio_handler.get_pcm_format(client_ip)
+                    if pcm_format is None:
+                        return {'success': False, 'error': 'No decoded PCM for this client (needs libopus or ffmpeg)'}
+                    clock_rate, channels = pcm_format
+                    payload_type = self.L16_PAYLOAD_TYPE
+                    encoding = f'L16/{clock_rate}/{channels}'
+                elif codec == 'opus':
+                    clock_rate = CONFIG['rtp_clock_rate']
+                    payload_type = self.OPUS_PAYLOAD_TYPE
+                    encoding = 'opus/48000/2'
+                else:
+                    return {'success': False, 'error': f'Unsupported codec: {codec}'}
+                
+                # Reserve and bind an RTP/RTCP pair (RTP even, RTCP odd)
+                rtp_port, (rtp_socket, rtcp_socket) = rtp_port_pool.allocate(self._bind_port_pair)
+                
+                rtp_destinations = RTPDestinations()
+                try:
+                    rtp_destinations.add(destinations or [CONFIG['rtp_default_destination']], rtp_port)
+                except ValueError:
+                    rtp_socket.close()
+                    rtcp_socket.close()
+                    rtp_port_pool.release(rtp_port)
+                    raise
+                
+                # Create RTP stream configuration
+                rtp_config = {
+                    'client_ip': client_ip,
+                    'port': rtp_port,
+                    'rtcp_port': rtp_port + 1,
+                    'payload_type': payload_type,
+                    'encoding': encoding,
+                    'clock_rate': clock_rate,
+                    'pcm_reader': None,
+                    'audio_handler': audio_handler,
+                    'ssrc': self._generate_ssrc(client_ip),
+                    'sequence_number': struct.unpack('>H', os.urandom(2))[0],
+                    'timestamp_base': struct.unpack('>I', os.urandom(4))[0],
+                    'clock_origin': None,
+                    'media_due': 0,
+                    'timestamp': 0,
+                    'marker': True,
+                    'socket': None,
+                    'rtcp_socket': None,
+                    'destinations': rtp_destinations,
+                    'running': False,
+                    'stats': {
+                        'packets_sent': 0,
+                        'octets_sent': 0,
+                        'empty_ticks': 0,
+                        'last_send': None,
+                        'send_jitter': 0.0,
+                        'max_lateness': 0.0
+                    }
+                }
+                
+                rtp_config['socket'] = rtp_socket
+                rtp_config['rtcp_socket'] = rtcp_socket
+                
+                # Pace the stream on the shared scheduler; the config is complete
+                # (including 'rtcp') before lock-free readers can see it
+                rtp_config['running'] = True
+                self.rtcp.add(rtp_config)
+                self.scheduler.add(client_ip, functools.partial(self._send_rtp_packet, rtp_config, audio_handler))
+                self.active_rtp_streams[client_ip] = rtp_config
+                EventBus().publish('rtp_started', {'client_ip': client_ip, 'rtp_port': rtp_port})
+                
+                logger.info(f"RTP stream started for {client_ip} on port {rtp_port}")
+                
                 return {
                     'success': True,
-                    'rtp_url': f"rtp://0.0.0.0:{stream['port']}",
-                    'rtcp_url': f"rtp://0.0.0.0:{stream['rtcp_port']}",
-                    'payload_type': stream['payload_type'],
+                    'rtp_url': f'rtp://0.0.0.0:{rtp_port}',
+                    'rtcp_url': f'rtp://0.0.0.0:{rtp_port + 1}',
+                    'payload_type': rtp_config['payload_type'],
+                    'encoding': encoding,
+                    'destinations': rtp_destinations.to_list(),
                     'client_ip': client_ip
                 }
-            
-            # Find available port
-            rtp_port = self.rtp_base_port
-            while rtp_port in [stream['port'] for stream in self.active_rtp_streams.values()]:
-                rtp_port += 2  # RTP uses even ports, RTCP uses odd
-            
-            # Create RTP stream configuration
-            rtp_config = {
-                'client_ip': client_ip,
-                'port': rtp_port,
-                'rtcp_port': rtp_port + 1,
-                'payload_type': 96,  # Dynamic payload type for Opus
-                'ssrc': self._generate_ssrc(client_ip),
-                'sequence_number': 0,
-                'timestamp': 0,
-                'socket': None,
-                'thread': None,
-                'running': False
-            }
-            
-            # Create UDP socket for RTP
-            rtp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                
+            except Exception as e:
+                logger.error(f"RTP stream start failed for {client_ip}: {e}")
+                return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def _bind_port_pair(rtp_port: int) -> tuple:
+        """UDP sockets bound to ``rtp_port`` (RTP) and ``rtp_port + 1`` (RTCP)"""
+        rtp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        rtcp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
             rtp_socket.bind(('0.0.0.0', rtp_port))
-            rtp_config['socket'] = rtp_socket
-            
-            # Start RTP streaming thread
-            rtp_config['running'] = True
-            rtp_thread = threading.Thread(
-                target=self._rtp_streaming_loop,
-                args=(rtp_config, audio_handler),
-                daemon=True
-            )
-            rtp_thread.start()
-            rtp_config['thread'] = rtp_thread
-            
-            self.active_rtp_streams[client_ip] = rtp_config
-            
-            logger.info(f"RTP stream started for {client_ip} on port {rtp_port}")
-            
-            return {
-                'success': True,
-                'rtp_url': f'rtp://0.0.0.0:{rtp_port}',
-                'rtcp_url': f'rtp://0.0.0.0:{rtp_port + 1}',
-                'payload_type': rtp_config['payload_type'],
-                'client_ip': client_ip
-            }
-            
-        except Exception as e:
-            logger.error(f"RTP stream start failed for {client_ip}: {e}")
-            return {'success': False, 'error': str(e)}
+            rtcp_socket.bind(('0.0.0.0', rtp_port + 1))
+        except OSError:
+            rtp_socket.close()
+            rtcp_socket.close()
+            raise
+        rtcp_socket.setblocking(False)
+        return rtp_socket, rtcp_socket
     
     def stop_rtp_stream(self, client_ip: str) -> dict:
         """Stop RTP stream for a client"""
+        with self.control_lock:
+            try:
+                if client_ip not in self.active_rtp_streams:
+                    return {'success': False, 'error': 'RTP stream not found'}
+                
+                stream = self.active_rtp_streams[client_ip]
+                
+                # Stop streaming
+                stream['running'] = False
+                self.scheduler.remove(client_ip)
+                self.rtcp.remove(client_ip)
+                
+                # Close sockets
+                if stream['socket']:
+                    stream['socket'].close()
+                if stream['rtcp_socket']:
+                    stream['rtcp_socket'].close()
+                rtp_port_pool.release(stream['port'])
+                if stream['audio_handler'] is not None:
+                    stream['audio_handler'].release_opus_frames(client_ip)
+                
+                del self.active_rtp_streams[client_ip]
+                EventBus().publish('rtp_stopped', {'client_ip': client_ip})
+                
+                logger.info(f"RTP stream stopped for {client_ip}")
+                
+                return {'success': True}
+                
+            except Exception as e:
+                logger.error(f"RTP stream stop failed for {client_ip}: {e}")
+                return {'success': False, 'error': str(e)}
+    
+    def update_destinations(self, client_ip: str, add: list = None, remove: list = None) -> dict:
+        """Add or remove destinations of a running RTP stream"""
         try:
-            if client_ip not in self.active_rtp_streams:
+            stream = self.active_rtp_streams.get(client_ip)
+            if stream is None:
                 return {'success': False, 'error': 'RTP stream not found'}
             
-            stream = self.active_rtp_streams[client_ip]
-            
-            # Stop streaming
-            stream['running'] = False
+            removed = stream['destinations'].remove(remove, stream['port']) if remove else 0
+            added = stream['destinations'].add(add, stream['port']) if add else 0
+            logger.info(f"RTP destinations for {client_ip}: +{added} -{removed}")
             
-            # Close socket
-            if stream['socket']:
-                stream['socket'].close()
-            
-            # Wait for thread to finish
-            if stream['thread'] and stream['thread'].is_alive():
-                stream['thread'].join(timeout=1.0)
-            
-            del self.active_rtp_streams[client_ip]
-            
-            logger.info(f"RTP stream stopped for {client_ip}")
-            
-            return {'success': True}
+            return {
+                'success': True,
+                'client_ip': client_ip,
+                'added': added,
+                'removed': removed,
+                'destinations': stream['destinations'].to_list()
+            }
             
-        except Exception as e:
-            logger.error(f"RTP stream stop failed for {client_ip}: {e}")
+        except ValueError as e:
             return {'success': False, 'error': str(e)}
     
     def _generate_ssrc(self, client_ip: str) -> int:
@@ -166,86 +1179,153 @@ class RTPStreamer:
         hash_obj = hashlib.md5(client_ip.encode())
         return struct.unpack('>I', hash_obj.digest()[:4])[0]
     
-    def _rtp_streaming_loop(self, rtp_config, audio_handler):
-        """Main RTP streaming loop"""
-        try:
-            client_ip = rtp_config['client_ip']
-            rtp_socket = rtp_config['socket']
-            
-            # RTP packet header template (12 bytes)
-            # V=2, P=0, X=0, CC=0, M=0, PT=payload_type
-            version_flags = 0x80  # Version 2
-            payload_type = rtp_config['payload_type']
+    def _send_rtp_packet(self, rtp_config, audio_handler, deadline: float, now: float):
+        """Send the audio due at a scheduler tick (Opus frames or L16 PCM)"""
+        if not rtp_config['running']:
+            return
+        
+        clock_rate = rtp_config['clock_rate']
+        stats = rtp_config['stats']
+        if rtp_config['clock_origin'] is None:
+            rtp_config['clock_origin'] = deadline
+        media_now = int(round((deadline - rtp_config['clock_origin']) * clock_rate))
+        
+        if rtp_config['payload_type'] == self.L16_PAYLOAD_TYPE:
+            sent = self._send_l16_packets(rtp_config, audio_handler, media_now)
+        else:
+            sent = self._send_opus_packets(rtp_config, audio_handler, media_now)
+        
+        if sent:
+            # Send jitter as in RFC 3550 A.8: smoothed deviation of the actual
+            # spacing between sending ticks from the packet time
+            sent_at = time.monotonic()
+            if stats['last_send'] is not None:
+                deviation = abs((sent_at - stats['last_send']) - self.scheduler.packet_time)
+                stats['send_jitter'] += (deviation - stats['send_jitter']) / 16.0
+            stats['last_send'] = sent_at
+            stats['max_lateness'] = max(stats['max_lateness'], sent_at - deadline)
+    
+    def _send_opus_packets(self, rtp_config, audio_handler, media_now: int) -> int:
+        """Send the Opus frames due by ``media_now``
+
+        Each demuxed Opus frame becomes one RFC 7587 packet. Frames are
+        released against the scheduler clock by their duration, so 20 ms
+        frames go out one per tick and longer frames every few ticks. The
+        RTP timestamp is the frame's WebM timestamp on the 48 kHz media
+        clock, so gaps in the recording show up as timestamp gaps. The first
+        packet after an underrun carries the marker bit.
+        """
+        clock_rate = rtp_config['clock_rate']
+        sent = 0
+        while rtp_config['media_due'] <= media_now and sent < CONFIG['rtp_max_catchup']:
+            frame = audio_handler.get_opus_frame(rtp_config['client_ip'])
+            if frame is None:
+                # Underrun: restart pacing from now instead of bursting later
+                rtp_config['stats']['empty_ticks'] += 1
+                rtp_config['marker'] = True
+                rtp_config['media_due'] = media_now
+                break
             
-            logger.info(f"RTP streaming loop started for {client_ip}")
+            timestamp_ns, payload = frame
+            timestamp = (rtp_config['timestamp_base'] + timestamp_ns * clock_rate // 1000000000) & 0xFFFFFFFF
+            if self._send_packet(rtp_config, timestamp, payload):
+                sent += 1
+            samples = WebMOpusDemuxer.opus_packet_samples(payload)
+            rtp_config['media_due'] += samples or int(self.scheduler.packet_time * clock_rate)
+        return sent
+    
+    def _send_l16_packets(self, rtp_config, audio_handler, media_now: int) -> int:
+        """Send the decoded PCM due by ``media_now`` as L16 packets
+
+        PCM comes from the client's shared PCM ring, so the stream never
+        decodes on its own. A packet time's worth of audio is split into
+        packets below the MTU; samples go out big-endian (RFC 3551 4.5.11)
+        and the RTP timestamp is the sample position in the ring.
+        """
+        client_ip = rtp_config['client_ip']
+        reader = audio_handler.refresh_pcm_reader(client_ip, rtp_config['pcm_reader'])
+        if reader is not rtp_config['pcm_reader']:
+            rtp_config['pcm_reader'] = reader
+            rtp_config['marker'] = True
+        if reader is None:
+            rtp_config['stats']['empty_ticks'] += 1
+            rtp_config['media_due'] = media_now
+            return 0
+        
+        _sample_rate, channels = audio_handler.get_pcm_format(client_ip)
+        frame_size = 2 * channels
+        packet_frames = int(self.scheduler.packet_time * rtp_config['clock_rate'])
+        packets_per_tick = -(-packet_frames * frame_size // self.L16_MAX_PAYLOAD)
+        packet_frames //= packets_per_tick
+        
+        sent = 0
+        while rtp_config['media_due'] <= media_now and sent < CONFIG['rtp_max_catchup'] * packets_per_tick:
+            if reader.available() < packet_frames * frame_size:
+                # Underrun: restart pacing from now instead of bursting later
+                rtp_config['stats']['empty_ticks'] += 1
+                rtp_config['marker'] = True
+                rtp_config['media_due'] = media_now
+                break
             
-            while rtp_config['running'] and server_running:
-                try:
-                    # Get audio data from handler
-                    if not audio_handler.has_audio_data(client_ip):
-                        time.sleep(0.01)  # 10ms sleep
-                        continue
-                    
-                    audio_data = audio_handler.get_audio_chunk(client_ip)
-                    if not audio_data:
-                        time.sleep(0.01)
-                        continue
-                    
-                    # Create RTP header
-                    sequence_number = rtp_config['sequence_number']
-                    timestamp = rtp_config['timestamp']
-                    ssrc = rtp_config['ssrc']
-                    
-                    # Pack RTP header
-                    rtp_header = struct.pack(
-                        '>BBHII',
-                        version_flags,
-                        payload_type,
-                        sequence_number & 0xFFFF,
-                        timestamp & 0xFFFFFFFF,
-                        ssrc & 0xFFFFFFFF
-                    )
-                    
-                    # Create RTP packet
-                    rtp_packet = rtp_header + audio_data
-                    
-                    # Send to all multicast addresses or specific destinations
-                    # For now, send to multicast address for easy consumption
-                    multicast_addr = ('224.0.0.1', rtp_config['port'])
-                    
-                    try:
-                        rtp_socket.sendto(rtp_packet, multicast_addr)
-                    except Exception as send_error:
-                        logger.debug(f"RTP send error: {send_error}")
-                    
-                    # Update sequence number and timestamp
-                    rtp_config['sequence_number'] = (sequence_number + 1) & 0xFFFF
-                    rtp_config['timestamp'] = (timestamp + 960) & 0xFFFFFFFF  # 960 samples for 20ms at 48kHz
-                    
-                    # Small delay to maintain timing
-                    time.sleep(0.02)  # 20ms delay
-                    
-                except Exception as e:
-                    if rtp_config['running']:
-                        logger.debug(f"RTP streaming error for {client_ip}: {e}")
-                    time.sleep(0.01)
-            
-        except Exception as e:
-            logger.error(f"RTP streaming loop error for {client_ip}: {e}")
-        finally:
-            logger.info(f"RTP streaming loop ended for {client_ip}")
+            data = reader.read(packet_frames * frame_size)
+            position = reader.position // frame_size - packet_frames
+            samples = array.array('h', data)
+            if sys.byteorder == 'little':
+                samples.byteswap()
+            timestamp = (rtp_config['timestamp_base'] + position) & 0xFFFFFFFF
+            if self._send_packet(rtp_config, timestamp, samples.tobytes()):
+                sent += 1
+            rtp_config['media_due'] += packet_frames
+        return sent
+    
+    def _send_packet(self, rtp_config, timestamp: int, payload: bytes) -> bool:
+        """Build and send one RTP packet"""
+        # V=2, P=0, X=0, CC=0, M=marker, PT=payload_type
+        sequence_number = rtp_config['sequence_number']
+        rtp_header = struct.pack(
+            '>BBHII',
+            0x80,
+            (0x80 if rtp_config['marker'] else 0x00) | rtp_config['payload_type'],
+            sequence_number,
+            timestamp,
+            rtp_config['ssrc'] & 0xFFFFFFFF
+        )
+        
+        # Header and payload go out as separate buffers to every destination
+        if not rtp_config['destinations'].send(rtp_config['socket'], [rtp_header, payload]):
+            return False
+        
+        rtp_config['sequence_number'] = (sequence_number + 1) & 0xFFFF
+        rtp_config['timestamp'] = timestamp
+        rtp_config['marker'] = False
+        rtp_config['stats']['packets_sent'] += 1
+        rtp_config['stats']['octets_sent'] += len(payload)
+        return True
     
     def get_active_streams(self) -> dict:
         """Get information about active RTP streams"""
         return {
             'active_count': len(self.active_rtp_streams),
+            'packet_time_ms': self.scheduler.packet_time * 1000,
+            'scheduler_resyncs': self.scheduler.resyncs,
+            'port_pool': rtp_port_pool.stats(),
             'streams': [
                 {
                     'client_ip': config['client_ip'],
                     'rtp_port': config['port'],
                     'rtcp_port': config['rtcp_port'],
-                    'rtp_url': f'rtp://224.0.0.1:{config["port"]}',
-                    'payload_type': config['payload_type']
+                    'rtp_url': config['destinations'].first_url(),
+                    'destinations': config['destinations'].to_list(),
+                    'payload_type': config['payload_type'],
+                    'encoding': config['encoding'],
+                    'packets_sent': config['stats']['packets_sent'],
+                    'octets_sent': config['stats']['octets_sent'],
+                    'empty_ticks': config['stats']['empty_ticks'],
+                    'send_jitter_ms': round(config['stats']['send_jitter'] * 1000, 3),
+                    'max_lateness_ms': round(config['stats']['max_lateness'] * 1000, 3),
+                    'rtcp_reports_sent': config['rtcp']['reports_sent'],
+                    'rtcp_reports_received': config['rtcp']['reports_received'],
+                    'receivers': list(config['rtcp']['receivers'].values())
                 }
                 for config in self.active_rtp_streams.values()
             ]
@@ -280,7 +1360,7 @@ class NetworkDiscovery:
                 announcement = {
                     'type': 'pimic-audio-service',
                     'port': CONFIG['web_port'],
-                    'stream_ports': list(range(CONFIG['default_stream_port'], CONFIG['default_stream_port'] + 100)),
+                    'stream_ports': list(range(CONFIG['stream_port_range'][0], CONFIG['stream_port_range'][1] + 1)),
                     'active_streams': len(active_streams),
                     'timestamp': time.time(),
                     'hostname': socket.gethostname()
@@ -305,28 +1385,72 @@ class NetworkDiscovery:
     
     def get_network_info(self) -> List[dict]:
         """Get network interface information"""
+        return NetworkInfoService().get_network_info()
+
+
+class NetworkInfoService:
+    """Shared, lazily refreshed view of the host's IPv4 interface addresses
+
+    Interfaces are read with if_nameindex() and the SIOCGIFADDR ioctl, so
+    no request forks a process. The result is cached for network_info_ttl
+    seconds. On Linux a netlink socket subscribed to link and address
+    changes invalidates the cache as soon as something changes.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    SIOCGIFADDR = 0x8915
+    RTMGRP_LINK = 0x1
+    RTMGRP_IPV4_IFADDR = 0x10
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance._network_info = None
+                instance._expires = 0.0
+                instance._watcher_started = False
+                cls._instance = instance
+        return cls._instance
+    
+    def get_network_info(self) -> List[dict]:
+        """Cached interface list, refreshed when stale"""
+        if self._network_info is not None and time.monotonic() < self._expires:
+            return self._network_info
+        with self._lock:
+            if self._network_info is None or time.monotonic() >= self._expires:
+                self._start_watcher()
+                self._network_info = self._read_interfaces()
+                self._expires = time.monotonic() + CONFIG['network_info_ttl']
+            return self._network_info
+    
+    def invalidate(self):
+        """Force a refresh on the next lookup"""
+        self._expires = 0.0
+    
+    def _read_interfaces(self) -> List[dict]:
         network_info = []
         try:
-            # Get network interfaces using system commands
-            if platform.system() == "Linux":
-                result = subprocess.run(['ip', 'addr', 'show'], capture_output=True, text=True)
-                # Parse IP addresses (simplified)
-                lines = result.stdout.split('\n')
-                current_interface = None
-                
-                for line in lines:
-                    if line and not line.startswith(' '):
-                        parts = line.split(':')
-                        if len(parts) > 1:
-                            current_interface = parts[1].strip()
-                    elif 'inet ' in line and current_interface:
-                        inet_part = line.strip().split('inet ')[1].split('/')[0]
-                        if inet_part != '127.0.0.1':
+            if fcntl is not None and hasattr(socket, 'if_nameindex'):
+                probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    for _index, name in socket.if_nameindex():
+                        request = struct.pack('256s', name.encode()[:15])
+                        try:
+                            response = fcntl.ioctl(probe.fileno(), self.SIOCGIFADDR, request)
+                        except OSError:
+                            continue  # Interface without IPv4 address
+                        address = socket.inet_ntoa(response[20:24])
+                        if address != '127.0.0.1':
                             network_info.append({
-                                'interface': current_interface,
-                                'address': inet_part,
+                                'interface': name,
+                                'address': address,
                                 'family': 'IPv4'
                             })
+                finally:
+                    probe.close()
             else:
                 # Windows fallback
                 hostname = socket.gethostname()
@@ -347,13 +1471,360 @@ class NetworkDiscovery:
             })
         
         return network_info
+    
+    def _start_watcher(self):
+        """Subscribe to netlink link/address events once (Linux only)"""
+        if self._watcher_started or not hasattr(socket, 'AF_NETLINK'):
+            return
+        self._watcher_started = True
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, self.RTMGRP_LINK | self.RTMGRP_IPV4_IFADDR))
+            sock.settimeout(5.0)
+        except OSError as e:
+            logger.info(f"Netlink unavailable, network info refreshes every {CONFIG['network_info_ttl']}s: {e}")
+            return
+        threading.Thread(target=self._watch_netlink, args=(sock,), daemon=True, name='pimic-netlink').start()
+    
+    def _watch_netlink(self, sock: socket.socket):
+        """Invalidate the cache on every RTM_NEWADDR/DELADDR/NEWLINK/DELLINK"""
+        with sock:
+            while server_running:
+                try:
+                    sock.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    logger.warning(f"Netlink watcher stopped: {e}")
+                    return
+                self.invalidate()
+
+
+class WebSocketError(Exception):
+    """WebSocket protocol violation, carries the close code to send"""
+    
+    def __init__(self, message: str, close_code: int = 1002):
+        super().__init__(message)
+        self.close_code = close_code
+
+
+class WebSocketCodec:
+    """Sans-IO RFC 6455 frame encoder/decoder (server side)
+
+    ``feed()`` accepts raw bytes as they arrive and returns complete
+    events; it keeps partial frames and fragmented messages between
+    calls. ``encode_frame()`` builds unmasked server-to-client frames.
+    """
+    
+    OP_CONTINUATION = 0x0
+    OP_TEXT = 0x1
+    OP_BINARY = 0x2
+    OP_CLOSE = 0x8
+    OP_PING = 0x9
+    OP_PONG = 0xA
+    
+    CLOSE_NORMAL = 1000
+    CLOSE_GOING_AWAY = 1001
+    CLOSE_PROTOCOL_ERROR = 1002
+    CLOSE_UNSUPPORTED_DATA = 1003
+    CLOSE_NO_STATUS = 1005
+    CLOSE_INVALID_DATA = 1007
+    CLOSE_POLICY_VIOLATION = 1008
+    CLOSE_MESSAGE_TOO_BIG = 1009
+    CLOSE_INTERNAL_ERROR = 1011
+    
+    DATA_OPCODES = (OP_TEXT, OP_BINARY)
+    CONTROL_OPCODES = (OP_CLOSE, OP_PING, OP_PONG)
+    
+    def __init__(self, max_message_size: int = 1024 * 1024, require_mask: bool = True):
+        self.max_message_size = max_message_size
+        self.require_mask = require_mask
+        self._buffer = bytearray()
+        self._message_opcode = None
+        self._message_parts = []
+        self._message_size = 0
+    
+    def feed(self, data) -> List[tuple]:
+        """Consume received bytes and return a list of events
+
+        Events are ``('text', str)``, ``('binary', bytes)``,
+        ``('ping', bytes)``, ``('pong', bytes)`` and
+        ``('close', code, reason)``.
+        """
+        self._buffer += data
+        events = []
+        while True:
+            frame = self._parse_frame()
+            if frame is None:
+                break
+            event = self._handle_frame(*frame)
+            if event is not None:
+                events.append(event)
+        return events
+    
+    def _parse_frame(self):
+        """Pop one complete frame from the buffer or return None"""
+        buffer = self._buffer
+        if len(buffer) < 2:
+            return None
+        
+        first, second = buffer[0], buffer[1]
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        payload_len = second & 0x7F
+        offset = 2
+        
+        if first & 0x70:
+            raise WebSocketError("RSV bits set without negotiated extension")
+        
+        if payload_len == 126:
+            if len(buffer) < 4:
+                return None
+            payload_len = struct.unpack_from('>H', buffer, 2)[0]
+            offset = 4
+        elif payload_len == 127:
+            if len(buffer) < 10:
+                return None
+            payload_len = struct.unpack_from('>Q', buffer, 2)[0]
+            offset = 10
+        
+        if opcode in self.CONTROL_OPCODES:
+            if not fin or payload_len > 125:
+                raise WebSocketError("Control frames must be final and at most 125 bytes")
+        elif payload_len > self.max_message_size:
+            raise WebSocketError("Frame exceeds message size limit", self.CLOSE_MESSAGE_TOO_BIG)
+        
+        if self.require_mask and not masked:
+            raise WebSocketError("Client frames must be masked")
+        
+        mask = None
+        if masked:
+            if len(buffer) < offset + 4:
+                return None
+            mask = bytes(buffer[offset:offset + 4])
+            offset += 4
+        
+        if len(buffer) < offset + payload_len:
+            return None
+        
+        payload = bytes(buffer[offset:offset + payload_len])
+        del buffer[:offset + payload_len]
+        
+        if mask is not None:
+            payload = unmask_websocket_payload(payload, mask)
+        
+        return fin, opcode, payload
+    
+    def _handle_frame(self, fin: bool, opcode: int, payload: bytes):
+        """Reassemble fragmented messages and translate frames into events"""
+        if opcode == self.OP_PING:
+            return ('ping', payload)
+        if opcode == self.OP_PONG:
+            return ('pong', payload)
+        if opcode == self.OP_CLOSE:
+            return self._parse_close(payload)
+        
+        if opcode == self.OP_CONTINUATION:
+            if self._message_opcode is None:
+                raise WebSocketError("Continuation frame without a started message")
+        elif opcode in self.DATA_OPCODES:
+            if self._message_opcode is not None:
+                raise WebSocketError("New data frame while a fragmented message is open")
+            self._message_opcode = opcode
+        else:
+            raise WebSocketError(f"Unknown opcode 0x{opcode:x}")
+        
+        self._message_size += len(payload)
+        if self._message_size > self.max_message_size:
+            raise WebSocketError("Message exceeds size limit", self.CLOSE_MESSAGE_TOO_BIG)
+        self._message_parts.append(payload)
+        
+        if not fin:
+            return None
+        
+        message = b''.join(self._message_parts)
+        message_opcode = self._message_opcode
+        self._message_opcode = None
+        self._message_parts = []
+        self._message_size = 0
+        
+        if message_opcode == self.OP_TEXT:
+            try:
+                return ('text', message.decode('utf-8'))
+            except UnicodeDecodeError:
+                raise WebSocketError("Text message is not valid UTF-8", self.CLOSE_INVALID_DATA)
+        return ('binary', message)
+    
+    def _parse_close(self, payload: bytes):
+        """Decode a close frame payload into a close event"""
+        if len(payload) == 0:
+            return ('close', self.CLOSE_NO_STATUS, '')
+        if len(payload) == 1:
+            raise WebSocketError("Close frame with truncated status code")
+        code = struct.unpack('>H', payload[:2])[0]
+        try:
+            reason = payload[2:].decode('utf-8')
+        except UnicodeDecodeError:
+            raise WebSocketError("Close reason is not valid UTF-8", self.CLOSE_INVALID_DATA)
+        return ('close', code, reason)
+    
+    @staticmethod
+    def encode_frame(opcode: int, payload: bytes = b'', fin: bool = True) -> bytes:
+        """Encode one unmasked server frame header + payload"""
+        first = (0x80 if fin else 0x00) | opcode
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('>BB', first, length)
+        elif length < 0x10000:
+            header = struct.pack('>BBH', first, 126, length)
+        else:
+            header = struct.pack('>BBQ', first, 127, length)
+        return header + payload
+    
+    @classmethod
+    def encode_close(cls, code: int = CLOSE_NORMAL, reason: str = '') -> bytes:
+        """Encode a close frame with status code and reason"""
+        payload = struct.pack('>H', code) + reason.encode('utf-8')[:123]
+        return cls.encode_frame(cls.OP_CLOSE, payload)
+
+
+class WebSocketConnection:
+    """Blocking WebSocket endpoint on top of an upgraded socket
+
+    Answers pings and close handshakes automatically. Sends are serialized
+    with a lock, so other threads may push frames while one thread reads.
+    Read timeouts wait for readability with a selector and never change
+    the socket timeout, which would also cut off concurrent sends.
+    """
+    
+    def __init__(self, sock, max_message_size: int = None):
+        self.sock = sock
+        self.codec = WebSocketCodec(max_message_size or CONFIG['websocket_max_message_size'])
+        self.closed = False
+        self.close_code = None
+        self._pending = []
+        self._send_lock = threading.Lock()
+        self._recv_buffer = bytearray(64 * 1024)
+    
+    def _readable(self, timeout: Optional[float]) -> bool:
+        """Wait up to ``timeout`` seconds (None: forever) for data to read"""
+        # TLS may hold decrypted bytes that never show up on the raw socket
+        pending = getattr(self.sock, 'pending', None)
+        if pending is not None and pending():
+            return True
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.sock, selectors.EVENT_READ)
+            return bool(selector.select(timeout))
+    
+    def recv(self, timeout: float = None):
+        """Return the next data message as ``('text'|'binary', payload)``
+
+        Returns None on timeout or once the connection has closed.
+        """
+        while not self._pending:
+            if self.closed:
+                return None
+            try:
+                if not self._readable(timeout):
+                    return None
+                received = self.sock.recv_into(self._recv_buffer)
+            except socket.timeout:
+                return None
+            except OSError:
+                self.closed = True
+                return None
+            if received == 0:
+                self.closed = True
+                return None
+            
+            try:
+                events = self.codec.feed(memoryview(self._recv_buffer)[:received])
+            except WebSocketError as e:
+                logger.warning(f"WebSocket protocol error: {e}")
+                self.close(e.close_code, str(e))
+                return None
+            
+            for event in events:
+                kind = event[0]
+                if kind == 'ping':
+                    self._send_frame(WebSocketCodec.OP_PONG, event[1])
+                elif kind == 'close':
+                    self.close_code = event[1]
+                    # Echo the status code to complete the closing handshake
+                    echo_code = event[1] if event[1] != WebSocketCodec.CLOSE_NO_STATUS else WebSocketCodec.CLOSE_NORMAL
+                    self.close(echo_code)
+                elif kind in ('text', 'binary'):
+                    self._pending.append(event)
+        
+        return self._pending.pop(0)
+    
+    def _send_frame(self, opcode: int, payload: bytes) -> bool:
+        """Send one frame; returns False if the connection is gone"""
+        if self.closed:
+            return False
+        header_and_payload = WebSocketCodec.encode_frame(opcode, payload)
+        try:
+            with self._send_lock:
+                self.sock.sendall(header_and_payload)
+            return True
+        except OSError:
+            self.closed = True
+            return False
+    
+    def send_text(self, text: str) -> bool:
+        """Send a UTF-8 text message"""
+        return self._send_frame(WebSocketCodec.OP_TEXT, text.encode('utf-8'))
+    
+    def send_json(self, message: dict) -> bool:
+        """Send a JSON-encoded text message"""
+        return self.send_text(json.dumps(message, ensure_ascii=False))
+    
+    def send_binary(self, data: bytes) -> bool:
+        """Send a binary message"""
+        return self._send_frame(WebSocketCodec.OP_BINARY, bytes(data))
+    
+    def ping(self, payload: bytes = b'') -> bool:
+        """Send a ping control frame"""
+        return self._send_frame(WebSocketCodec.OP_PING, payload[:125])
+    
+    def close(self, code: int = WebSocketCodec.CLOSE_NORMAL, reason: str = ''):
+        """Send a close frame (once) and mark the connection closed"""
+        if self.closed:
+            return
+        try:
+            with self._send_lock:
+                self.sock.sendall(WebSocketCodec.encode_close(code, reason))
+        except OSError:
+            pass
+        self.closed = True
 
 
 class SimpleWebSocketHandler:
     """Minimale WebSocket-Implementierung ohne externe Dependencies"""
     
-    def __init__(self):
-        self.clients = {}  # client_id -> client_info
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+    PUSH_TOPICS = ('streams', 'levels', 'network', 'stream_started', 'stream_stopped',
+                   'rtp_started', 'rtp_stopped')
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                # Shared by all push sessions and broadcasting threads
+                instance.clients = CopyOnWriteDict()  # client_id -> client_info
+                cls._instance = instance
+        return cls._instance
+    
+    @classmethod
+    def compute_accept_key(cls, websocket_key: str) -> str:
+        """Sec-WebSocket-Accept value for a client key"""
+        return base64.b64encode(
+            hashlib.sha1((websocket_key + cls.GUID).encode()).digest()
+        ).decode()
         
     def handle_websocket_handshake(self, request_handler):
         """Handle WebSocket handshake using HTTP upgrade"""
@@ -362,22 +1833,25 @@ class SimpleWebSocketHandler:
             websocket_key = request_handler.headers.get('Sec-WebSocket-Key', '')
             if not websocket_key:
                 return False
+            
+            if request_handler.headers.get('Sec-WebSocket-Version', '13') != '13':
+                logger.error("Unsupported WebSocket version requested")
+                return False
                 
             # Generate accept key
-            accept_key = base64.b64encode(
-                hashlib.sha1((websocket_key + '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode()).digest()
-            ).decode()
+            accept_key = self.compute_accept_key(websocket_key)
             
             # Send handshake response
             response = (
-                'HTTP/1.1 101 Switching Protocols\\r\\n'
-                'Upgrade: websocket\\r\\n'
-                'Connection: Upgrade\\r\\n'
-                f'Sec-WebSocket-Accept: {accept_key}\\r\\n'
-                '\\r\\n'
+                'HTTP/1.1 101 Switching Protocols\r\n'
+                'Upgrade: websocket\r\n'
+                'Connection: Upgrade\r\n'
+                f'Sec-WebSocket-Accept: {accept_key}\r\n'
+                '\r\n'
             )
             
             request_handler.wfile.write(response.encode())
+            request_handler.wfile.flush()
             return True
             
         except Exception as e:
@@ -392,8 +1866,10 @@ class SimpleWebSocketHandler:
     
     def remove_client(self, client_id: str):
         """Remove WebSocket client"""
-        if client_id in self.clients:
-            del self.clients[client_id]
+        # Atomic removal: a broadcast dropping a dead client may race the
+        # session's own cleanup, only one of them tears the client down
+        if self.clients.pop(client_id, None) is None:
+            return
         connected_clients.discard(client_id)
         
         # Clean up streams from this client
@@ -402,711 +1878,2780 @@ class SimpleWebSocketHandler:
             if stream.get('client_id') == client_id
         ]
         for stream_id in streams_to_remove:
-            del active_streams[stream_id]
+            if active_streams.pop(stream_id, None) is not None:
+                audio_levels.pop(stream_id, None)
+                publish_streams_changed('stream_stopped', stream_id)
         
         logger.info(f"WebSocket client disconnected: {client_id}")
     
     def broadcast_message(self, message: dict):
-        """Broadcast message to all clients (simplified)"""
-        # In a real implementation, this would send WebSocket frames
-        # For now, we'll use SSE (Server-Sent Events) as a fallback
-        logger.info(f"Broadcasting message: {message['type']}")
+        """Broadcast message to all connected WebSocket clients"""
+        payload = json.dumps(message, ensure_ascii=False)
+        for client_id, client_info in self.clients.items():
+            connection = client_info.get('connection')
+            if connection is not None and not connection.send_text(payload):
+                logger.debug(f"Dropping dead WebSocket client {client_id}")
+                self.remove_client(client_id)
+    
+    def serve_push_session(self, client_id: str, connection: WebSocketConnection):
+        """Push dashboard data over one persistent socket until it closes
+
+        The browser subscribes with ``{"type": "subscribe", "topics": [...]}``
+        and optionally ``"audio": "<client ip>"`` for binary audio frames.
+        Event topics are fed by the EventBus as state changes; network info
+        is not event-driven and is re-checked slowly, sent only on change.
+        """
+        bus = EventBus()
+        subscription = None
+        send_network = False
+        last_network = None
+        last_network_check = 0.0
+        audio_client = None
+        audio_reader = None
+        audio_handler = AudioStreamHandler()
+        # Upper bound on event latency: the socket read waits this long
+        interval = CONFIG['websocket_push_interval']
+        
+        try:
+            while not connection.closed and server_running:
+                message = connection.recv(timeout=interval)
+                if message is not None:
+                    kind, payload = message
+                    if kind == 'text':
+                        try:
+                            request = json.loads(payload)
+                        except ValueError:
+                            connection.close(WebSocketCodec.CLOSE_INVALID_DATA, 'Invalid JSON')
+                            break
+                        if request.get('type') == 'subscribe':
+                            topics = {t for t in request.get('topics', []) if t in self.PUSH_TOPICS}
+                            send_network = 'network' in topics
+                            topics.discard('network')
+                            if subscription is not None:
+                                bus.unsubscribe(subscription)
+                            subscription = bus.subscribe(topics)
+                            if 'streams' in topics:
+                                connection.send_json({'type': 'streams', 'streams': get_public_streams(),
+                                                      'timestamp': time.time()})
+                            audio_client = request.get('audio')
+                            audio_reader = None
+                            last_network = None
+                            last_network_check = 0.0
+                    continue
+                
+                if subscription is not None:
+                    for event in subscription.drain():
+                        connection.send_json(event)
+                
+                now = time.time()
+                if send_network and now - last_network_check >= 30.0:
+                    # Cached by NetworkInfoService, this only compares the lists
+                    last_network_check = now
+                    network = NetworkInfoService().get_network_info()
+                    if network != last_network:
+                        last_network = network
+                        connection.send_json({'type': 'network', 'network': network, 'timestamp': now})
+                
+                if audio_client:
+                    audio_reader = audio_handler.refresh_reader(audio_client, audio_reader)
+                    if audio_reader is not None:
+                        audio_data = audio_reader.read(CONFIG['websocket_max_message_size'])
+                        if audio_data:
+                            connection.send_binary(audio_data)
+        finally:
+            if subscription is not None:
+                bus.unsubscribe(subscription)
 
 
-class AudioStreamHandler:
-    """Handle audio streaming via WebSocket"""
+class AudioRingBuffer:
+    """Fixed-capacity ring buffer for audio bytes with explicit write/read cursors
+
+    Cursors are absolute byte positions since creation, so the number of
+    readable bytes is always ``write_pos - read_pos``. Storage is a single
+    preallocated bytearray; readers get memoryview slices into it instead
+    of copies. Views are only valid until the next write.
+
+    The built-in read cursor belongs to the primary consumer and is the one
+    the overflow policy protects. DROP_NEWEST only applies while a primary
+    consumer is attached (``attach_primary``): without one nothing ever
+    frees space, so the buffer drops the oldest data instead of stalling
+    the producer. Additional consumers use ``open_reader()``; their
+    cursors never hold back the writer; a reader that falls more than
+    ``capacity`` bytes behind skips ahead instead.
+    """
     
-    _instance = None
+    DROP_OLDEST = 'drop_oldest'
+    DROP_NEWEST = 'drop_newest'
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.audio_clients = {}  # client_ip -> audio_buffer
-            cls._instance.stream_buffers = {}  # stream_id -> audio_buffer
-        return cls._instance
+    def __init__(self, capacity: int, overflow_policy: str = DROP_OLDEST):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        if overflow_policy not in (self.DROP_OLDEST, self.DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self._data = bytearray(capacity)
+        self._view = memoryview(self._data)
+        self._lock = threading.Lock()
+        self.write_pos = 0
+        self.read_pos = 0
+        self.dropped_bytes = 0
+        self.primary_attached = False
     
-    def __init__(self):
-        # Only initialize once
-        if not hasattr(self, 'initialized'):
-            self.audio_clients = {}  # client_ip -> audio_buffer
-            self.stream_buffers = {}  # stream_id -> audio_buffer
-            self.initialized = True
+    def __len__(self):
+        return self.write_pos - self.read_pos
+    
+    def write(self, data) -> int:
+        """Append data, applying the overflow policy. Returns bytes stored."""
+        source = memoryview(data).cast('B')
+        length = len(source)
+        if length == 0:
+            return 0
         
-    def handle_audio_websocket(self, request_handler):
-        """Handle WebSocket connection for audio streaming"""
-        try:
-            client_ip = request_handler.client_address[0]
-            logger.info(f"Audio WebSocket connected from {client_ip}")
+        with self._lock:
+            free = self.capacity - (self.write_pos - self.read_pos)
             
-            # Set socket timeout to prevent indefinite blocking
-            request_handler.connection.settimeout(0.1)
+            if length > free and self.overflow_policy == self.DROP_NEWEST and self.primary_attached:
+                # Keep unread data intact and discard what does not fit
+                self.dropped_bytes += length - free
+                source = source[:free]
+                length = free
+                if length == 0:
+                    return 0
             
-            # Start reading WebSocket frames
-            self.read_websocket_frames(request_handler, client_ip)
+            start = self.write_pos
+            if length > self.capacity:
+                # Only the newest `capacity` bytes can survive the write
+                start += length - self.capacity
+                source = source[length - self.capacity:]
             
-        except Exception as e:
-            logger.error(f"Audio WebSocket error: {e}")
-        finally:
-            # Reset socket timeout
-            request_handler.connection.settimeout(None)
+            self._copy_in(start, source)
+            self.write_pos += length
+            
+            oldest = self.write_pos - self.capacity
+            if self.read_pos < oldest:
+                self.dropped_bytes += oldest - self.read_pos
+                self.read_pos = oldest
+            
+            return length
     
-    def read_websocket_frames(self, request_handler, client_ip):
-        """Read and process WebSocket frames"""
-        try:
-            while True:
-                try:
-                    # Read WebSocket frame header with timeout
-                    frame_header = request_handler.rfile.read(2)
-                    if len(frame_header) != 2:
-                        break
-                except socket.timeout:
-                    # Timeout is normal, continue reading
-                    continue
-                except Exception:
-                    break
-                    
-                fin_rsv_opcode = frame_header[0]
-                mask_len = frame_header[1]
-                
-                # Parse frame
-                opcode = fin_rsv_opcode & 0x0F
-                masked = bool(mask_len & 0x80)
-                payload_len = mask_len & 0x7F
-                
-                # Handle different payload lengths
-                if payload_len == 126:
-                    payload_len = struct.unpack('>H', request_handler.rfile.read(2))[0]
-                elif payload_len == 127:
-                    payload_len = struct.unpack('>Q', request_handler.rfile.read(8))[0]
-                
-                # Read mask if present
-                mask = b''
-                if masked:
-                    mask = request_handler.rfile.read(4)
-                
-                # Read payload
-                payload = request_handler.rfile.read(payload_len)
-                
-                # Unmask payload if needed
-                if masked:
-                    payload = bytes(payload[i] ^ mask[i % 4] for i in range(len(payload)))
-                
-                # Handle different frame types
-                if opcode == 0x1:  # Text frame (JSON config)
-                    self.handle_config_message(json.loads(payload.decode()), client_ip)
-                elif opcode == 0x2:  # Binary frame (audio data)
-                    self.handle_audio_data(payload, client_ip)
-                elif opcode == 0x8:  # Close frame
-                    break
-                    
-        except Exception as e:
-            logger.error(f"WebSocket frame reading error: {e}")
-        finally:
-            if client_ip in self.audio_clients:
-                del self.audio_clients[client_ip]
-            logger.info(f"Audio WebSocket closed for {client_ip}")
+    def attach_primary(self):
+        """Mark the read cursor as consumed, so DROP_NEWEST protects it"""
+        self.primary_attached = True
     
-    def handle_config_message(self, config, client_ip):
-        """Handle stream configuration message"""
-        logger.info(f"Audio stream config from {client_ip}: {config}")
-        self.audio_clients[client_ip] = {
-            'config': config,
-            'buffer': b'',
-            'last_data': time.time()
+    def detach_primary(self):
+        """Primary consumer is gone: overflow drops the oldest data again"""
+        self.primary_attached = False
+    
+    def _copy_in(self, position: int, source: memoryview):
+        """Copy source into storage at an absolute position, wrapping once"""
+        offset = position % self.capacity
+        first = min(len(source), self.capacity - offset)
+        self._view[offset:offset + first] = source[:first]
+        if first < len(source):
+            self._view[:len(source) - first] = source[first:]
+    
+    def _views(self, start: int, end: int) -> List[memoryview]:
+        """Zero-copy views for the absolute range [start, end)"""
+        length = end - start
+        if length <= 0:
+            return []
+        offset = start % self.capacity
+        first = min(length, self.capacity - offset)
+        views = [self._view[offset:offset + first]]
+        if first < length:
+            views.append(self._view[:length - first])
+        return views
+    
+    def peek(self, size: int = None) -> List[memoryview]:
+        """Views of up to `size` unread bytes without advancing the read cursor"""
+        with self._lock:
+            end = self.write_pos
+            if size is not None:
+                end = min(end, self.read_pos + size)
+            return self._views(self.read_pos, end)
+    
+    def consume(self, size: int) -> int:
+        """Advance the read cursor by up to `size` bytes"""
+        with self._lock:
+            size = min(size, self.write_pos - self.read_pos)
+            self.read_pos += size
+            return size
+    
+    def read(self, size: int) -> bytes:
+        """Copy out and consume up to `size` unread bytes"""
+        with self._lock:
+            end = min(self.write_pos, self.read_pos + size)
+            chunk = b''.join(self._views(self.read_pos, end))
+            self.read_pos = end
+            return chunk
+    
+    def tail(self, size: int) -> List[memoryview]:
+        """Views of the newest `size` unread bytes"""
+        with self._lock:
+            start = max(self.read_pos, self.write_pos - size)
+            return self._views(start, self.write_pos)
+    
+    def snapshot(self) -> bytes:
+        """Copy of all unread bytes without advancing the read cursor"""
+        with self._lock:
+            return b''.join(self._views(self.read_pos, self.write_pos))
+    
+    @property
+    def oldest_pos(self) -> int:
+        """Oldest absolute position still held in storage"""
+        return max(0, self.write_pos - self.capacity)
+    
+    def open_reader(self, from_oldest: bool = True) -> 'RingBufferReader':
+        """Create an independent reader at the oldest retained or newest byte"""
+        with self._lock:
+            position = self.oldest_pos if from_oldest else self.write_pos
+        return RingBufferReader(self, position)
+    
+    def read_from(self, position: int, size: int = None):
+        """Copy data from an absolute position on behalf of a reader
+
+        Returns ``(data, next_position, skipped)`` where ``skipped`` counts
+        bytes that were overwritten before the reader got to them.
+        """
+        with self._lock:
+            start = max(position, self.oldest_pos)
+            end = self.write_pos
+            if size is not None:
+                end = min(end, start + size)
+            data = b''.join(self._views(start, end))
+            return data, end, start - position if start > position else 0
+    
+    def views_from(self, position: int, size: int = None):
+        """Zero-copy variant of ``read_from`` returning memoryviews"""
+        with self._lock:
+            start = max(position, self.oldest_pos)
+            end = self.write_pos
+            if size is not None:
+                end = min(end, start + size)
+            return self._views(start, end), end, start - position if start > position else 0
+    
+    def stats(self) -> dict:
+        """Buffer fill and cursor information"""
+        return {
+            'capacity': self.capacity,
+            'buffered': self.write_pos - self.read_pos,
+            'write_pos': self.write_pos,
+            'read_pos': self.read_pos,
+            'dropped_bytes': self.dropped_bytes,
+            'overflow_policy': self.overflow_policy,
+            'primary_attached': self.primary_attached
         }
+
+
+class RingBufferReader:
+    """Independent read cursor into an AudioRingBuffer (fan-out consumer)"""
     
-    def handle_audio_data(self, data, client_ip):
-        """Handle incoming audio data"""
-        if client_ip in self.audio_clients:
-            self.audio_clients[client_ip]['buffer'] += data
-            self.audio_clients[client_ip]['last_data'] = time.time()
-            logger.info(f"Audio data received from {client_ip}: {len(data)} bytes, buffer size: {len(self.audio_clients[client_ip]['buffer'])} bytes")
-            # In a full implementation, this would forward to stream endpoints
+    def __init__(self, ring: AudioRingBuffer, position: int):
+        self.ring = ring
+        self.position = position
+        self.skipped_bytes = 0
     
-    def handle_http_audio_data(self, data, client_ip):
-        """Handle HTTP-uploaded audio data"""
-        # Initialize client if not exists
-        if client_ip not in self.audio_clients:
-            self.audio_clients[client_ip] = {
-                'config': {'format': 'audio/webm'},
-                'buffer': b'',
-                'last_data': time.time()
-            }
-        
-        # Add data to buffer
-        self.audio_clients[client_ip]['buffer'] += data
-        self.audio_clients[client_ip]['last_data'] = time.time()
-        logger.info(f"HTTP audio data received from {client_ip}: {len(data)} bytes, buffer size: {len(self.audio_clients[client_ip]['buffer'])} bytes")
-            
-    def get_audio_stream(self, client_ip):
-        """Get audio stream for a specific client"""
-        if client_ip in self.audio_clients:
-            client_data = self.audio_clients[client_ip]
-            buffer = client_data['buffer']
-            
-            # For continuous streaming, return data and keep some in buffer
-            # Only clear buffer if it's getting too large (> 1MB)
-            if len(buffer) > 1024 * 1024:  # 1MB limit
-                # Keep the last 100KB for continuity
-                client_data['buffer'] = buffer[-100*1024:]
-                return buffer[:-100*1024]
-            else:
-                # Return a copy of buffer without clearing it
-                return buffer
-        return b''
+    def available(self) -> int:
+        """Bytes this reader has not seen yet (including overwritten ones)"""
+        return self.ring.write_pos - self.position
     
-    def has_audio_data(self, client_ip):
-        """Check if client has active audio data (within last 10 seconds)"""
-        if client_ip in self.audio_clients:
-            client_data = self.audio_clients[client_ip]
-            # Check if we have recent data (within last 10 seconds)
-            time_since_last = time.time() - client_data['last_data']
-            has_buffer = len(client_data['buffer']) > 0
-            is_recent = time_since_last < 10.0  # 10 seconds timeout
-            return has_buffer and is_recent
-        return False
+    def read(self, size: int = None) -> bytes:
+        """Copy out and consume up to `size` bytes for this reader"""
+        data, self.position, skipped = self.ring.read_from(self.position, size)
+        self.skipped_bytes += skipped
+        return data
+    
+    def read_views(self, size: int = None) -> List[memoryview]:
+        """Consume up to `size` bytes as zero-copy views"""
+        views, self.position, skipped = self.ring.views_from(self.position, size)
+        self.skipped_bytes += skipped
+        return views
+    
+    def read_latest(self, size: int) -> List[memoryview]:
+        """Jump to the newest data and return views of at most `size` new bytes"""
+        target = self.ring.write_pos - size
+        if target > self.position:
+            # Deliberately skipped data is not counted as lag
+            self.position = target
+        return self.read_views(size)
+
+
+class WebMOpusDemuxer:
+    """Incremental WebM/Matroska demuxer for MediaRecorder Opus streams
+
+    Bytes are fed as they arrive; ``feed()`` returns every complete Opus
+    frame as ``(timestamp_ns, frame, end_position)``, where
+    ``end_position`` is the absolute stream offset just past the block.
+    Master elements (Segment, Cluster, ...) are entered without tracking
+    their end, which is how live MediaRecorder output with unknown-size
+    Segments and Clusters has to be read. Only the unconsumed tail of the
+    input is kept, and elements that are not needed are skipped by length
+    without buffering them, so every byte is looked at once.
+    """
+    
+    EBML_HEADER = 0x1A45DFA3
+    SEGMENT = 0x18538067
+    INFO = 0x1549A966
+    TIMECODE_SCALE = 0x2AD7B1
+    TRACKS = 0x1654AE6B
+    TRACK_ENTRY = 0xAE
+    TRACK_NUMBER = 0xD7
+    CODEC_ID = 0x86
+    CLUSTER = 0x1F43B675
+    CLUSTER_TIMECODE = 0xE7
+    BLOCK_GROUP = 0xA0
+    BLOCK = 0xA1
+    SIMPLE_BLOCK = 0xA3
+    
+    MASTER_IDS = frozenset((EBML_HEADER, SEGMENT, INFO, TRACKS, TRACK_ENTRY, CLUSTER, BLOCK_GROUP))
+    LEAF_IDS = frozenset((TIMECODE_SCALE, TRACK_NUMBER, CODEC_ID, CLUSTER_TIMECODE, BLOCK, SIMPLE_BLOCK))
+    # Leaf elements larger than this are treated as corruption
+    MAX_LEAF_SIZE = 1024 * 1024
+    RESYNC_MARKERS = (b'\x1f\x43\xb6\x75', b'\x1a\x45\xdf\xa3')  # Cluster, EBML header
+    
+    # Opus frame durations in 48 kHz samples by TOC config (RFC 6716 3.1)
+    OPUS_FRAME_SAMPLES = (
+        [480, 960, 1920, 2880] * 3 +  # SILK-only
+        [480, 960] * 2 +              # Hybrid
+        [120, 240, 480, 960] * 4      # CELT-only
+    )
+    
+    def __init__(self):
+        self._buffer = bytearray()
+        self.position = 0  # Absolute stream offset of _buffer[0]
+        self._skip_remaining = 0
+        self.timecode_scale = 1000000
+        self.cluster_timecode = 0
+        self.opus_track = None
+        self._track_number = None
+        self._track_codec = None
+        # Keeps timestamps monotonic across restarted recordings
+        self._timestamp_offset = 0
+        self._last_timestamp_end = 0
+        self.frames_demuxed = 0
+        self.resyncs = 0
     
-    def get_audio_chunk(self, client_ip, chunk_size=960):
-        """Get audio chunk for RTP streaming"""
-        if client_ip not in self.audio_clients:
+    @classmethod
+    def opus_packet_samples(cls, packet: bytes) -> int:
+        """Duration of an Opus packet in 48 kHz samples, 0 if malformed"""
+        if not packet:
+            return 0
+        toc = packet[0]
+        frame_samples = cls.OPUS_FRAME_SAMPLES[toc >> 3]
+        code = toc & 0x03
+        if code == 0:
+            count = 1
+        elif code in (1, 2):
+            count = 2
+        elif len(packet) > 1:
+            count = packet[1] & 0x3F
+        else:
+            return 0
+        return frame_samples * count
+    
+    @staticmethod
+    def _read_vint(buffer, offset: int, keep_marker: bool):
+        """Read an EBML variable-length integer
+
+        Returns ``(value, length)``, ``None`` when more bytes are needed, or
+        ``(None, 0)`` for an invalid leading byte. A size with all value
+        bits set is "unknown" and returned as value ``-1``.
+        """
+        if offset >= len(buffer):
             return None
-        
-        client_data = self.audio_clients[client_ip]
-        buffer = client_data['buffer']
-        
-        # Use available buffer size if less than requested chunk_size
-        # This prevents RTP from waiting for exact chunk sizes
-        if len(buffer) == 0:
+        first = buffer[offset]
+        if first == 0:
+            return None, 0
+        length = 9 - first.bit_length()
+        if offset + length > len(buffer):
             return None
-        
-        actual_chunk_size = min(len(buffer), chunk_size)
-        
-        # Extract chunk and update buffer
-        chunk = buffer[:actual_chunk_size]
-        client_data['buffer'] = buffer[actual_chunk_size:]
-        
-        return chunk
+        value = first if keep_marker else first & (0xFF >> length)
+        for index in range(1, length):
+            value = (value << 8) | buffer[offset + index]
+        if not keep_marker and value == (1 << (7 * length)) - 1:
+            value = -1
+        return value, length
     
-    def get_audio_levels(self):
-        """Get current audio levels for all active clients"""
-        levels = {}
-        current_time = time.time()
+    def feed(self, data) -> List[tuple]:
+        """Consume newly received bytes and return the frames they complete"""
+        frames = []
+        data = memoryview(data).cast('B')
+        if self._skip_remaining:
+            skipped = min(self._skip_remaining, len(data))
+            self._skip_remaining -= skipped
+            self.position += skipped
+            data = data[skipped:]
+        if not data:
+            return frames
         
-        for client_ip, client_data in self.audio_clients.items():
-            # Check if client is active (data within last 5 seconds)
-            time_since_last = current_time - client_data['last_data']
-            if time_since_last > 5.0:
+        buffer = self._buffer
+        buffer += data
+        offset = 0
+        
+        while offset < len(buffer):
+            element_id = self._read_vint(buffer, offset, keep_marker=True)
+            if element_id is None:
+                break
+            if element_id[1] == 0 or element_id[1] > 4:
+                offset = self._resync(buffer, offset)
+                continue
+            size = self._read_vint(buffer, offset + element_id[1], keep_marker=False)
+            if size is None:
+                break
+            if size[1] == 0:
+                offset = self._resync(buffer, offset)
                 continue
             
-            buffer = client_data['buffer']
-            if len(buffer) == 0:
-                levels[client_ip] = {
-                    'level': 0,
-                    'peak': 0,
-                    'active': False,
-                    'last_update': current_time
-                }
+            element_id, size, header_length = element_id[0], size[0], element_id[1] + size[1]
+            
+            if element_id in self.MASTER_IDS:
+                self._enter_master(element_id)
+                offset += header_length
                 continue
             
-            # Calculate audio level from buffer
-            # Take sample from buffer to calculate level
-            sample_size = min(1024, len(buffer))
-            sample = buffer[-sample_size:] if sample_size > 0 else b''
+            if size < 0 or (element_id in self.LEAF_IDS and size > self.MAX_LEAF_SIZE):
+                # Only masters may have an unknown size
+                offset = self._resync(buffer, offset)
+                continue
             
-            if sample:
-                # Simple level calculation (RMS-like)
-                level_sum = sum(abs(b - 128) for b in sample) / len(sample)
-                normalized_level = min(100, (level_sum / 128.0) * 100)
-                
-                # Calculate peak (max value in sample)
-                peak = max(abs(b - 128) for b in sample) / 128.0 * 100
-                
-                levels[client_ip] = {
-                    'level': round(normalized_level, 1),
-                    'peak': round(peak, 1),
-                    'active': True,
-                    'buffer_size': len(buffer),
-                    'last_update': current_time,
-                    'time_since_data': round(time_since_last, 2)
-                }
+            end = offset + header_length + size
+            if element_id in self.LEAF_IDS:
+                if end > len(buffer):
+                    break
+                body = bytes(buffer[offset + header_length:end])
+                self._handle_leaf(element_id, body, self.position + end, frames)
+                offset = end
+            elif end <= len(buffer):
+                offset = end
             else:
-                levels[client_ip] = {
-                    'level': 0,
-                    'peak': 0,
-                    'active': False,
-                    'last_update': current_time
-                }
+                # Skip the rest of an unneeded element as it streams past
+                self._skip_remaining = end - len(buffer)
+                offset = len(buffer)
         
-        return levels
+        del buffer[:offset]
+        self.position += offset
+        return frames
+    
+    def _resync(self, buffer: bytearray, offset: int) -> int:
+        """Recover from corrupt input by jumping to the next Cluster or EBML header"""
+        self.resyncs += 1
+        candidates = [buffer.find(marker, offset + 1) for marker in self.RESYNC_MARKERS]
+        candidates = [index for index in candidates if index >= 0]
+        if candidates:
+            return min(candidates)
+        # Keep a possible partial marker at the end
+        return max(offset + 1, len(buffer) - 3)
+    
+    def _enter_master(self, element_id: int):
+        if element_id == self.EBML_HEADER:
+            # A new recording on the same connection restarts its clock at 0
+            self._timestamp_offset = self._last_timestamp_end
+            self.timecode_scale = 1000000
+            self.cluster_timecode = 0
+            self.opus_track = None
+        elif element_id == self.TRACK_ENTRY:
+            self._track_number = None
+            self._track_codec = None
+    
+    def _handle_leaf(self, element_id: int, body: bytes, end_position: int, frames: list):
+        if element_id == self.SIMPLE_BLOCK or element_id == self.BLOCK:
+            self._handle_block(body, end_position, frames)
+        elif element_id == self.CLUSTER_TIMECODE:
+            self.cluster_timecode = int.from_bytes(body, 'big')
+        elif element_id == self.TIMECODE_SCALE:
+            self.timecode_scale = int.from_bytes(body, 'big') or 1000000
+        elif element_id == self.TRACK_NUMBER:
+            self._track_number = int.from_bytes(body, 'big')
+        elif element_id == self.CODEC_ID:
+            self._track_codec = body.rstrip(b'\x00').decode('ascii', 'replace')
+        
+        if self._track_codec == 'A_OPUS' and self._track_number is not None:
+            self.opus_track = self._track_number
+    
+    def _handle_block(self, body: bytes, end_position: int, frames: list):
+        track = self._read_vint(body, 0, keep_marker=False)
+        if track is None or track[1] == 0 or len(body) < track[1] + 3:
+            return
+        track_number, offset = track
+        # Without a Tracks element assume MediaRecorder's single audio track
+        if self.opus_track is not None and track_number != self.opus_track:
+            return
+        
+        relative_timecode, flags = struct.unpack_from('>hB', body, offset)
+        offset += 3
+        timestamp_ns = (self.cluster_timecode + relative_timecode) * self.timecode_scale + self._timestamp_offset
+        
+        for payload in self._split_lacing(body, offset, (flags >> 1) & 0x03):
+            frames.append((timestamp_ns, payload, end_position))
+            self.frames_demuxed += 1
+            timestamp_ns += self.opus_packet_samples(payload) * 1000000000 // 48000
+        self._last_timestamp_end = max(self._last_timestamp_end, timestamp_ns)
+    
+    def _split_lacing(self, body: bytes, offset: int, lacing: int) -> List[bytes]:
+        """Split a block payload into frames (no, Xiph, fixed or EBML lacing)"""
+        if lacing == 0:
+            return [body[offset:]]
+        if offset >= len(body):
+            return []
+        count = body[offset] + 1
+        offset += 1
+        
+        sizes = []
+        if lacing == 1:  # Xiph
+            for _ in range(count - 1):
+                size = 0
+                while offset < len(body):
+                    value = body[offset]
+                    offset += 1
+                    size += value
+                    if value != 255:
+                        break
+                sizes.append(size)
+        elif lacing == 3:  # EBML
+            first = self._read_vint(body, offset, keep_marker=False)
+            if first is None or first[1] == 0:
+                return []
+            sizes.append(first[0])
+            offset += first[1]
+            for _ in range(count - 2):
+                delta = self._read_vint(body, offset, keep_marker=False)
+                if delta is None or delta[1] == 0:
+                    return []
+                # Signed deltas are stored with a bias of half the range
+                bias = (1 << (7 * delta[1] - 1)) - 1
+                sizes.append(sizes[-1] + delta[0] - bias)
+                offset += delta[1]
+        else:  # Fixed-size
+            size = (len(body) - offset) // count
+            sizes = [size] * (count - 1)
+        
+        sizes.append(len(body) - offset - sum(sizes))
+        if any(size < 0 for size in sizes):
+            return []
+        payloads = []
+        for size in sizes:
+            payloads.append(body[offset:offset + size])
+            offset += size
+        return payloads
 
 
-class StreamServer:
-    """TCP Stream Server für Audio-Daten"""
+class MultipartFormParser:
+    """Incremental multipart/form-data parser (RFC 7578)
+
+    Fed with the body as it is read from the socket. File parts are
+    collected as raw bytes in ``files``; only the small text fields are
+    decoded, into ``fields``. The parser keeps just the bytes that could
+    still be the start of a boundary, and searches each byte once.
+    """
     
-    def __init__(self, port: int):
-        self.port = port
-        self.server_socket = None
-        self.running = False
-        
-    def start(self):
-        """Start stream server"""
-        try:
-            logger.info(f"Creating socket for stream server on port {self.port}")
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    MAX_HEADER_SIZE = 8 * 1024
+    
+    def __init__(self, boundary: str, max_field_size: int = 4096):
+        if not boundary:
+            raise ValueError("Missing multipart boundary")
+        # The body is parsed as if preceded by CRLF so the first delimiter
+        # looks like every other one
+        self.delimiter = b'\r\n--' + boundary.encode('latin-1')
+        self.max_field_size = max_field_size
+        self.fields = {}
+        self.files = {}
+        self.filenames = {}
+        self._buffer = bytearray(b'\r\n')
+        self._state = 'preamble'
+        self._part_name = None
+        self._part_target = None
+    
+    @property
+    def complete(self) -> bool:
+        return self._state == 'end'
+    
+    def feed(self, data):
+        """Parse the next piece of the body"""
+        if self._state == 'end':
+            return
+        self._buffer += data
+        
+        while True:
+            if self._state in ('preamble', 'body'):
+                index = self._buffer.find(self.delimiter)
+                if index < 0:
+                    # Keep what could be the beginning of a delimiter
+                    keep = len(self.delimiter) - 1
+                    if self._state == 'body' and len(self._buffer) > keep:
+                        self._emit(memoryview(self._buffer)[:len(self._buffer) - keep])
+                        del self._buffer[:len(self._buffer) - keep]
+                    elif self._state == 'preamble' and len(self._buffer) > keep:
+                        del self._buffer[:len(self._buffer) - keep]
+                    return
+                if self._state == 'body':
+                    self._emit(memoryview(self._buffer)[:index])
+                    self._finish_part()
+                del self._buffer[:index + len(self.delimiter)]
+                self._state = 'delimiter'
+            
+            if self._state == 'delimiter':
+                if len(self._buffer) < 2:
+                    return
+                if self._buffer[:2] == b'--':
+                    self._state = 'end'
+                    self._buffer.clear()
+                    return
+                # Transport padding may follow the boundary before its CRLF
+                line_end = self._buffer.find(b'\r\n')
+                if line_end < 0:
+                    if len(self._buffer) > self.MAX_HEADER_SIZE:
+                        raise ValueError("Malformed multipart boundary line")
+                    return
+                del self._buffer[:line_end + 2]
+                self._state = 'headers'
             
-            # Set socket timeout to prevent hanging
-            self.server_socket.settimeout(5.0)
+            if self._state == 'headers':
+                if self._buffer.startswith(b'\r\n'):
+                    header_end = -2  # Part without headers
+                else:
+                    header_end = self._buffer.find(b'\r\n\r\n')
+                    if header_end < 0:
+                        if len(self._buffer) > self.MAX_HEADER_SIZE:
+                            raise ValueError("Multipart part headers too large")
+                        return
+                self._start_part(bytes(self._buffer[:max(header_end, 0)]))
+                del self._buffer[:header_end + 4]
+                self._state = 'body'
+    
+    def _start_part(self, header_block: bytes):
+        headers = http.client.parse_headers(io.BytesIO(header_block + b'\r\n\r\n'))
+        name = headers.get_param('name', header='Content-Disposition') or ''
+        filename = headers.get_param('filename', header='Content-Disposition')
+        self._part_name = name
+        if filename is not None:
+            self.filenames[name] = filename
+            self._part_target = self.files.setdefault(name, bytearray())
+        else:
+            self._part_target = bytearray()
+    
+    def _emit(self, data: memoryview):
+        if not len(data):
+            return
+        target = self._part_target
+        if self._part_name not in self.filenames and len(target) + len(data) > self.max_field_size:
+            raise ValueError(f"Form field '{self._part_name}' too large")
+        target += data
+    
+    def _finish_part(self):
+        if self._part_name not in self.filenames:
+            self.fields[self._part_name] = self._part_target.decode('utf-8', errors='replace')
+        self._part_name = None
+        self._part_target = None
+
+
+class ChunkedBodyDecoder:
+    """Incremental decoder for Transfer-Encoding: chunked request bodies
+
+    ``feed()`` returns the payload pieces contained in the new bytes;
+    ``complete`` turns true after the terminating zero-size chunk and its
+    trailers. Chunk extensions and trailers are ignored.
+    """
+    
+    MAX_LINE_SIZE = 4096
+    
+    def __init__(self):
+        self._buffer = bytearray()
+        self._remaining = 0  # Payload bytes left in the current chunk
+        self._state = 'size'
+        self.complete = False
+    
+    def feed(self, data) -> List[bytes]:
+        pieces = []
+        self._buffer += data
+        while not self.complete:
+            if self._state == 'data':
+                if not self._buffer:
+                    break
+                take = min(self._remaining, len(self._buffer))
+                pieces.append(bytes(self._buffer[:take]))
+                del self._buffer[:take]
+                self._remaining -= take
+                if self._remaining:
+                    break
+                self._state = 'data_end'
             
-            logger.info(f"Binding socket to port {self.port}")
-            self.server_socket.bind(('0.0.0.0', self.port))
+            line_end = self._buffer.find(b'\r\n')
+            if line_end < 0:
+                if len(self._buffer) > self.MAX_LINE_SIZE:
+                    raise ValueError("Chunk header line too long")
+                break
+            line = bytes(self._buffer[:line_end])
+            del self._buffer[:line_end + 2]
             
-            logger.info(f"Starting to listen on port {self.port}")
-            self.server_socket.listen(5)
-            self.running = True
+            if self._state == 'data_end':
+                if line:
+                    raise ValueError("Missing CRLF after chunk data")
+                self._state = 'size'
+            elif self._state == 'size':
+                try:
+                    self._remaining = int(line.split(b';', 1)[0].strip(), 16)
+                except ValueError:
+                    raise ValueError(f"Invalid chunk size line: {line[:32]!r}")
+                self._state = 'data' if self._remaining else 'trailer'
+            elif self._state == 'trailer' and not line:
+                self.complete = True
+        return pieces
+
+
+class IngestJitterBuffer:
+    """Reorders uploaded chunks of one client before they reach the stream
+
+    Chunks are keyed by the client's upload sequence number, or by the
+    client timestamp for clients that send none. An in-order chunk is
+    released at once. A chunk behind a gap is held until it has waited the
+    target delay, then the gap is given up (counted as an underrun). A
+    chunk arriving after its successors were released is dropped, because
+    appending it late would corrupt the WebM stream.
+
+    Arrival jitter is estimated as in RFC 3550 from client timestamps
+    versus arrival times. The target delay follows it:
+    ``ingest_jitter_factor`` jitter multiples plus a penalty that grows
+    with every late drop and decays slowly. A higher factor means more
+    latency and fewer drops on bad Wi-Fi.
+    Held chunks are released by the next upload, so an idle client keeps
+    at most one target delay of audio pending.
+    """
+    
+    def __init__(self, factor: float, min_delay_ms: float, max_delay_ms: float):
+        self.factor = factor
+        self.min_delay = min_delay_ms / 1000.0
+        self.max_delay = max_delay_ms / 1000.0
+        self.lock = threading.Lock()
+        self._held = []  # heap of (key, arrival, data)
+        self._keyed_by_sequence = None
+        self.next_key = None
+        self.last_transit = None
+        self.jitter = 0.0
+        self.late_penalty = 0.0
+        self.stats = {
+            'received': 0,
+            'released': 0,
+            'reordered': 0,
+            'late_dropped': 0,
+            'duplicates': 0,
+            'underruns': 0,
+            'hold_time_total': 0.0
+        }
+    
+    @property
+    def target_delay(self) -> float:
+        delay = self.factor * self.jitter + self.late_penalty
+        return min(self.max_delay, max(self.min_delay, delay))
+    
+    def push(self, data: bytes, sequence: Optional[int], client_timestamp: Optional[float], deliver):
+        """Add one upload and ``deliver(data)`` every chunk that became due
+
+        ``client_timestamp`` is in milliseconds. Delivery happens under the
+        buffer lock, so concurrent uploads reach the stream in order.
+        """
+        arrival = time.monotonic()
+        with self.lock:
+            self.stats['received'] += 1
+            if client_timestamp is not None:
+                self._update_jitter(arrival, client_timestamp)
             
-            # Remove timeout for accept operations
-            self.server_socket.settimeout(None)
+            by_sequence = sequence is not None
+            if sequence is None and client_timestamp is None:
+                # Nothing to order by: pass straight through
+                self._release(data, arrival, arrival, deliver)
+                return
+            key = sequence if by_sequence else client_timestamp
             
-            threading.Thread(target=self._accept_loop, daemon=True).start()
-            logger.info(f"Stream server started successfully on port {self.port}")
+            if self._keyed_by_sequence != by_sequence or (by_sequence and sequence == 0 and self.next_key):
+                # New client or a restarted recorder: start a fresh sequence
+                self._flush(arrival, deliver)
+                self._keyed_by_sequence = by_sequence
+                self.next_key = key
             
-        except socket.timeout:
-            logger.error(f"Stream server bind/listen timeout on port {self.port}")
-            raise
-        except OSError as e:
-            if e.errno == 98:  # Address already in use
-                logger.error(f"Port {self.port} already in use")
-            else:
-                logger.error(f"Stream server socket error: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Stream server start failed: {e}")
-            raise
+            if self.next_key is not None and key < self.next_key:
+                if any(held[0] == key for held in self._held):
+                    self.stats['duplicates'] += 1
+                else:
+                    self.stats['late_dropped'] += 1
+                    # Late chunks mean the target is too small for this link
+                    self.late_penalty = min(self.max_delay, self.late_penalty + 0.02)
+                return
+            
+            if any(held[0] > key for held in self._held):
+                # Overtaken by a later upload but still in time
+                self.stats['reordered'] += 1
+            heapq.heappush(self._held, (key, arrival, data))
+            self._release_due(arrival, deliver)
     
-    def _accept_loop(self):
-        """Accept incoming connections"""
-        while self.running:
-            try:
-                client_socket, address = self.server_socket.accept()
-                logger.info(f"Stream client connected: {address}")
-                
-                # Handle client in separate thread
-                threading.Thread(
-                    target=self._handle_client, 
-                    args=(client_socket, address), 
-                    daemon=True
-                ).start()
-                
-            except Exception as e:
-                if self.running:
-                    logger.error(f"Stream accept error: {e}")
+    def _update_jitter(self, arrival: float, client_timestamp: float):
+        transit = arrival - client_timestamp / 1000.0
+        if self.last_transit is not None:
+            deviation = abs(transit - self.last_transit)
+            self.jitter += (deviation - self.jitter) / 16.0
+        self.last_transit = transit
     
-    def _handle_client(self, client_socket, address):
-        """Handle stream client"""
-        try:
-            while self.running:
-                data = client_socket.recv(4096)
-                if not data:
-                    break
-                
-                # Process audio data (simplified)
-                logger.debug(f"Received audio data from {address}: {len(data)} bytes")
-                
-        except Exception as e:
-            logger.error(f"Stream client error: {e}")
-        finally:
-            client_socket.close()
-            logger.info(f"Stream client disconnected: {address}")
+    def _release_due(self, now: float, deliver):
+        target = self.target_delay
+        while self._held:
+            key, arrival, data = self._held[0]
+            in_order = self._keyed_by_sequence and key == self.next_key
+            if not in_order and now - arrival < target:
+                break
+            heapq.heappop(self._held)
+            if self._keyed_by_sequence and key != self.next_key:
+                self.stats['underruns'] += key - self.next_key
+            self.next_key = key + 1 if self._keyed_by_sequence else key
+            self._release(data, arrival, now, deliver)
     
-    def stop(self):
-        """Stop stream server"""
-        self.running = False
-        if self.server_socket:
-            self.server_socket.close()
+    def _flush(self, now: float, deliver):
+        while self._held:
+            _, arrival, data = heapq.heappop(self._held)
+            self._release(data, arrival, now, deliver)
+    
+    def _release(self, data: bytes, arrival: float, now: float, deliver):
+        self.stats['released'] += 1
+        self.stats['hold_time_total'] += now - arrival
+        self.late_penalty *= 0.99
+        deliver(data)
+    
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            hold_total = stats.pop('hold_time_total')
+            stats.update({
+                'held_chunks': len(self._held),
+                'arrival_jitter_ms': round(self.jitter * 1000, 2),
+                'target_delay_ms': round(self.target_delay * 1000, 2),
+                'average_hold_ms': round(hold_total * 1000 / stats['released'], 2) if stats['released'] else 0.0,
+                'keyed_by': None if self._keyed_by_sequence is None else ('sequence' if self._keyed_by_sequence else 'timestamp')
+            })
+            return stats
 
 
-class HTTPHandler(SimpleHTTPRequestHandler):
-    """Enhanced HTTP handler for web interface and API"""
+class LevelMeter:
+    """Sliding-window RMS, sample peak and true peak of one client stream
+
+    Audio is added in blocks (a PCM chunk or one Opus frame). Each block is
+    reduced once to a sum of squares and its peaks - vectorized with NumPy
+    when available - and the windows are updated incrementally: a running
+    sum for RMS and monotonic deques for the held peaks. Reading the meter
+    is O(1), so /api/audio/levels never touches audio data.
     
-    def __init__(self, *args, **kwargs):
-        self.network_discovery = NetworkDiscovery()
-        self.websocket_handler = SimpleWebSocketHandler()
-        super().__init__(*args, **kwargs)
-    
-    def do_GET(self):
-        """Handle GET requests"""
-        if self.path == '/':
-            self.serve_index()
-        elif self.path == '/api/streams':
-            self.serve_streams_api()
-        elif self.path == '/api/config':
-            self.serve_config_api()
-        elif self.path == '/api/network':
-            self.serve_network_api()
-        elif self.path == '/api/events':
-            self.serve_events_stream()
-        elif self.path == '/health':
-            self.serve_health()
-        elif self.path == '/api/rtp/streams':
-            if hasattr(self.server, 'server_port') and self.server.server_port == 8081:
-                self.send_json_response({
-                    'success': False, 
-                    'error': 'RTP functions require HTTPS server. Please use https://192.168.188.90:6969/api/rtp/streams'
-                })
-            else:
-                self.serve_rtp_streams_api()
-        elif self.path == '/api/audio/levels':
-            self.serve_audio_levels_api()
-        elif self.path.startswith('/static/'):
-            self.serve_static_file()
-        elif self.path.startswith('/client/') and self.path.endswith('/stream'):
-            self.serve_client_stream()
-        elif self.path.startswith('/client/') and self.path.endswith('/audio'):
-            self.serve_client_audio_player()
-        elif self.path.startswith('/client/') and self.path.endswith('/wav'):
-            self.serve_client_wav_stream()
-        elif self.path == '/ws/audio-stream' and 'upgrade' in self.headers.get('Connection', '').lower():
-            self.handle_audio_websocket_upgrade()
-        elif self.path == '/ws' or 'upgrade' in self.headers.get('Connection', '').lower():
-            self.handle_websocket_upgrade()
-        else:
-            self.send_error(404)
+    Without a PCM source, Opus frames give only an activity estimate from
+    their bitrate relative to the stream's nominal bitrate (``source``
+    ``'opus-bitrate'``); decoded PCM always takes precedence.
+    """
     
-    def do_POST(self):
-        """Handle POST requests"""
-        if self.path == '/api/stream/start':
-            self.handle_start_stream()
-        elif self.path == '/api/stream/register':
-            self.handle_register_stream()
-        elif self.path == '/api/stream/stop':
-            self.handle_stop_stream()
-        elif self.path == '/api/audio/level':
-            self.handle_audio_level()
-        elif self.path == '/api/audio/upload':
-            self.handle_audio_upload()
-        elif self.path == '/api/system/update':
-            self.handle_system_update()
-        elif self.path == '/api/rtp/start':
-            # Check if this is the HTTPS server (port 6969) or HTTP server (port 8081)
-            if hasattr(self.server, 'server_port') and self.server.server_port == 8081:
-                self.send_json_response({
-                    'success': False, 
-                    'error': 'RTP functions require HTTPS server. Please use https://192.168.188.90:6969/api/rtp/start'
-                })
-            else:
-                self.handle_rtp_start()
-        elif self.path == '/api/rtp/stop':
-            if hasattr(self.server, 'server_port') and self.server.server_port == 8081:
-                self.send_json_response({
-                    'success': False, 
-                    'error': 'RTP functions require HTTPS server. Please use https://192.168.188.90:6969/api/rtp/stop'
-                })
-            else:
-                self.handle_rtp_stop()
+    FLOOR_DB = -60.0
+    TRUE_PEAK_OVERSAMPLING = 4
+    TRUE_PEAK_TAPS = 12  # per phase, as in ITU-R BS.1770 annex 2
+    _true_peak_filter = None
+    
+    def __init__(self, sample_rate: int = 48000, channels: int = 1):
+        self.sample_rate = sample_rate
+        self.channels = max(1, channels)
+        self.rms_window = int(CONFIG['level_rms_window'] * sample_rate)
+        self.peak_window = int(CONFIG['level_peak_window'] * sample_rate)
+        self.position = 0  # Frames (samples per channel) metered so far
+        self.rms_blocks = collections.deque()  # (frames, sum_squares)
+        self.rms_frames = 0
+        self.rms_sum = 0.0
+        self.peaks = collections.deque()  # (end_position, peak), decreasing
+        self.true_peaks = collections.deque()
+        self.history = None  # Last samples for the true-peak filter
+        self.source = None
+        self.updated = 0.0
+    
+    @classmethod
+    def true_peak_filter(cls):
+        """Polyphase windowed-sinc interpolator for 4x true-peak oversampling"""
+        if cls._true_peak_filter is None:
+            factor = cls.TRUE_PEAK_OVERSAMPLING
+            length = factor * cls.TRUE_PEAK_TAPS
+            n = numpy.arange(length) - (length - 1) / 2.0
+            taps = numpy.sinc(n / factor) * numpy.kaiser(length, 5.0)
+            phases = taps.reshape(cls.TRUE_PEAK_TAPS, factor).T
+            cls._true_peak_filter = phases / phases.sum(axis=1, keepdims=True)
+        return cls._true_peak_filter
+    
+    def add_pcm(self, data, source: str = 'pcm'):
+        """Meter interleaved signed 16-bit little-endian PCM"""
+        usable = len(data) - len(data) % 2
+        if usable <= 0:
+            return
+        if numpy is not None:
+            samples = numpy.frombuffer(data, dtype='<i2', count=usable // 2).astype(numpy.float64) / 32768.0
+            sum_squares = float(numpy.dot(samples, samples))
+            peak = float(numpy.abs(samples).max())
+            true_peak = max(peak, self._oversampled_peak(samples))
         else:
-            self.send_error(404)
+            samples = array.array('h', bytes(data[:usable]))
+            if sys.byteorder == 'big':
+                samples.byteswap()
+            sum_squares = sum(map(operator.mul, samples, samples)) / (32768.0 * 32768.0)
+            peak = max(max(samples), -min(samples)) / 32768.0
+            true_peak = None  # Needs oversampling; sample peak is the lower bound
+        self._add_block(len(samples) // self.channels, sum_squares / self.channels, peak, true_peak, source)
     
-    def do_OPTIONS(self):
-        """Handle CORS preflight requests"""
-        self.send_response(200)
-        self.add_cors_headers()
-        self.end_headers()
+    def add_opus_frame(self, frame: bytes, reference_bitrate: int):
+        """Activity estimate for an Opus frame that cannot be decoded"""
+        if self.source == 'pcm' and time.time() - self.updated < 1.0:
+            return
+        frames = WebMOpusDemuxer.opus_packet_samples(frame) * self.sample_rate // 48000
+        if frames <= 0:
+            return
+        bitrate = len(frame) * 8 * self.sample_rate / frames
+        amplitude = min(1.0, bitrate / max(reference_bitrate, 1))
+        self._add_block(frames, amplitude * amplitude * frames, amplitude, None, 'opus-bitrate')
+    
+    def _oversampled_peak(self, samples) -> float:
+        """Peak of the 4x interpolated signal, continuous across blocks"""
+        taps = self.TRUE_PEAK_TAPS
+        channel_samples = samples[:len(samples) - len(samples) % self.channels].reshape(-1, self.channels)
+        if self.history is None:
+            self.history = numpy.zeros((taps - 1, self.channels))
+        signal = numpy.concatenate((self.history, channel_samples))
+        self.history = signal[-(taps - 1):]
+        if len(signal) < taps:
+            return 0.0
+        # All interpolation phases as one product: (windows x taps) @ (taps x phases)
+        peak = 0.0
+        kernels = self.true_peak_filter()[:, ::-1].T
+        for channel in range(self.channels):
+            column = numpy.ascontiguousarray(signal[:, channel])
+            windows = numpy.lib.stride_tricks.as_strided(
+                column, shape=(len(column) - taps + 1, taps), strides=(column.strides[0], column.strides[0])
+            )
+            peak = max(peak, float(numpy.abs(windows @ kernels).max()))
+        return peak
+    
+    def _add_block(self, frames: int, sum_squares: float, peak: float, true_peak, source: str):
+        self.position += frames
+        self.source = source
+        self.updated = time.time()
+        
+        self.rms_blocks.append((frames, sum_squares))
+        self.rms_frames += frames
+        self.rms_sum += sum_squares
+        while len(self.rms_blocks) > 1 and self.rms_frames - self.rms_blocks[0][0] >= self.rms_window:
+            old_frames, old_sum = self.rms_blocks.popleft()
+            self.rms_frames -= old_frames
+            self.rms_sum -= old_sum
+        
+        self._hold_peak(self.peaks, peak)
+        self._hold_peak(self.true_peaks, true_peak if true_peak is not None else peak)
+    
+    def _hold_peak(self, held: collections.deque, value: float):
+        while held and held[-1][1] <= value:
+            held.pop()
+        held.append((self.position, value))
+        while held[0][0] <= self.position - self.peak_window:
+            held.popleft()
+    
+    @classmethod
+    def to_db(cls, amplitude: float) -> float:
+        if amplitude <= 0.0:
+            return cls.FLOOR_DB
+        return max(cls.FLOOR_DB, round(20.0 * math.log10(amplitude), 1)) + 0.0  # no -0.0
+    
+    def snapshot(self) -> Optional[dict]:
+        """Current window values, or None before the first block"""
+        if not self.rms_frames:
+            return None
+        rms = math.sqrt(max(self.rms_sum, 0.0) / self.rms_frames)
+        rms_db = self.to_db(rms)
+        peak_db = self.to_db(self.peaks[0][1])
+        return {
+            # 0-100 on a -60..0 dBFS scale, as drawn by the dashboard meters
+            'level': round((rms_db - self.FLOOR_DB) / -self.FLOOR_DB * 100, 1),
+            'peak': round((peak_db - self.FLOOR_DB) / -self.FLOOR_DB * 100, 1),
+            'rms_db': rms_db,
+            'peak_db': peak_db,
+            'true_peak_db': self.to_db(self.true_peaks[0][1]) if self.source == 'pcm' and numpy is not None else None,
+            'source': self.source
+        }
 
-    def do_HEAD(self):
-        """Handle HEAD requests - check if resource exists without returning body"""
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.add_cors_headers()
-            self.end_headers()
-        elif self.path == '/api/streams':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.add_cors_headers()
-            self.end_headers()
-        elif self.path == '/api/config':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.add_cors_headers()
-            self.end_headers()
-        elif self.path == '/api/network':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.add_cors_headers()
-            self.end_headers()
-        elif self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.add_cors_headers()
-            self.end_headers()
-        elif self.path.startswith('/static/'):
-            # Check if static file exists
-            file_path = self.path[1:]  # Remove leading /
-            static_path = Path(__file__).parent / file_path
-            if static_path.exists():
-                self.send_response(200)
-                if file_path.endswith('.css'):
-                    content_type = 'text/css'
-                elif file_path.endswith('.js'):
-                    content_type = 'application/javascript'
-                elif file_path.endswith('.html'):
-                    content_type = 'text/html'
-                else:
-                    content_type = 'text/plain'
-                self.send_header('Content-type', content_type)
-                self.add_cors_headers()
-                self.end_headers()
-            else:
-                self.send_response(404)
-                self.add_cors_headers()
-                self.end_headers()
-        elif self.path.startswith('/client/') and self.path.endswith('/stream'):
-            # Always respond 200 for client stream HEAD requests (matches GET behavior)
-            path_parts = self.path.split('/')
-            if len(path_parts) >= 3:
-                client_ip = path_parts[2]
-                logger.info(f"HEAD request for client stream: {client_ip}")
-                self.send_response(200)
-                self.send_header('Content-type', 'audio/webm')
-                self.add_cors_headers()
-                self.end_headers()
-            else:
-                self.send_response(400)
-                self.add_cors_headers()
-                self.end_headers()
-        else:
-            self.send_response(404)
-            self.add_cors_headers()
-            self.end_headers()
+
+class LibopusDecoder:
+    """Opus frame decoder on libopus through ctypes (one instance per client)
+
+    Demuxed frames are decoded synchronously on ingest and handed to
+    ``sink`` as 48 kHz s16le PCM.
+    """
     
-    def handle_websocket_upgrade(self):
-        """Handle WebSocket upgrade request"""
-        if self.websocket_handler.handle_websocket_handshake(self):
-            client_id = f"{self.client_address[0]}_{int(time.time())}"
-            self.websocket_handler.add_client(client_id, {
-                'address': self.client_address,
-                'connected_at': datetime.now()
-            })
+    SAMPLE_RATE = 48000
+    MAX_FRAME_SAMPLES = 5760  # 120 ms, the longest Opus packet
+    _library = None
+    _library_searched = False
     
-    def handle_audio_websocket_upgrade(self):
-        """Handle audio streaming WebSocket upgrade"""
+    @classmethod
+    def library(cls):
+        """The loaded libopus, or None when it is not installed"""
+        if not cls._library_searched:
+            cls._library_searched = True
+            path = CONFIG['libopus_path'] or ctypes.util.find_library('opus')
+            if path:
+                try:
+                    library = ctypes.CDLL(path)
+                    library.opus_decoder_create.argtypes = [ctypes.c_int32, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+                    library.opus_decoder_create.restype = ctypes.c_void_p
+                    library.opus_decode.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int32,
+                                                    ctypes.POINTER(ctypes.c_int16), ctypes.c_int, ctypes.c_int]
+                    library.opus_decode.restype = ctypes.c_int
+                    library.opus_decoder_destroy.argtypes = [ctypes.c_void_p]
+                    library.opus_decoder_destroy.restype = None
+                    cls._library = library
+                except (OSError, AttributeError) as e:
+                    logger.warning(f"libopus at {path} not usable: {e}")
+        return cls._library
+    
+    def __init__(self, channels: int, sink):
+        library = self.library()
+        if library is None:
+            raise OSError("libopus not available")
+        error = ctypes.c_int(0)
+        self.channels = channels
+        self.sink = sink
+        self.errors = 0
+        self._library = library
+        self._state = library.opus_decoder_create(self.SAMPLE_RATE, channels, ctypes.byref(error))
+        if not self._state or error.value != 0:
+            raise OSError(f"opus_decoder_create failed ({error.value})")
+        self._pcm = (ctypes.c_int16 * (self.MAX_FRAME_SAMPLES * channels))()
+    
+    def feed(self, data, frames: list):
+        """Decode the demuxed frames; the raw container bytes are not needed"""
+        for _timestamp_ns, frame, _end_position in frames:
+            samples = self._library.opus_decode(self._state, bytes(frame), len(frame),
+                                                self._pcm, self.MAX_FRAME_SAMPLES, 0)
+            if samples < 0:
+                self.errors += 1
+                continue
+            pcm = ctypes.string_at(self._pcm, samples * self.channels * 2)
+            if sys.byteorder == 'big':
+                swapped = array.array('h', pcm)
+                swapped.byteswap()
+                pcm = swapped.tobytes()
+            self.sink(pcm)
+    
+    @property
+    def failed(self) -> bool:
+        return self._state is None
+    
+    def close(self):
+        if self._state:
+            self._library.opus_decoder_destroy(self._state)
+            self._state = None
+
+
+class FfmpegOpusDecoder:
+    """Opus decode in an ffmpeg subprocess fed the client's WebM bytes
+
+    Stand-in for hosts without libopus. One writer and one reader thread
+    per client keep the ingest path from ever blocking on the pipe; the
+    reader hands 48 kHz s16le PCM to ``sink`` as ffmpeg produces it.
+    """
+    
+    READ_SIZE = 3840  # 20 ms of 48 kHz stereo s16le
+    
+    @staticmethod
+    def available() -> bool:
+        return shutil.which(CONFIG['ffmpeg_binary']) is not None
+    
+    def __init__(self, channels: int, sink):
+        self.channels = channels
+        self.sink = sink
+        self.errors = 0
+        self.process = subprocess.Popen(
+            [CONFIG['ffmpeg_binary'], '-hide_banner', '-loglevel', 'error', '-fflags', 'nobuffer',
+             '-f', 'webm', '-i', 'pipe:0',
+             '-f', 's16le', '-ac', str(channels), '-ar', str(LibopusDecoder.SAMPLE_RATE), 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self.pending = queue.Queue(maxsize=256)
+        threading.Thread(target=self._write_loop, name='pimic-ffmpeg-in', daemon=True).start()
+        threading.Thread(target=self._read_loop, name='pimic-ffmpeg-out', daemon=True).start()
+    
+    def feed(self, data, frames: list):
+        """Queue the raw container bytes for ffmpeg"""
         try:
-            logger.info(f"Audio WebSocket upgrade request from {self.client_address[0]}")
-            logger.info(f"Headers: {dict(self.headers)}")
-            if self.websocket_handler.handle_websocket_handshake(self):
-                logger.info("Audio WebSocket handshake successful")
-                # Hand over to audio stream handler
-                AudioStreamHandler().handle_audio_websocket(self)
-            else:
-                logger.error("Audio WebSocket handshake failed")
-                self.send_error(400, "WebSocket handshake failed")
-        except Exception as e:
-            logger.error(f"Audio WebSocket upgrade failed: {e}")
-            self.send_error(500)
+            self.pending.put_nowait(bytes(data))
+        except queue.Full:
+            # ffmpeg is not keeping up; the stream will show a gap
+            self.errors += 1
     
-    def serve_client_stream(self):
-        """Serve audio stream for a specific client"""
-        logger.info(f"serve_client_stream called with path: {self.path}")
+    def _write_loop(self):
         try:
-            # Parse client IP from URL: /client/192.168.1.100/stream
-            path_parts = self.path.split('/')
-            logger.info(f"Path parts: {path_parts}")
-            if len(path_parts) >= 3:
-                client_ip = path_parts[2]
-                
-                logger.info(f"Serving stream for client {client_ip}")
-                
-                # Get audio data from HTTP audio buffer
-                global global_audio_handler
-                if global_audio_handler is None:
-                    global_audio_handler = AudioStreamHandler()
-                    logger.info("Created new AudioStreamHandler")
-                
-                audio_data = global_audio_handler.get_audio_stream(client_ip)
-                logger.info(f"Retrieved {len(audio_data)} bytes for client {client_ip}")
-                
-                if audio_data and len(audio_data) > 0:
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'audio/webm')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Cache-Control', 'no-cache')
-                    self.send_header('Accept-Ranges', 'bytes')
-                    self.end_headers()
-                    
-                    self.wfile.write(audio_data)
-                    logger.info(f"Served {len(audio_data)} bytes of audio for client {client_ip}")
-                else:
-                    # No data available, send test response for debugging
-                    test_data = b'test audio data'
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'audio/webm')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Cache-Control', 'no-cache')
-                    self.send_header('Content-Length', str(len(test_data)))
-                    self.end_headers()
-                    self.wfile.write(test_data)
-                    logger.info(f"Sent test data for client {client_ip} - no real audio data available")
-            else:
-                logger.error(f"Invalid path format: {self.path}")
-                self.send_error(400, "Invalid stream URL")
-                
-        except Exception as e:
-            logger.error(f"Client stream serving error: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            self.send_error(500)
+            while True:
+                data = self.pending.get()
+                if data is None:
+                    break
+                self.process.stdin.write(data)
+                self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+        finally:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
     
-    def serve_client_audio_player(self):
-        """Serve a chunked audio stream that browsers can play"""
+    def _read_loop(self):
+        stdout = self.process.stdout
+        block = 2 * self.channels
+        remainder = b''
+        while True:
+            data = stdout.read1(self.READ_SIZE)
+            if not data:
+                break
+            data = remainder + data
+            usable = len(data) - len(data) % block
+            remainder = data[usable:]
+            if usable:
+                self.sink(data[:usable])
+        self.process.wait()
+    
+    @property
+    def failed(self) -> bool:
+        return self.process.poll() is not None
+    
+    def close(self):
+        """Send EOF to ffmpeg and reap it, killing it after ffmpeg_stop_timeout
+
+        Callers hold the client lock or run on the event loop, so the
+        bounded wait runs on a short-lived thread instead of blocking them.
+        """
         try:
-            # Parse client IP from URL: /client/192.168.1.100/audio
-            path_parts = self.path.split('/')
-            if len(path_parts) >= 3:
-                client_ip = path_parts[2]
-                
-                logger.info(f"Serving chunked audio for client {client_ip}")
-                
-                # Start chunked response
-                self.send_response(200)
-                self.send_header('Content-Type', 'audio/webm')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Cache-Control', 'no-cache')
-                self.send_header('Transfer-Encoding', 'chunked')
-                self.end_headers()
-                
-                # Stream audio data in chunks
-                global global_audio_handler
-                if global_audio_handler is None:
-                    global_audio_handler = AudioStreamHandler()
-                audio_handler = global_audio_handler
-                chunk_size = 4096  # 4KB chunks
-                timeout = 30  # 30 seconds timeout
-                start_time = time.time()
-                
-                try:
-                    while (time.time() - start_time) < timeout:
-                        audio_data = audio_handler.get_audio_stream(client_ip)
-                        
-                        if audio_data and len(audio_data) > 0:
-                            # Send data in chunks
-                            for i in range(0, len(audio_data), chunk_size):
-                                chunk = audio_data[i:i + chunk_size]
-                                if chunk:
-                                    # Write chunk size in hex followed by CRLF
-                                    chunk_size_hex = hex(len(chunk))[2:].encode() + b'\r\n'
-                                    self.wfile.write(chunk_size_hex)
-                                    # Write chunk data followed by CRLF
-                                    self.wfile.write(chunk + b'\r\n')
-                                    self.wfile.flush()
-                        
-                        # Small delay to prevent busy loop
-                        time.sleep(0.05)  # 50ms delay
-                    
-                    # End chunked encoding
-                    self.wfile.write(b'0\r\n\r\n')
-                    
-                except Exception as e:
-                    logger.error(f"Chunked streaming error: {e}")
-                    # Try to end chunked encoding gracefully
-                    try:
-                        self.wfile.write(b'0\r\n\r\n')
-                    except:
-                        pass
-            else:
-                self.send_error(400, "Invalid audio URL")
-                
+            self.pending.put_nowait(None)
+        except queue.Full:
+            # The writer is stuck on a full pipe and would never see EOF
+            self.process.kill()
+        threading.Thread(target=self._stop, name='pimic-ffmpeg-stop', daemon=True).start()
+    
+    def _stop(self):
+        try:
+            self.process.wait(timeout=CONFIG['ffmpeg_stop_timeout'])
+        except subprocess.TimeoutExpired:
+            logger.warning(f"ffmpeg decoder (pid {self.process.pid}) ignored EOF, killing it")
+            self.process.kill()
+            self.process.wait()
+
+
+def opus_decoder_backend() -> Optional[str]:
+    """Decoder used for new clients: 'libopus', 'ffmpeg' or None"""
+    choice = CONFIG['opus_decoder']
+    if choice in ('auto', 'libopus') and LibopusDecoder.library() is not None:
+        return 'libopus'
+    if choice in ('auto', 'ffmpeg') and FfmpegOpusDecoder.available():
+        return 'ffmpeg'
+    return None
+
+
+def create_opus_decoder(channels: int, sink):
+    """Per-client Opus decoder writing PCM to ``sink``, or None without one"""
+    backend = opus_decoder_backend()
+    try:
+        if backend == 'libopus':
+            return LibopusDecoder(channels, sink)
+        if backend == 'ffmpeg':
+            return FfmpegOpusDecoder(channels, sink)
+    except OSError as e:
+        logger.warning(f"Opus decoder ({backend}) could not be started: {e}")
+    return None
+
+
+class AudioStreamHandler:
+    """Handle audio streaming via WebSocket"""
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        # First use happens lazily on request, executor and stream threads
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.audio_clients = CopyOnWriteDict()  # client_ip -> client state
+                instance.stream_buffers = CopyOnWriteDict()  # stream_id -> audio_buffer
+                cls._instance = instance
+        return cls._instance
+    
+    def handle_audio_websocket(self, request_handler):
+        """Handle WebSocket connection for audio streaming"""
+        try:
+            client_ip = request_handler.client_address[0]
+            logger.info(f"Audio WebSocket connected from {client_ip}")
+            
+            connection = WebSocketConnection(request_handler.connection)
+            
+            # Start reading WebSocket frames
+            self.read_websocket_frames(connection, client_ip)
+            
         except Exception as e:
-            logger.error(f"Client audio serving error: {e}")
-            self.send_error(500)
+            logger.error(f"Audio WebSocket error: {e}")
+        finally:
+            # Reset socket timeout
+            request_handler.connection.settimeout(None)
+            request_handler.close_connection = True
     
-    def serve_client_wav_stream(self):
-        """Serve audio stream as simple WAV header + raw data for browser compatibility"""
+    def read_websocket_frames(self, connection: WebSocketConnection, client_ip):
+        """Read and process WebSocket messages until the socket closes"""
         try:
-            # Parse client IP from URL: /client/192.168.1.100/wav
-            path_parts = self.path.split('/')
-            if len(path_parts) >= 3:
-                client_ip = path_parts[2]
-                
-                logger.info(f"Serving WAV stream for client {client_ip}")
-                
-                # Get audio data
-                global global_audio_handler
-                if global_audio_handler is None:
-                    global_audio_handler = AudioStreamHandler()
-                audio_data = global_audio_handler.get_audio_stream(client_ip)
+            while not connection.closed and server_running:
+                # Timeout is normal, it only lets us notice shutdown
+                message = connection.recv(timeout=1.0)
+                if message is None:
+                    continue
                 
-                if audio_data and len(audio_data) > 0:
-                    # Create minimal WAV header for PCM data
-                    # This is a simplified approach - real WebM->WAV conversion would be more complex
-                    sample_rate = 48000  # Assume 48kHz
-                    channels = 1  # Mono
-                    bits_per_sample = 16
-                    
-                    # WAV header (44 bytes)
-                    wav_header = bytearray(44)
-                    wav_header[0:4] = b'RIFF'
-                    wav_header[4:8] = (len(audio_data) + 36).to_bytes(4, 'little')  # File size - 8
-                    wav_header[8:12] = b'WAVE'
-                    wav_header[12:16] = b'fmt '
-                    wav_header[16:20] = (16).to_bytes(4, 'little')  # Subchunk1Size
-                    wav_header[20:22] = (1).to_bytes(2, 'little')   # AudioFormat (PCM)
-                    wav_header[22:24] = channels.to_bytes(2, 'little')  # NumChannels
-                    wav_header[24:28] = sample_rate.to_bytes(4, 'little')  # SampleRate
-                    wav_header[28:32] = (sample_rate * channels * bits_per_sample // 8).to_bytes(4, 'little')  # ByteRate
-                    wav_header[32:34] = (channels * bits_per_sample // 8).to_bytes(2, 'little')  # BlockAlign
-                    wav_header[34:36] = bits_per_sample.to_bytes(2, 'little')  # BitsPerSample
-                    wav_header[36:40] = b'data'
-                    wav_header[40:44] = len(audio_data).to_bytes(4, 'little')  # Subchunk2Size
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'audio/wav')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Cache-Control', 'no-cache')
-                    self.send_header('Content-Length', str(44 + len(audio_data)))
-                    self.end_headers()
+                kind, payload = message
+                if kind == 'text':  # Text message (JSON config)
+                    client_ip = self.handle_config_message(json.loads(payload), client_ip)
+                else:  # Binary message (audio data)
+                    self.handle_audio_data(payload, client_ip)
                     
-                    # Send WAV header + audio data
-                    self.wfile.write(wav_header)
-                    self.wfile.write(audio_data)
-                else:
-                    # No data available
-                    self.send_response(204)  # No Content
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-            else:
-                self.send_error(400, "Invalid WAV stream URL")
-                
         except Exception as e:
-            logger.error(f"WAV stream serving error: {e}")
+            logger.error(f"WebSocket frame reading error: {e}")
+            connection.close(WebSocketCodec.CLOSE_INTERNAL_ERROR)
+        finally:
+            self.remove_client(client_ip)
+            logger.info(f"Audio WebSocket closed for {client_ip}")
+    
+    def _create_client_state(self, config: dict) -> dict:
+        """Create per-client state with a preallocated ring buffer"""
+        buffer = AudioRingBuffer(
+            CONFIG['client_buffer_size'],
+            CONFIG['buffer_overflow_policy']
+        )
+        # Browsers record audio/webm;codecs=opus unless the client says otherwise
+        audio_format = str(config.get('format') or config.get('mimeType') or 'audio/webm').lower()
+        is_webm = 'webm' in audio_format or 'matroska' in audio_format
+        is_pcm = 'pcm' in audio_format or 'l16' in audio_format
+        channels = int(config.get('channels') or 1)
+        # PCM uploads are their own PCM ring; Opus is decoded at 48 kHz
+        sample_rate = int(config.get('sampleRate') or 48000) if is_pcm else LibopusDecoder.SAMPLE_RATE
+        if not is_pcm:
+            channels = min(channels, 2)
+        client_data = {
+            'config': config,
+            'buffer': buffer,
+            'is_pcm': is_pcm,
+            'meter': LevelMeter(sample_rate, channels),
+            'bitrate': int(config.get('bitrate') or CONFIG['max_bitrate']) * 1000,
+            'demuxer': WebMOpusDemuxer() if is_webm else None,
+            'opus_frames': collections.deque(maxlen=CONFIG['opus_frame_queue']),
+            'lock': threading.RLock(),  # Serializes ingest, decoder output and meter reads
+            'decoder': None,
+            'pcm': buffer if is_pcm else None,
+            'pcm_format': (sample_rate, channels),
+            'jitter_buffer': IngestJitterBuffer(
+                CONFIG['ingest_jitter_factor'],
+                CONFIG['ingest_jitter_min_ms'],
+                CONFIG['ingest_jitter_max_ms']
+            ),
+            'last_data': time.time()
+        }
+        if is_webm:
+            decoder = create_opus_decoder(channels, functools.partial(self._store_pcm, client_data))
+            if decoder is not None:
+                client_data['decoder'] = decoder
+                client_data['pcm'] = AudioRingBuffer(
+                    int(CONFIG['pcm_buffer_seconds'] * sample_rate) * channels * 2,
+                    AudioRingBuffer.DROP_OLDEST
+                )
+        return client_data
+    
+    def _release_client_state(self, client_data: Optional[dict]):
+        """Stop the decoder of a client state that is being replaced or removed"""
+        if client_data is not None and client_data['decoder'] is not None:
+            with client_data['lock']:
+                client_data['decoder'].close()
+    
+    def _ingest(self, client_data: dict, data):
+        """Store received bytes, demux any Opus frames they complete and meter them
+
+        Opus is decoded here, once per client, into the client's PCM ring;
+        every PCM consumer (WAV listeners, metering, L16 RTP) reads that
+        ring. Without a decoder the meter falls back to a bitrate estimate.
+        """
+        # Per-client lock: different clients ingest in parallel
+        with client_data['lock']:
+            stored = client_data['buffer'].write(data)
+            if stored < len(data):
+                # DROP_NEWEST discarded the tail; demuxer positions must
+                # keep matching the buffer's write position
+                data = memoryview(data).cast('B')[:stored]
+                if not stored:
+                    return
+            client_data['last_data'] = time.time()
+            meter = client_data['meter']
+            if client_data['is_pcm']:
+                meter.add_pcm(data)
+            elif client_data['demuxer'] is not None:
+                frames = client_data['demuxer'].feed(data)
+                client_data['opus_frames'].extend(frames)
+                decoder = client_data['decoder']
+                if decoder is not None and not decoder.failed:
+                    decoder.feed(data, frames)
+                    return
+                for _timestamp_ns, frame, _end_position in frames:
+                    meter.add_opus_frame(frame, client_data['bitrate'])
+    
+    def _store_pcm(self, client_data: dict, pcm: bytes):
+        """Decoder sink: append decoded PCM to the client's ring and meter it"""
+        with client_data['lock']:
+            client_data['pcm'].write(pcm)
+            client_data['meter'].add_pcm(pcm)
+    
+    def handle_config_message(self, config, client_ip):
+        """Handle stream configuration message
+
+        A ``clientIP`` in the config names the stream like the upload
+        routes do. Returns the client id the following audio belongs to.
+        """
+        client_ip = str(config.get('clientIP') or client_ip)
+        logger.info(f"Audio stream config from {client_ip}: {config}")
+        self._release_client_state(self.audio_clients.replace(client_ip, self._create_client_state(config)))
+        return client_ip
+    
+    def _get_or_create_client(self, client_ip) -> dict:
+        """State of a client that sends audio without a config message
+
+        Concurrent first uploads race to create the state; the loser's
+        state is discarded before any audio went into it.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None:
+            created = self._create_client_state({'format': 'audio/webm'})
+            client_data = self.audio_clients.setdefault(client_ip, created)
+            if client_data is not created:
+                self._release_client_state(created)
+        return client_data
+    
+    def remove_client(self, client_ip):
+        """Drop a client's stream state when its connection closes"""
+        self._release_client_state(self.audio_clients.pop(client_ip, None))
+    
+    def handle_audio_data(self, data, client_ip):
+        """Handle incoming audio data"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            self._ingest(client_data, data)
+            logger.debug("Audio data received from %s: %d bytes, buffer size: %d bytes",
+                         client_ip, len(data), len(client_data['buffer']), extra={'event': 'audio_chunk'})
+            # In a full implementation, this would forward to stream endpoints
+    
+    def handle_http_audio_data(self, data, client_ip, sequence: Optional[int] = None,
+                               client_timestamp: Optional[float] = None):
+        """Handle HTTP-uploaded audio data
+
+        Uploads may finish out of order, so they pass the client's jitter
+        buffer, which hands them to the stream in upload order.
+        """
+        client_data = self._get_or_create_client(client_ip)
+        client_data['jitter_buffer'].push(
+            data, sequence, client_timestamp,
+            functools.partial(self._ingest, client_data)
+        )
+        logger.debug("HTTP audio data received from %s: %d bytes, buffer size: %d bytes",
+                     client_ip, len(data), len(client_data['buffer']), extra={'event': 'audio_chunk'})
+            
+    def handle_stream_audio_data(self, data, client_ip):
+        """Handle bytes from a persistent ingest channel (chunked POST)
+
+        One connection delivers the session in order, so the data skips the
+        jitter buffer and goes straight to the ring buffer.
+        """
+        self._ingest(self._get_or_create_client(client_ip), data)
+    
+    def get_audio_stream(self, client_ip):
+        """Get audio stream for a specific client"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            # The ring buffer is bounded by capacity, so no trimming is needed;
+            # return a copy of the unread data without consuming it
+            return client_data['buffer'].snapshot()
+        return b''
+    
+    def get_audio_stream_from(self, client_ip, cursor: int):
+        """Get audio written since an absolute stream cursor
+
+        Lets polling listeners keep their own position without server-side
+        state. Returns ``(data, next_cursor)``.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            data, next_cursor, _ = client_data['buffer'].read_from(cursor)
+            return data, next_cursor
+        return b'', cursor
+    
+    def get_stream_cursor(self, client_ip) -> int:
+        """Current absolute write position of a client's stream"""
+        client_data = self.audio_clients.get(client_ip)
+        return client_data['buffer'].write_pos if client_data is not None else 0
+    
+    def open_reader(self, client_ip, from_oldest: bool = True) -> Optional[RingBufferReader]:
+        """Open an independent reader on a client's buffer for one listener"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            return client_data['buffer'].open_reader(from_oldest)
+        return None
+    
+    def refresh_reader(self, client_ip, reader: Optional[RingBufferReader]) -> Optional[RingBufferReader]:
+        """Return a reader that follows the client's current buffer
+
+        A config message replaces the client state, so long-lived listeners
+        must re-attach to the new buffer instead of waiting on the old one.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None:
+            return None
+        if reader is None or reader.ring is not client_data['buffer']:
+            return client_data['buffer'].open_reader(from_oldest=True)
+        return reader
+    
+    def get_pcm_stream_from(self, client_ip, cursor: Optional[int] = None):
+        """Decoded PCM of a client since an absolute PCM cursor
+
+        Returns ``(data, next_cursor, (sample_rate, channels))``, or None
+        when the client has no PCM (unknown client or no Opus decoder).
+        Without a cursor, everything still held in the PCM ring is returned.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None or client_data['pcm'] is None:
+            return None
+        pcm = client_data['pcm']
+        sample_rate, channels = client_data['pcm_format']
+        if cursor is None:
+            cursor = pcm.oldest_pos
+        cursor -= cursor % (2 * channels)  # Whole sample frames only
+        data, next_cursor, _ = pcm.read_from(cursor)
+        return data, next_cursor, client_data['pcm_format']
+    
+    def refresh_pcm_reader(self, client_ip, reader: Optional[RingBufferReader]) -> Optional[RingBufferReader]:
+        """Reader on a client's PCM ring, re-attached after a config change
+
+        New readers start at the live edge.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None or client_data['pcm'] is None:
+            return None
+        if reader is None or reader.ring is not client_data['pcm']:
+            return client_data['pcm'].open_reader(from_oldest=False)
+        return reader
+    
+    def get_pcm_format(self, client_ip):
+        """``(sample_rate, channels)`` of a client's PCM, or None without PCM"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None or client_data['pcm'] is None:
+            return None
+        return client_data['pcm_format']
+    
+    def has_audio_data(self, client_ip):
+        """Check if client has active audio data (within last 10 seconds)"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            # Check if we have recent data (within last 10 seconds)
+            time_since_last = time.time() - client_data['last_data']
+            has_buffer = len(client_data['buffer']) > 0
+            is_recent = time_since_last < 10.0  # 10 seconds timeout
+            return has_buffer and is_recent
+        return False
+    
+    def get_opus_frame(self, client_ip):
+        """Next demuxed Opus frame for RTP streaming as ``(timestamp_ns, frame)``
+
+        RTP stays the primary consumer of the ring buffer: the read cursor
+        advances to the end of the block the frame came from, so the
+        overflow policy keeps protecting data RTP has not sent yet.
+        """
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is None or not client_data['opus_frames']:
+            return None
+        
+        timestamp_ns, frame, end_position = client_data['opus_frames'].popleft()
+        buffer = client_data['buffer']
+        buffer.attach_primary()
+        if end_position > buffer.read_pos:
+            buffer.consume(end_position - buffer.read_pos)
+        return timestamp_ns, frame
+    
+    def release_opus_frames(self, client_ip):
+        """RTP stopped reading: the client's buffer no longer has a primary consumer"""
+        client_data = self.audio_clients.get(client_ip)
+        if client_data is not None:
+            client_data['buffer'].detach_primary()
+    
+    def get_ingest_stats(self) -> dict:
+        """Jitter buffer statistics (latency vs. underruns) per client"""
+        return {
+            client_ip: client_data['jitter_buffer'].get_stats()
+            for client_ip, client_data in self.audio_clients.items()
+        }
+    
+    def get_audio_levels(self):
+        """Get current audio levels for all active clients
+
+        Meters are updated on ingest, so this only reads one snapshot
+        per client.
+        """
+        levels = {}
+        current_time = time.time()
+        
+        for client_ip, client_data in self.audio_clients.items():
+            # Check if client is active (data within last 5 seconds)
+            time_since_last = current_time - client_data['last_data']
+            if time_since_last > 5.0:
+                continue
+            
+            with client_data['lock']:
+                meter_values = client_data['meter'].snapshot()
+            if meter_values is not None:
+                levels[client_ip] = dict(
+                    meter_values,
+                    active=True,
+                    buffer_size=len(client_data['buffer']),
+                    last_update=current_time,
+                    time_since_data=round(time_since_last, 2)
+                )
+            else:
+                levels[client_ip] = {
+                    'level': 0,
+                    'peak': 0,
+                    'active': False,
+                    'last_update': current_time
+                }
+        
+        return levels
+
+
+class EventSubscription:
+    """Bounded per-client event queue with coalescing of stale events
+
+    Events published with a ``coalesce_key`` replace a still-queued event
+    with the same key instead of queueing behind it, so a slow client only
+    ever sees the newest level snapshot. When the queue is full the oldest
+    event is dropped; the publisher never blocks.
+    """
+    
+    def __init__(self, topics: Optional[Set[str]] = None, max_queue: int = 64):
+        self.topics = topics
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.closed = False
+        self._queue = collections.deque()  # holders: [event, coalesce_key]
+        self._pending_keys = {}  # coalesce_key -> holder
+        self._cond = threading.Condition()
+        self.wakeup = None  # Optional callback for non-threaded consumers (asyncio)
+    
+    def wants(self, event_type: str) -> bool:
+        """Whether this subscription receives events of a type"""
+        return self.topics is None or event_type in self.topics
+    
+    def put(self, event: dict, coalesce_key: str = None):
+        """Queue an event (called by the publisher, never blocks)"""
+        with self._cond:
+            if self.closed:
+                return
+            
+            if coalesce_key is not None and coalesce_key in self._pending_keys:
+                self._pending_keys[coalesce_key][0] = event
+                return
+            
+            if len(self._queue) >= self.max_queue:
+                _, dropped_key = self._queue.popleft()
+                if dropped_key is not None:
+                    self._pending_keys.pop(dropped_key, None)
+                self.dropped += 1
+            
+            holder = [event, coalesce_key]
+            self._queue.append(holder)
+            if coalesce_key is not None:
+                self._pending_keys[coalesce_key] = holder
+            self._cond.notify()
+        
+        if self.wakeup is not None:
+            self.wakeup()
+    
+    def get(self, timeout: float = None) -> Optional[dict]:
+        """Wait for the next event; returns None on timeout or close"""
+        with self._cond:
+            if not self._queue and not self.closed:
+                self._cond.wait(timeout)
+            if not self._queue:
+                return None
+            event, coalesce_key = self._queue.popleft()
+            if coalesce_key is not None:
+                self._pending_keys.pop(coalesce_key, None)
+            return event
+    
+    def drain(self) -> List[dict]:
+        """Take all queued events without waiting"""
+        with self._cond:
+            events = [holder[0] for holder in self._queue]
+            self._queue.clear()
+            self._pending_keys.clear()
+            return events
+    
+    def close(self):
+        """Stop receiving events and wake up a waiting consumer"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if self.wakeup is not None:
+            self.wakeup()
+
+
+class EventBus:
+    """In-process publish/subscribe hub feeding SSE and WebSocket clients"""
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._subscriptions = set()
+                instance._lock = threading.Lock()
+                instance._event_id = 0
+                cls._instance = instance
+        return cls._instance
+    
+    def subscribe(self, topics: Optional[Set[str]] = None) -> EventSubscription:
+        """Register a new subscriber for some (or all) event types"""
+        subscription = EventSubscription(topics, CONFIG['event_queue_size'])
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: EventSubscription):
+        """Remove a subscriber"""
+        subscription.close()
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    def has_subscribers(self, event_type: str) -> bool:
+        """Whether anyone listens for an event type (skip expensive work otherwise)"""
+        with self._lock:
+            return any(sub.wants(event_type) for sub in self._subscriptions)
+    
+    def publish(self, event_type: str, data: dict = None, coalesce_key: str = None):
+        """Deliver an event to every interested subscriber"""
+        with self._lock:
+            self._event_id += 1
+            event = {'type': event_type, 'id': self._event_id, 'timestamp': time.time()}
+            if data:
+                event.update(data)
+            subscribers = [sub for sub in self._subscriptions if sub.wants(event_type)]
+        
+        for subscription in subscribers:
+            subscription.put(event, coalesce_key)
+
+
+class LevelEventPublisher:
+    """Publishes audio levels on the event bus at a fixed rate while anyone listens"""
+    
+    def __init__(self):
+        self.bus = EventBus()
+        self.running = False
+    
+    def start(self):
+        """Start the publisher thread"""
+        self.running = True
+        threading.Thread(target=self._publish_loop, daemon=True).start()
+    
+    def stop(self):
+        """Stop the publisher thread"""
+        self.running = False
+    
+    def _publish_loop(self):
+        """Sample levels every `level_event_interval` seconds"""
+        audio_handler = AudioStreamHandler()
+        while self.running and server_running:
+            interval = CONFIG['level_event_interval']
+            try:
+                if self.bus.has_subscribers('levels'):
+                    levels = audio_handler.get_audio_levels()
+                    self.bus.publish('levels', {'levels': levels}, coalesce_key='levels')
+            except Exception as e:
+                logger.error(f"Level event publishing error: {e}")
+            time.sleep(interval)
+
+
+class IngestSession:
+    """Receiving end of one stream's TCP ingest
+
+    A new connection restarts the client's stream state (WebM/Opus by
+    default, or the ``format`` given at stream start). Its bytes go
+    straight into AudioStreamHandler. A stream has a single producer: a
+    new connection (e.g. a client reconnecting after a network change)
+    takes over and the previous one is closed, so two byte streams never
+    interleave in one demuxer. Connections are served from several
+    threads, so state changes and ingest run under the session lock.
+    """
+    
+    def __init__(self, client_ip: str, audio_config: Optional[dict] = None):
+        self.client_ip = client_ip
+        self.audio_config = audio_config or {'format': 'audio/webm'}
+        self.audio_handler = AudioStreamHandler()
+        self.connections = {}  # connection -> callable that closes it
+        self.producer = None  # The connection whose bytes are ingested
+        self.stats = {'connections': 0, 'active_connections': 0, 'replaced_connections': 0, 'bytes_received': 0}
+        self._lock = threading.Lock()
+    
+    def attach(self, connection, closer, address):
+        """Start a recording session on a new connection, replacing the current one"""
+        with self._lock:
+            previous = self.connections.get(self.producer)
+            self.producer = connection
+            self.connections[connection] = closer
+            self.stats['connections'] += 1
+            self.stats['active_connections'] += 1
+            if previous is not None:
+                self.stats['replaced_connections'] += 1
+            self.audio_handler.handle_config_message(dict(self.audio_config, clientIP=self.client_ip), self.client_ip)
+        if previous is not None:
+            previous()
+            logger.info(f"Stream client {address} replaced the previous connection of {self.client_ip}")
+        logger.info(f"Stream client connected: {address} -> {self.client_ip}")
+    
+    def detach(self, connection, address):
+        with self._lock:
+            if self.connections.pop(connection, None) is None:
+                return
+            self.stats['active_connections'] -= 1
+            if self.producer is connection:
+                self.producer = None
+        logger.info(f"Stream client disconnected: {address}")
+    
+    def ingest(self, connection, data):
+        """Hand received bytes (a view into a receive buffer) to the audio handler
+
+        Bytes a replaced connection received before it was closed are dropped.
+        """
+        with self._lock:
+            if connection is not self.producer:
+                return
+            self.stats['bytes_received'] += len(data)
+            self.audio_handler.handle_stream_audio_data(data, self.client_ip)
+    
+    def close(self):
+        """Drop all connections of the stream (on stream stop)"""
+        with self._lock:
+            closers = list(self.connections.values())
+        for closer in closers:
+            closer()
+
+
+class StreamServer:
+    """TCP Stream Server für Audio-Daten
+
+    With a session, the server is a per-stream port (compatibility mode)
+    and every connection belongs to that stream. Without one, it is the
+    shared ingest port: a connection first sends ``STREAM <stream_id>\\n``,
+    is answered ``OK\\n`` (or ``ERR <reason>\\n`` and closed), and is then
+    demultiplexed to that stream's session. Audio is received with
+    ``recv_into`` into one preallocated buffer per connection, so there
+    are no per-chunk allocations and no HTTP framing.
+    """
+    
+    HANDSHAKE_MAX = 128
+    
+    def __init__(self, port: int, session: Optional[IngestSession] = None):
+        self.port = port
+        self.session = session
+        self.server_socket = None
+        self.running = False
+        self.connections = set()
+        
+    def start(self):
+        """Start stream server"""
+        try:
+            logger.info(f"Creating socket for stream server on port {self.port}")
+            self.server_socket = self._listening_socket()
+            self.running = True
+            
+            threading.Thread(target=self._accept_loop, daemon=True).start()
+            logger.info(f"Stream server started successfully on port {self.port}")
+            
+        except OSError as e:
+            if e.errno == 98:  # Address already in use
+                logger.error(f"Port {self.port} already in use")
+            else:
+                logger.error(f"Stream server socket error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Stream server start failed: {e}")
+            raise
+    
+    def _listening_socket(self) -> socket.socket:
+        """Bound and listening ingest socket with the configured buffer size"""
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if CONFIG['stream_so_rcvbuf']:
+                # Set before listen(): accepted sockets inherit it and the
+                # TCP window scale is negotiated from it during the handshake
+                server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, CONFIG['stream_so_rcvbuf'])
+            server_socket.bind(('0.0.0.0', self.port))
+            server_socket.listen(64 if self.session is None else 5)
+        except OSError:
+            server_socket.close()
+            raise
+        return server_socket
+    
+    @staticmethod
+    def tune_connection(client_socket: socket.socket):
+        """Per-connection socket options for TCP ingest"""
+        if CONFIG['stream_tcp_nodelay']:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    @staticmethod
+    def parse_handshake(line: bytes):
+        """``(session, None)`` for a valid ``STREAM <id>`` line, else ``(None, reason)``"""
+        parts = line.strip().split(b' ')
+        if len(parts) != 2 or parts[0] != b'STREAM':
+            return None, 'expected STREAM <stream_id>'
+        stream = active_streams.get(parts[1].decode('ascii', 'replace'))
+        if stream is None or stream.get('session') is None:
+            return None, 'unknown stream'
+        return stream['session'], None
+    
+    def _accept_loop(self):
+        """Accept incoming connections"""
+        while self.running:
+            try:
+                client_socket, address = self.server_socket.accept()
+                
+                # Handle client in separate thread
+                threading.Thread(
+                    target=self._handle_client, 
+                    args=(client_socket, address), 
+                    daemon=True
+                ).start()
+                
+            except Exception as e:
+                if self.running:
+                    logger.error(f"Stream accept error: {e}")
+    
+    def _handshake(self, client_socket, view: memoryview):
+        """Read the stream-id line; returns ``(session, audio sent behind it)``"""
+        client_socket.settimeout(CONFIG['ingest_handshake_timeout'])
+        filled = 0
+        while True:
+            count = client_socket.recv_into(view[filled:self.HANDSHAKE_MAX])
+            if not count:
+                return None, b''
+            filled += count
+            newline = view[:filled].tobytes().find(b'\n')
+            if newline >= 0:
+                break
+            if filled >= self.HANDSHAKE_MAX:
+                client_socket.sendall(b'ERR handshake too long\n')
+                return None, b''
+        session, error = self.parse_handshake(view[:newline].tobytes())
+        if session is None:
+            client_socket.sendall(f"ERR {error}\n".encode())
+            return None, b''
+        client_socket.sendall(b'OK\n')
+        client_socket.settimeout(None)
+        return session, view[newline + 1:filled].tobytes()
+    
+    def _handle_client(self, client_socket, address):
+        """Receive one session into a reusable buffer until the client closes"""
+        self.connections.add(client_socket)
+        buffer = bytearray(CONFIG['stream_recv_buffer'])
+        view = memoryview(buffer)
+        session = None
+        try:
+            self.tune_connection(client_socket)
+            if self.session is not None:
+                session, pending = self.session, b''
+            else:
+                session, pending = self._handshake(client_socket, view)
+                if session is None:
+                    return
+            
+            session.attach(client_socket, functools.partial(self._shutdown, client_socket), address)
+            if pending:
+                session.ingest(client_socket, pending)
+            while self.running:
+                count = client_socket.recv_into(view)
+                if not count:
+                    break
+                session.ingest(client_socket, view[:count])
+                
+        except Exception as e:
+            if self.running:
+                logger.error(f"Stream client error: {e}")
+        finally:
+            self.connections.discard(client_socket)
+            if session is not None:
+                session.detach(client_socket, address)
+            client_socket.close()
+    
+    @staticmethod
+    def _shutdown(open_socket: socket.socket):
+        try:
+            # shutdown() wakes threads blocked in accept()/recv_into()
+            open_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    
+    def stop(self):
+        """Stop stream server and drop its connections"""
+        self.running = False
+        for open_socket in list(self.connections):
+            self._shutdown(open_socket)
+        if self.server_socket:
+            self._shutdown(self.server_socket)
+            self.server_socket.close()
+
+
+class StreamIngestProtocol(asyncio.BufferedProtocol):
+    """Receives one TCP ingest connection straight into a preallocated buffer"""
+    
+    def __init__(self, stream_server: 'AsyncStreamServer'):
+        self.stream_server = stream_server
+        self.view = memoryview(bytearray(CONFIG['stream_recv_buffer']))
+        self.session = None
+        self.filled = 0  # Handshake bytes received so far
+        self.timeout = None
+        self.transport = None
+        self.address = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        self.address = transport.get_extra_info('peername')
+        StreamServer.tune_connection(transport.get_extra_info('socket'))
+        self.stream_server.connections.add(transport)
+        if self.stream_server.session is not None:
+            self._attach(self.stream_server.session)
+        else:
+            self.timeout = self.stream_server.loop.call_later(
+                CONFIG['ingest_handshake_timeout'], transport.close
+            )
+    
+    def _attach(self, session: IngestSession):
+        loop = self.stream_server.loop
+        self.session = session
+        session.attach(self.transport, functools.partial(loop.call_soon_threadsafe, self.transport.close), self.address)
+    
+    def get_buffer(self, sizehint: int):
+        if self.session is None:
+            return self.view[self.filled:StreamServer.HANDSHAKE_MAX]
+        return self.view
+    
+    def buffer_updated(self, nbytes: int):
+        if self.session is not None:
+            self.session.ingest(self.transport, self.view[:nbytes])
+            return
+        
+        self.filled += nbytes
+        newline = self.view[:self.filled].tobytes().find(b'\n')
+        if newline < 0:
+            if self.filled >= StreamServer.HANDSHAKE_MAX:
+                self._reject('handshake too long')
+            return
+        session, error = StreamServer.parse_handshake(self.view[:newline].tobytes())
+        if session is None:
+            self._reject(error)
+            return
+        self.timeout.cancel()
+        self.transport.write(b'OK\n')
+        self._attach(session)
+        if self.filled > newline + 1:
+            self.session.ingest(self.transport, self.view[newline + 1:self.filled])
+    
+    def _reject(self, reason: str):
+        self.transport.write(f"ERR {reason}\n".encode())
+        self.transport.close()
+    
+    def connection_lost(self, exc):
+        if self.timeout is not None:
+            self.timeout.cancel()
+        self.stream_server.connections.discard(self.transport)
+        if self.session is not None:
+            self.session.detach(self.transport, self.address)
+
+
+class AsyncStreamServer(StreamServer):
+    """TCP Stream Server running on the asyncio event loop (no thread per client)"""
+    
+    def __init__(self, port: int, loop: asyncio.AbstractEventLoop, session: Optional[IngestSession] = None):
+        super().__init__(port, session)
+        self.loop = loop
+        self.server = None
+    
+    def start(self):
+        """Start stream server; safe to call from executor threads"""
+        future = asyncio.run_coroutine_threadsafe(self._start(), self.loop)
+        future.result(timeout=5.0)
+        self.running = True
+        logger.info(f"Async stream server started successfully on port {self.port}")
+    
+    async def _start(self):
+        self.server = await self.loop.create_server(
+            functools.partial(StreamIngestProtocol, self), sock=self._listening_socket()
+        )
+    
+    def stop(self):
+        """Stop stream server and drop its connections"""
+        self.running = False
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self._close)
+    
+    def _close(self):
+        self.server.close()
+        for transport in list(self.connections):
+            transport.close()
+
+
+class StaticAssetCache:
+    """In-memory cache of static assets with precompressed variants
+
+    Entries hold the encoded bytes plus gzip (and brotli, if installed)
+    variants and a content ETag. Every lookup compares mtime and size with
+    the file on disk, so edited assets are picked up without a restart.
+    """
+    
+    CONTENT_TYPES = {
+        '.css': 'text/css',
+        '.js': 'application/javascript',
+        '.html': 'text/html; charset=utf-8',
+        '.json': 'application/json',
+        '.png': 'image/png',
+        '.jpg': 'image/jpeg',
+        '.jpeg': 'image/jpeg',
+        '.gif': 'image/gif',
+        '.ico': 'image/x-icon',
+        '.svg': 'image/svg+xml',
+        '.wav': 'audio/wav',
+        '.webm': 'audio/webm',
+    }
+    COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+    # Content-hashed file names (app.3f2a9c1d.js) never change their content
+    HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.[a-z0-9]+$')
+    MIN_COMPRESS_SIZE = 512
+    
+    def __init__(self, max_file_size: int):
+        self.max_file_size = max_file_size
+        self.entries: Dict[Path, dict] = {}
+        self.lock = threading.Lock()
+    
+    def preload(self, *directories: Path):
+        """Load every file below the given directories (called at startup)"""
+        count = 0
+        for directory in directories:
+            for path in sorted(directory.rglob('*')):
+                if path.is_file() and self.get(path) is not None:
+                    count += 1
+        logger.info(f"Static asset cache: {count} files preloaded")
+    
+    def get(self, path: Path) -> Optional[dict]:
+        """Current entry for path, reloaded if the file changed, or None if missing"""
+        try:
+            stat = path.stat()
+        except OSError:
+            with self.lock:
+                self.entries.pop(path, None)
+            return None
+        
+        entry = self.entries.get(path)
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+        
+        entry = self._load(path, stat)
+        with self.lock:
+            self.entries[path] = entry
+        return entry
+    
+    def _load(self, path: Path, stat) -> dict:
+        content_type = self.CONTENT_TYPES.get(path.suffix.lower(), 'text/plain')
+        entry = {
+            'path': path,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'content_type': content_type,
+            'cache_control': 'public, max-age=31536000, immutable' if self.HASHED_NAME.search(path.name) else 'no-cache',
+            'bodies': {},
+            'etags': {},
+        }
+        if stat.st_size > self.max_file_size:
+            # Too large to keep in memory: served from disk, validated by mtime
+            entry['etags']['identity'] = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+            return entry
+        
+        with open(path, 'rb') as f:
+            body = f.read()
+        tag = hashlib.sha1(body).hexdigest()[:20]
+        entry['bodies']['identity'] = body
+        entry['etags']['identity'] = f'"{tag}"'
+        
+        if content_type.startswith(self.COMPRESSIBLE) and len(body) >= self.MIN_COMPRESS_SIZE:
+            variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['br'] = brotli.compress(body)
+            for encoding, compressed in variants.items():
+                if len(compressed) < len(body):
+                    entry['bodies'][encoding] = compressed
+                    entry['etags'][encoding] = f'"{tag}-{encoding}"'
+        return entry
+    
+    @staticmethod
+    def choose_encoding(entry: dict, accept_encoding: str) -> str:
+        """Best precompressed variant the client accepts"""
+        accepted = set()
+        for item in accept_encoding.split(','):
+            name, _, params = item.strip().partition(';')
+            if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(name.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in entry['bodies'] and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+    
+    @staticmethod
+    def etag_matches(entry: dict, if_none_match: str) -> bool:
+        """True if If-None-Match names any representation of the entry"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        tags = {tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')}
+        return any(etag in tags for etag in entry['etags'].values())
+
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+TEMPLATES_DIR = Path(__file__).resolve().parent / 'templates'
+static_asset_cache = StaticAssetCache(CONFIG['static_cache_max_file_size'])
+
+
+def create_stream_server(port: int, session: Optional[IngestSession] = None):
+    """Stream server matching the active server mode"""
+    if global_async_server is not None and global_async_server.loop is not None:
+        return AsyncStreamServer(port, global_async_server.loop, session)
+    return StreamServer(port, session)
+
+
+def start_stream_server(port: int, session: Optional[IngestSession] = None):
+    """Started stream server on ``port``; OSError when the port cannot be bound"""
+    stream_server = create_stream_server(port, session)
+    stream_server.start()
+    return stream_server
+
+
+ingest_server_lock = threading.Lock()
+
+
+def get_ingest_server():
+    """The shared ingest listener, started on first use"""
+    global global_ingest_server
+    with ingest_server_lock:
+        if global_ingest_server is None:
+            ingest_server = create_stream_server(CONFIG['ingest_port'])
+            ingest_server.start()
+            global_ingest_server = ingest_server
+        return global_ingest_server
+
+
+class Router:
+    """Path dispatch table compiled from route templates
+
+    Templates consist of literal segments, typed parameters
+    ``{name:type}`` and an optional trailing ``*`` that captures the rest
+    of the path as ``path``. Templates without parameters are a single
+    dict lookup; the others live in a segment trie, so matching costs one
+    step per path segment however many routes are registered. Matched
+    parameterised paths are memoized, since clients poll the same URLs.
+    """
+    
+    MATCH_CACHE_SIZE = 1024
+    
+    PARAM_TYPES = {
+        'str': (re.compile(r'[^/]+'), str),
+        'int': (re.compile(r'[0-9]{1,18}'), int),
+        # IPv4/IPv6 address or host name (browsers fall back to location.hostname)
+        'client': (re.compile(r'[A-Za-z0-9._:%-]{1,253}'), str),
+        'stream': (re.compile(r'[A-Za-z0-9._:-]{1,128}'), str),
+    }
+    
+    def __init__(self):
+        self.exact: Dict[str, dict] = {}
+        self.trie = self._new_node()
+        self.match_cache: Dict[str, tuple] = {}
+    
+    def _new_node(self, name: str = None, kind: str = None) -> dict:
+        pattern, convert = self.PARAM_TYPES[kind] if kind else (None, None)
+        return {'name': name, 'kind': kind, 'pattern': pattern, 'convert': convert,
+                'literals': {}, 'params': [], 'wildcard': None, 'route': None}
+    
+    def add(self, template: str, handlers: Dict[str, str], **options) -> dict:
+        """Register handler method names per HTTP method for a template
+
+        GET routes answer HEAD with the same handler unless ``head=False``;
+        OPTIONS is answered for every route by the dispatcher.
+        """
+        methods = dict(handlers)
+        if 'GET' in methods and options.get('head', True):
+            methods.setdefault('HEAD', methods['GET'])
+        route = {
+            'template': template,
+            'methods': methods,
+            'allow': ', '.join(sorted(set(methods) | {'OPTIONS'})),
+            'options': options,
+        }
+        
+        self.match_cache.clear()
+        segments = [segment for segment in template.split('/') if segment]
+        if not any(segment == '*' or segment.startswith('{') for segment in segments):
+            self.exact[template] = route
+            return route
+        
+        node = self.trie
+        for index, segment in enumerate(segments):
+            if segment == '*':
+                if index != len(segments) - 1:
+                    raise ValueError(f"Wildcard must be the last segment: {template}")
+                node['wildcard'] = route
+                return route
+            if segment.startswith('{'):
+                name, _, kind = segment[1:-1].partition(':')
+                kind = kind or 'str'
+                if kind not in self.PARAM_TYPES:
+                    raise ValueError(f"Unknown parameter type '{kind}' in {template}")
+                child = next((c for c in node['params'] if c['name'] == name and c['kind'] == kind), None)
+                if child is None:
+                    child = self._new_node(name, kind)
+                    node['params'].append(child)
+                node = child
+            else:
+                node = node['literals'].setdefault(segment, self._new_node())
+        node['route'] = route
+        return route
+    
+    def match(self, path: str):
+        """Return ``(route, params)`` for a request path, or ``(None, {})``"""
+        route = self.exact.get(path)
+        if route is not None:
+            return route, {}
+        cached = self.match_cache.get(path)
+        if cached is not None:
+            return cached
+        
+        params = []
+        route = self._match_node(self.trie, path.split('/')[1:], 0, params)
+        if route is None:
+            return None, {}
+        if len(self.match_cache) >= self.MATCH_CACHE_SIZE:
+            self.match_cache.clear()
+        result = self.match_cache[path] = (route, dict(params))
+        return result
+    
+    def _match_node(self, node: dict, segments: List[str], index: int, params: list) -> Optional[dict]:
+        """Depth-first match preferring literals over parameters over wildcards"""
+        if index == len(segments):
+            return node['route']
+        
+        segment = segments[index]
+        child = node['literals'].get(segment)
+        if child is not None:
+            route = self._match_node(child, segments, index + 1, params)
+            if route is not None:
+                return route
+        
+        if segment and node['params']:
+            value = unquote(segment)
+            for child in node['params']:
+                if child['pattern'].fullmatch(value):
+                    params.append((child['name'], child['convert'](value)))
+                    route = self._match_node(child, segments, index + 1, params)
+                    if route is not None:
+                        return route
+                    params.pop()
+        
+        if node['wildcard'] is not None:
+            params.append(('path', unquote('/'.join(segments[index:]))))
+            return node['wildcard']
+        return None
+
+
+class DiscardingWriter:
+    """wfile stand-in that drops the body of HEAD responses
+
+    GET handlers answer HEAD as well, so both send identical headers
+    (including Content-Length) without a second implementation.
+    """
+    
+    def __init__(self, wfile):
+        self.wfile = wfile
+    
+    def write(self, data) -> int:
+        return len(data)
+    
+    def flush(self):
+        self.wfile.flush()
+
+
+HTTP_ROUTES = Router()
+HTTP_ROUTES.add('/', {'GET': 'serve_index'})
+HTTP_ROUTES.add('/health', {'GET': 'serve_health'})
+HTTP_ROUTES.add('/api/streams', {'GET': 'serve_streams_api'})
+HTTP_ROUTES.add('/api/streams/{stream_id:stream}', {'GET': 'serve_stream_api'})
+HTTP_ROUTES.add('/api/config', {'GET': 'serve_config_api'})
+HTTP_ROUTES.add('/api/network', {'GET': 'serve_network_api'})
+HTTP_ROUTES.add('/api/events', {'GET': 'serve_events_stream'}, native='_serve_events')
+HTTP_ROUTES.add('/api/stream/start', {'POST': 'handle_start_stream'})
+HTTP_ROUTES.add('/api/stream/register', {'POST': 'handle_register_stream'})
+HTTP_ROUTES.add('/api/stream/stop', {'POST': 'handle_stop_stream'})
+HTTP_ROUTES.add('/api/audio/level', {'POST': 'handle_audio_level'})
+HTTP_ROUTES.add('/api/audio/levels', {'GET': 'serve_audio_levels_api'})
+HTTP_ROUTES.add('/api/audio/ingest', {'GET': 'serve_audio_ingest_api'})
+HTTP_ROUTES.add('/api/audio/upload', {'POST': 'handle_audio_upload'},
+                native='_serve_audio_upload', keep_alive=True)
+HTTP_ROUTES.add('/api/audio/raw', {'POST': 'handle_audio_raw_upload'},
+                native='_serve_audio_raw_upload', keep_alive=True)
+HTTP_ROUTES.add('/api/audio/stream', {'POST': 'handle_audio_stream_upload'},
+                native='_serve_audio_stream_upload', chunked=True)
+HTTP_ROUTES.add('/api/system/update', {'POST': 'handle_system_update'})
+HTTP_ROUTES.add('/api/logging', {'GET': 'serve_logging_api', 'POST': 'handle_logging_update'})
+HTTP_ROUTES.add('/api/rtp/streams', {'GET': 'serve_rtp_streams_api'}, https_only=True)
+HTTP_ROUTES.add('/api/rtp/start', {'POST': 'handle_rtp_start'}, https_only=True)
+HTTP_ROUTES.add('/api/rtp/stop', {'POST': 'handle_rtp_stop'}, https_only=True)
+HTTP_ROUTES.add('/api/rtp/destinations', {'POST': 'handle_rtp_destinations'}, https_only=True)
+HTTP_ROUTES.add('/static/*', {'GET': 'serve_static_file'})
+HTTP_ROUTES.add('/client/{client_ip:client}/stream', {'GET': 'serve_client_stream'})
+HTTP_ROUTES.add('/client/{client_ip:client}/audio', {'GET': 'serve_client_audio_player'}, native='_serve_client_audio')
+HTTP_ROUTES.add('/client/{client_ip:client}/wav', {'GET': 'serve_client_wav_stream'})
+HTTP_ROUTES.add('/ws/audio-stream', {'GET': 'handle_audio_websocket_upgrade'}, native='_serve_audio_websocket', head=False)
+HTTP_ROUTES.add('/ws', {'GET': 'handle_websocket_upgrade'}, native='_serve_push_websocket', head=False)
+
+
+class HTTPHandler(SimpleHTTPRequestHandler):
+    """Enhanced HTTP handler for web interface and API"""
+    
+    # Persistent connections: every response carries Content-Length or
+    # chunked framing, otherwise end_headers falls back to Connection: close
+    protocol_version = 'HTTP/1.1'
+    timeout = CONFIG['http_idle_timeout']
+    # Buffer each response so headers and body leave in one write (and one
+    # TLS record); handle_one_request flushes after every request
+    wbufsize = 64 * 1024
+    requests_served = 0
+    
+    def handle(self):
+        """Serve keep-alive requests until the client closes, idles out or hits the limit"""
+        try:
+            super().handle()
+        except ConnectionError as e:
+            # Responses are flushed after the route returns, so a vanished
+            # client shows up here rather than inside the route
+            logger.debug(f"Client {self.client_address[0]} disconnected: {e}")
+            self.close_connection = True
+    
+    def log_message(self, format, *args):
+        """Access log through the logging queue (rate-limited) instead of stderr"""
+        logger.info("%s - " + format, self.address_string(), *args, extra={'event': 'http_request'})
+    
+    def parse_request(self):
+        """Count requests per connection and close at the keep-alive limit"""
+        if not super().parse_request():
+            return False
+        self.requests_served += 1
+        if self.requests_served >= CONFIG['http_max_keepalive_requests']:
+            self.close_connection = True
+        return True
+    
+    def send_response_only(self, code, message=None):
+        self.response_code = code
+        self.response_framed = False
+        self.response_connection_sent = False
+        super().send_response_only(code, message)
+    
+    def send_header(self, keyword, value):
+        lowered = keyword.lower()
+        if lowered in ('content-length', 'transfer-encoding'):
+            self.response_framed = True
+        elif lowered == 'connection':
+            self.response_connection_sent = True
+        super().send_header(keyword, value)
+    
+    def handle_expect_100(self):
+        """Send 100 Continue straight away despite the buffered wfile"""
+        result = super().handle_expect_100()
+        self.wfile.flush()
+        return result
+    
+    def end_headers(self):
+        """Add the connection headers, closing if the body has no framing"""
+        if self.response_code >= 200 and not self.response_connection_sent:
+            has_body = self.command != 'HEAD' and self.response_code >= 200 and self.response_code not in (204, 304)
+            if has_body and not self.response_framed:
+                # The body can only end with the connection
+                self.close_connection = True
+            if self.close_connection:
+                self.send_header('Connection', 'close')
+            else:
+                if self.request_version != 'HTTP/1.1':
+                    self.send_header('Connection', 'keep-alive')
+                remaining = CONFIG['http_max_keepalive_requests'] - self.requests_served
+                self.send_header('Keep-Alive', f"timeout={int(self.timeout)}, max={remaining}")
+        super().end_headers()
+        if self.command == 'HEAD' and self.response_code >= 200:
+            self.wfile = DiscardingWriter(self.wfile)
+    
+    def dispatch_request(self):
+        """Route any request method through HTTP_ROUTES"""
+        wfile = self.wfile
+        try:
+            self.route_request()
+        finally:
+            # HEAD responses swap in a DiscardingWriter after the headers
+            self.wfile = wfile
+    
+    do_GET = do_POST = do_HEAD = do_OPTIONS = dispatch_request
+    
+    def route_request(self):
+        """Match the path and call the route's handler method with its params"""
+        route, params = HTTP_ROUTES.match(urlparse(self.path).path)
+        if route is None:
+            self.send_error(404)
+            return
+        
+        if self.command == 'OPTIONS':
+            # CORS preflight
+            self.discard_request_body()
+            self.send_response(200)
+            self.send_header('Allow', route['allow'])
+            self.send_header('Content-Length', '0')
+            self.add_cors_headers()
+            self.end_headers()
+            return
+        
+        handler_name = route['methods'].get(self.command)
+        if handler_name is None:
+            self.discard_request_body()
+            self.send_response(405)
+            self.send_header('Allow', route['allow'])
+            self.send_header('Content-Length', '0')
+            self.add_cors_headers()
+            self.end_headers()
+            return
+        
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower() and not route['options'].get('chunked'):
+            # Only the persistent ingest decodes chunked bodies; an unread
+            # body would be parsed as the next request on this connection
+            self.send_error(411)
+            return
+        
+        if route['options'].get('https_only') and getattr(self.server, 'server_port', None) == 8081:
+            self.discard_request_body()
+            self.send_json_response({
+                'success': False,
+                'error': f'RTP functions require HTTPS server. Please use https://192.168.188.90:6969{urlparse(self.path).path}'
+            })
+            return
+        
+        getattr(self, handler_name)(**params)
+    
+    def discard_request_body(self):
+        """Consume a body the route will not read, so keep-alive stays in sync
+
+        Otherwise the unread bytes would be parsed as the next request on
+        this connection. Bodies that cannot be skipped cheaply (chunked,
+        over ``max_request_body``, malformed length) close the connection.
+        """
+        try:
+            remaining = int(self.headers.get('Content-Length', 0) or 0)
+        except ValueError:
+            remaining = -1
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower() or not 0 <= remaining <= CONFIG['max_request_body']:
+            self.close_connection = True
+            return
+        while remaining > 0:
+            data = self.rfile.read(min(remaining, self.UPLOAD_READ_SIZE))
+            if not data:
+                self.close_connection = True
+                return
+            remaining -= len(data)
+    
+    def handle_websocket_upgrade(self):
+        """Handle WebSocket upgrade request and serve the push session"""
+        websocket_handler = SimpleWebSocketHandler()
+        if not websocket_handler.handle_websocket_handshake(self):
+            self.send_error(400, "WebSocket handshake failed")
+            return
+        
+        client_id = f"{self.client_address[0]}_{self.client_address[1]}_{int(time.time())}"
+        connection = WebSocketConnection(self.connection)
+        websocket_handler.add_client(client_id, {
+            'address': self.client_address,
+            'connected_at': datetime.now(),
+            'connection': connection
+        })
+        try:
+            websocket_handler.serve_push_session(client_id, connection)
+        except Exception as e:
+            logger.error(f"WebSocket session error for {client_id}: {e}")
+            connection.close(WebSocketCodec.CLOSE_INTERNAL_ERROR)
+        finally:
+            websocket_handler.remove_client(client_id)
+            self.connection.settimeout(None)
+            self.close_connection = True
+    
+    def handle_audio_websocket_upgrade(self):
+        """Handle audio streaming WebSocket upgrade"""
+        try:
+            logger.info(f"Audio WebSocket upgrade request from {self.client_address[0]}")
+            logger.debug("Headers: %s", self.headers.items())
+            if SimpleWebSocketHandler().handle_websocket_handshake(self):
+                logger.info("Audio WebSocket handshake successful")
+                # Hand over to audio stream handler
+                AudioStreamHandler().handle_audio_websocket(self)
+            else:
+                logger.error("Audio WebSocket handshake failed")
+                self.send_error(400, "WebSocket handshake failed")
+        except Exception as e:
+            logger.error(f"Audio WebSocket upgrade failed: {e}")
+            self.send_error(500)
+    
+    def serve_client_stream(self, client_ip: str):
+        """Serve audio stream for a specific client (/client/<ip>/stream?cursor=123)"""
+        try:
+            parsed_url = urlparse(self.path)
+            logger.info("Serving stream for client %s", client_ip, extra={'event': 'http_request'})
+            
+            # Get audio data from HTTP audio buffer
+            global global_audio_handler
+            if global_audio_handler is None:
+                global_audio_handler = AudioStreamHandler()
+                logger.info("Created new AudioStreamHandler")
+            
+            # Polling listeners pass back the cursor from the previous
+            # response so each of them advances independently
+            cursor = self.get_stream_cursor_param(parsed_url.query)
+            if cursor is None:
+                audio_data = global_audio_handler.get_audio_stream(client_ip)
+                next_cursor = global_audio_handler.get_stream_cursor(client_ip)
+            else:
+                audio_data, next_cursor = global_audio_handler.get_audio_stream_from(client_ip, cursor)
+            logger.debug("Retrieved %d bytes for client %s", len(audio_data), client_ip, extra={'event': 'audio_chunk'})
+            
+            if audio_data and len(audio_data) > 0:
+                self.send_response(200)
+                self.send_header('Content-Type', 'audio/webm')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Expose-Headers', 'X-Stream-Cursor')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('X-Stream-Cursor', str(next_cursor))
+                self.send_header('Content-Length', str(len(audio_data)))
+                self.end_headers()
+                
+                self.wfile.write(audio_data)
+                logger.debug("Served %d bytes of audio for client %s", len(audio_data), client_ip,
+                             extra={'event': 'audio_chunk'})
+            else:
+                # No data available, send test response for debugging
+                test_data = b'test audio data'
+                self.send_response(200)
+                self.send_header('Content-Type', 'audio/webm')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Content-Length', str(len(test_data)))
+                self.end_headers()
+                self.wfile.write(test_data)
+                logger.info(f"Sent test data for client {client_ip} - no real audio data available")
+                
+        except Exception as e:
+            logger.error(f"Client stream serving error: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            self.send_error(500)
+    
+    def serve_client_audio_player(self, client_ip: str):
+        """Serve a chunked audio stream that browsers can play"""
+        try:
+            logger.info(f"Serving chunked audio for client {client_ip}")
+            
+            # Start chunked response
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/webm')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            if self.command == 'HEAD':
+                return
+            
+            # Stream audio data in chunks
+            global global_audio_handler
+            if global_audio_handler is None:
+                global_audio_handler = AudioStreamHandler()
+            audio_handler = global_audio_handler
+            chunk_size = 4096  # 4KB chunks
+            timeout = 30  # 30 seconds timeout
+            start_time = time.time()
+            
+            # Each listener gets its own cursor: a slow listener only
+            # skips ahead itself and never takes data from others
+            reader = None
+            
+            try:
+                while (time.time() - start_time) < timeout:
+                    reader = audio_handler.refresh_reader(client_ip, reader)
+                    audio_data = reader.read(chunk_size) if reader else b''
+                    
+                    if audio_data:
+                        # Write chunk size in hex followed by CRLF
+                        chunk_size_hex = hex(len(audio_data))[2:].encode() + b'\r\n'
+                        self.wfile.write(chunk_size_hex)
+                        # Write chunk data followed by CRLF
+                        self.wfile.write(audio_data + b'\r\n')
+                        self.wfile.flush()
+                        continue
+                    
+                    # Small delay to prevent busy loop
+                    time.sleep(0.05)  # 50ms delay
+                
+                # End chunked encoding
+                self.wfile.write(b'0\r\n\r\n')
+                
+            except Exception as e:
+                logger.error(f"Chunked streaming error: {e}")
+                self.close_connection = True
+                # Try to end chunked encoding gracefully
+                try:
+                    self.wfile.write(b'0\r\n\r\n')
+                except:
+                    pass
+                
+        except Exception as e:
+            logger.error(f"Client audio serving error: {e}")
+            self.send_error(500)
+    
+    def serve_client_wav_stream(self, client_ip: str):
+        """Serve the client's decoded PCM as a WAV file
+
+        ``?cursor=`` is a position in the client's PCM ring (returned as
+        X-Stream-Cursor), so polling players fetch only new audio. Opus
+        clients need a server-side decoder (libopus or ffmpeg).
+        """
+        try:
+            # Optional ?cursor=123 as for /client/<ip>/stream
+            parsed_url = urlparse(self.path)
+            logger.info(f"Serving WAV stream for client {client_ip}")
+            
+            # Get audio data
+            global global_audio_handler
+            if global_audio_handler is None:
+                global_audio_handler = AudioStreamHandler()
+            cursor = self.get_stream_cursor_param(parsed_url.query)
+            pcm_stream = global_audio_handler.get_pcm_stream_from(client_ip, cursor)
+            if pcm_stream is None and global_audio_handler.has_audio_data(client_ip):
+                self.send_error(503, "No Opus decoder available (install libopus or ffmpeg)")
+                return
+            audio_data, next_cursor, (sample_rate, channels) = pcm_stream or (b'', 0, (48000, 1))
+            
+            if audio_data and len(audio_data) > 0:
+                bits_per_sample = 16
+                
+                # WAV header (44 bytes)
+                wav_header = bytearray(44)
+                wav_header[0:4] = b'RIFF'
+                wav_header[4:8] = (len(audio_data) + 36).to_bytes(4, 'little')  # File size - 8
+                wav_header[8:12] = b'WAVE'
+                wav_header[12:16] = b'fmt '
+                wav_header[16:20] = (16).to_bytes(4, 'little')  # Subchunk1Size
+                wav_header[20:22] = (1).to_bytes(2, 'little')   # AudioFormat (PCM)
+                wav_header[22:24] = channels.to_bytes(2, 'little')  # NumChannels
+                wav_header[24:28] = sample_rate.to_bytes(4, 'little')  # SampleRate
+                wav_header[28:32] = (sample_rate * channels * bits_per_sample // 8).to_bytes(4, 'little')  # ByteRate
+                wav_header[32:34] = (channels * bits_per_sample // 8).to_bytes(2, 'little')  # BlockAlign
+                wav_header[34:36] = bits_per_sample.to_bytes(2, 'little')  # BitsPerSample
+                wav_header[36:40] = b'data'
+                wav_header[40:44] = len(audio_data).to_bytes(4, 'little')  # Subchunk2Size
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'audio/wav')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Expose-Headers', 'X-Stream-Cursor')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('X-Stream-Cursor', str(next_cursor))
+                self.send_header('Content-Length', str(44 + len(audio_data)))
+                self.end_headers()
+                
+                # Send WAV header + audio data
+                self.wfile.write(wav_header)
+                self.wfile.write(audio_data)
+            else:
+                # No data available
+                self.send_response(204)  # No Content
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                
+        except Exception as e:
+            logger.error(f"WAV stream serving error: {e}")
             self.send_error(500)
     
     def serve_events_stream(self):
-        """Serve Server-Sent Events stream"""
+        """Serve a long-lived Server-Sent Events stream fed by the event bus
+
+        ``/api/events?topics=levels,streams`` limits the stream to some event
+        types; without the parameter every event is delivered.
+        """
+        query = parse_qs(urlparse(self.path).query)
+        topics = None
+        if query.get('topics'):
+            topics = {topic for topic in query['topics'][0].split(',') if topic}
+        
         self.send_response(200)
         self.send_header('Content-type', 'text/event-stream')
         self.send_header('Cache-Control', 'no-cache')
-        self.send_header('Connection', 'keep-alive')
+        self.send_header('X-Accel-Buffering', 'no')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
+        if self.command == 'HEAD':
+            return
         
-        # Send initial config and close connection immediately to avoid blocking
-        config_event = f"data: {json.dumps({'type': 'config', 'config': CONFIG})}\\n\\n"
-        self.wfile.write(config_event.encode())
-        self.wfile.flush()
+        bus = EventBus()
+        subscription = bus.subscribe(topics)
         
-        # Send one heartbeat and close (no blocking while loop)
-        heartbeat = f"data: {json.dumps({'type': 'heartbeat', 'timestamp': time.time()})}\\n\\n"
-        self.wfile.write(heartbeat.encode())
+        try:
+            # Initial state, so clients need no extra REST calls on connect
+            self.wfile.write(b'retry: 3000\n')
+            self.write_sse_event({'type': 'config', 'config': CONFIG})
+            if subscription.wants('streams'):
+                self.write_sse_event({'type': 'streams', 'streams': get_public_streams()})
+            
+            while server_running:
+                event = subscription.get(timeout=CONFIG['sse_heartbeat_interval'])
+                if event is None:
+                    if subscription.closed:
+                        break
+                    self.write_sse_event({'type': 'heartbeat', 'timestamp': time.time()})
+                    continue
+                self.write_sse_event(event)
+                
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            logger.debug(f"SSE client {self.client_address[0]} disconnected: {e}")
+        finally:
+            bus.unsubscribe(subscription)
+            self.close_connection = True
+    
+    def write_sse_event(self, event: dict):
+        """Write one SSE message"""
+        self.wfile.write(format_sse_event(event))
         self.wfile.flush()
-        
-        # Connection closes automatically, no blocking
     
     def handle_start_stream(self):
         """Handle stream start request"""
         try:
             logger.info("Processing stream start request")
-            logger.info(f"Headers: {dict(self.headers)}")
+            logger.debug("Headers: %s", self.headers.items())
             
             # Check if Content-Length header exists
             if 'Content-Length' not in self.headers:
@@ -1115,7 +4660,6 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 return
                 
             content_length = int(self.headers['Content-Length'])
-            logger.info(f"Content-Length: {content_length}")
             
             if content_length <= 0:
                 logger.error("Invalid Content-Length")
@@ -1124,7 +4668,7 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 
             post_data = self.rfile.read(content_length)
             
-            logger.info(f"Received POST data ({len(post_data)} bytes): {post_data}")
+            logger.debug("Received POST data (%d bytes): %r", len(post_data), post_data)
             
             # Check if post_data is empty or invalid
             if not post_data or not post_data.strip():
@@ -1133,31 +4677,11 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 return
                 
             data = json.loads(post_data.decode('utf-8'))
-            logger.info(f"Parsed JSON data: {data}")
             
             client_ip = self.client_address[0]
             stream_id = f"stream_{int(time.time() * 1000)}_{client_ip.replace('.', '_')}"
-            stream_port = data.get('port', CONFIG['default_stream_port'])
-            
-            logger.info(f"Looking for available port starting from {stream_port}")
-            
-            # Find available port with safety limit
-            max_port_attempts = 100
-            port_attempts = 0
-            original_port = stream_port
-            
-            while any(s['port'] == stream_port for s in active_streams.values()) and port_attempts < max_port_attempts:
-                stream_port += 1
-                port_attempts += 1
-                if stream_port > 65535:
-                    stream_port = CONFIG['default_stream_port']
-                
-            if port_attempts >= max_port_attempts:
-                logger.error(f"Could not find available port after {max_port_attempts} attempts")
-                self.send_json_response({'success': False, 'error': 'No available ports'})
-                return
-                
-            logger.info(f"Selected port {stream_port} for stream {stream_id}")
+            shared_port = CONFIG['stream_ports'] != 'per_stream'
+            stream_port = CONFIG['ingest_port'] if shared_port else data.get('port', CONFIG['default_stream_port'])
             
             stream_config = {
                 'id': stream_id,
@@ -1171,16 +4695,29 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 'is_active': True
             }
             
-            logger.info(f"Creating stream server for {stream_id} on port {stream_port}")
-            
-            # Start stream server
-            stream_server = StreamServer(stream_port)
+            # Audio sent for the stream belongs to the starting client; native
+            # clients can announce raw PCM instead of WebM/Opus
+            audio_config = None
+            if data.get('format'):
+                audio_config = {key: data[key] for key in ('format', 'sampleRate', 'channels', 'bitrate') if key in data}
+            session = IngestSession(client_ip, audio_config)
+            stream_config['session'] = session
+            stream_config['ingest'] = session.stats
             try:
-                stream_server.start()
-                stream_config['server'] = stream_server
+                if shared_port:
+                    # One listener for all streams; connections name their stream
+                    get_ingest_server()
+                    stream_config['handshake'] = f"STREAM {stream_id}\n"
+                else:
+                    # Requested port if it is free, else the next one from the pool
+                    stream_port, stream_server = stream_port_pool.allocate(
+                        functools.partial(start_stream_server, session=session), preferred=stream_port
+                    )
+                    stream_config['port'] = stream_port
+                    stream_config['server'] = stream_server
                 active_streams[stream_id] = stream_config
                 
-                logger.info(f"Stream server started successfully for {stream_id}")
+                logger.info(f"Stream ingest ready for {stream_id} on port {stream_port}")
                 
             except Exception as server_error:
                 logger.error(f"Failed to start stream server: {server_error}")
@@ -1192,10 +4729,12 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 'success': True,
                 'streamId': stream_id,
                 'port': stream_port,
-                'config': {k: v for k, v in stream_config.items() if k not in ['server']}
+                'handshake': stream_config.get('handshake'),
+                'config': public_stream_config(stream_config)
             }
             
             self.send_json_response(response)
+            publish_streams_changed('stream_started', stream_id)
             logger.info(f"Stream started successfully: {stream_id} on port {stream_port}")
             
         except json.JSONDecodeError as je:
@@ -1223,7 +4762,7 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 return
                 
             post_data = self.rfile.read(content_length)
-            logger.info(f"Received registration data ({len(post_data)} bytes): {post_data}")
+            logger.debug("Received registration data (%d bytes): %r", len(post_data), post_data)
             
             if not post_data or not post_data.strip():
                 logger.error("Empty registration data received")
@@ -1231,7 +4770,6 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 return
                 
             data = json.loads(post_data.decode('utf-8'))
-            logger.info(f"Parsed registration data: {data}")
             
             # Extract stream information
             stream_id = data.get('streamId')
@@ -1274,6 +4812,7 @@ class HTTPHandler(SimpleHTTPRequestHandler):
             }
             
             self.send_json_response(response)
+            publish_streams_changed('stream_started', stream_id)
             logger.info(f"Client stream registered: {stream_id} at {proxy_stream_url}")
             
         except json.JSONDecodeError as je:
@@ -1291,14 +4830,18 @@ class HTTPHandler(SimpleHTTPRequestHandler):
             data = json.loads(post_data.decode('utf-8'))
             
             stream_id = data.get('streamId')
-            if stream_id in active_streams:
-                stream = active_streams[stream_id]
-                
-                # Stop stream server
+            # Atomic removal: of two concurrent stops only one finds the stream
+            stream = active_streams.pop(stream_id, None)
+            if stream is not None:
+                # Stop stream server (compatibility mode) and drop its connections
                 if 'server' in stream:
                     stream['server'].stop()
+                    stream_port_pool.release(stream['port'])
+                if 'session' in stream:
+                    stream['session'].close()
                 
-                del active_streams[stream_id]
+                audio_levels.pop(stream_id, None)
+                publish_streams_changed('stream_stopped', stream_id)
                 
                 response = {'success': True, 'streamId': stream_id}
                 logger.info(f"Stream stopped: {stream_id}")
@@ -1335,100 +4878,267 @@ class HTTPHandler(SimpleHTTPRequestHandler):
             logger.error(f"Audio level error: {e}")
             self.send_json_response({'success': False, 'error': str(e)})
     
+    UPLOAD_READ_SIZE = 64 * 1024
+    
     def handle_audio_upload(self):
-        """Handle HTTP audio data upload"""
+        """Handle HTTP audio data upload (multipart/form-data)
+
+        The body is parsed incrementally while it is read, so binary audio
+        is never decoded and the field order does not matter.
+        """
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             if content_length == 0:
                 self.send_error(400, "No content")
                 return
-                
-            # Read multipart form data
-            content = self.rfile.read(content_length)
-            
-            # Extract client IP from form data (simplified parsing)
-            client_ip = self.client_address[0]  # Fallback to connection IP
+            if content_length > CONFIG['max_request_body']:
+                self.send_error(413, "Upload too large")
+                return
             
-            # Try to extract client IP from form data
-            content_str = content.decode('utf-8', errors='ignore')
-            if 'clientIP' in content_str:
-                import re
-                match = re.search(r'name="clientIP"\r?\n\r?\n([^\r\n]+)', content_str)
-                if match:
-                    client_ip = match.group(1).strip()
+            try:
+                parser = MultipartFormParser(self.headers.get_param('boundary', header='Content-Type') or '')
+                self.read_body_into(parser.feed, content_length)
+            except ValueError as e:
+                self.send_error(400, f"Invalid multipart body: {e}")
+                return
             
-            # Find audio data in multipart content
-            audio_start = content.find(b'\r\n\r\n') + 4
-            audio_end = content.rfind(b'\r\n--')
-            if audio_end == -1:
-                audio_end = len(content)
-                
-            audio_data = content[audio_start:audio_end]
+            # The audio part is named "audio"; accept any file part as fallback
+            audio_data = parser.files.get('audio')
+            if audio_data is None and parser.files:
+                audio_data = next(iter(parser.files.values()))
             
-            if len(audio_data) > 0:
-                # Store audio data in AudioStreamHandler
-                global global_audio_handler
-                if global_audio_handler is None:
-                    global_audio_handler = AudioStreamHandler()
-                global_audio_handler.handle_http_audio_data(audio_data, client_ip)
-                logger.info(f"HTTP audio upload from {client_ip}: {len(audio_data)} bytes")
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                response = {"status": "ok", "bytes": len(audio_data)}
-                self.wfile.write(json.dumps(response).encode())
-            else:
-                self.send_error(400, "No audio data found")
+            fields = parser.fields
+            self.store_uploaded_audio(
+                audio_data,
+                fields.get('clientIP', '').strip() or self.client_address[0],
+                fields.get('sequence'),
+                fields.get('timestamp')
+            )
                 
         except Exception as e:
             logger.error(f"Audio upload error: {e}")
             self.send_error(500, "Upload failed")
     
+    def handle_audio_raw_upload(self):
+        """Handle raw audio upload (application/octet-stream)
+
+        Zero-parse fast path: the body is the audio, metadata travels in
+        the X-Client-IP, X-Audio-Sequence and X-Audio-Timestamp headers.
+        """
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length == 0:
+                self.send_error(400, "No content")
+                return
+            if content_length > CONFIG['max_request_body']:
+                self.send_error(413, "Upload too large")
+                return
+            
+            audio_data = bytearray(content_length)
+            received = 0
+            
+            def collect(chunk):
+                nonlocal received
+                audio_data[received:received + len(chunk)] = chunk
+                received += len(chunk)
+            
+            self.read_body_into(collect, content_length)
+            self.store_uploaded_audio(
+                audio_data,
+                self.headers.get('X-Client-IP', '').strip() or self.client_address[0],
+                self.headers.get('X-Audio-Sequence'),
+                self.headers.get('X-Audio-Timestamp')
+            )
+            
+        except Exception as e:
+            logger.error(f"Raw audio upload error: {e}")
+            self.send_error(500, "Upload failed")
+    
+    def handle_audio_stream_upload(self):
+        """Handle a persistent ingest POST that lasts the whole session
+
+        The body is sent with Transfer-Encoding: chunked (or a large
+        Content-Length) and fed to the audio handler as it arrives, so one
+        request replaces ten uploads per second.
+        """
+        client_ip = self.headers.get('X-Client-IP', '').strip() or self.client_address[0]
+        self.close_connection = True
+        received = 0
+        
+        global global_audio_handler
+        if global_audio_handler is None:
+            global_audio_handler = AudioStreamHandler()
+        
+        def ingest(piece):
+            nonlocal received
+            received += len(piece)
+            global_audio_handler.handle_stream_audio_data(piece, client_ip)
+        
+        try:
+            self.connection.settimeout(CONFIG['http_idle_timeout'])
+            logger.info(f"Persistent audio ingest started for {client_ip}")
+            
+            if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+                decoder = ChunkedBodyDecoder()
+                while not decoder.complete and server_running:
+                    data = self.rfile.read1(self.UPLOAD_READ_SIZE)
+                    if not data:
+                        break
+                    for piece in decoder.feed(data):
+                        ingest(piece)
+            else:
+                content_length = int(self.headers.get('Content-Length', 0))
+                self.read_body_into(ingest, content_length)
+            
+            logger.info(f"Persistent audio ingest ended for {client_ip}: {received} bytes")
+            self.send_json_response({'status': 'ok', 'bytes': received})
+            
+        except (ConnectionError, socket.timeout, ValueError) as e:
+            logger.info(f"Persistent audio ingest for {client_ip} closed after {received} bytes: {e}")
+    
+    def read_body_into(self, consume, content_length: int):
+        """Read the request body in chunks into a reusable buffer"""
+        buffer = bytearray(min(content_length, self.UPLOAD_READ_SIZE))
+        view = memoryview(buffer)
+        remaining = content_length
+        while remaining > 0:
+            count = self.rfile.readinto(view[:min(remaining, len(buffer))])
+            if not count:
+                raise ConnectionError("Client closed connection during upload")
+            consume(view[:count])
+            remaining -= count
+    
+    def store_uploaded_audio(self, audio_data, client_ip: str, sequence, timestamp):
+        """Pass an uploaded chunk to the audio handler and answer the request"""
+        if not audio_data:
+            self.send_error(400, "No audio data found")
+            return
+        
+        sequence, client_timestamp = parse_upload_metadata(sequence, timestamp)
+        
+        # Store audio data in AudioStreamHandler
+        global global_audio_handler
+        if global_audio_handler is None:
+            global_audio_handler = AudioStreamHandler()
+        global_audio_handler.handle_http_audio_data(audio_data, client_ip, sequence, client_timestamp)
+        logger.debug("HTTP audio upload from %s: %d bytes", client_ip, len(audio_data), extra={'event': 'audio_chunk'})
+        
+        response = json.dumps({"status": "ok", "bytes": len(audio_data)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+    
     def handle_system_update(self):
         """Handle system update request - pull from git and restart"""
         try:
             logger.info("System update requested")
             
-            # Send success response first
+            # Send success response first; the body is never read, so the
+            # connection cannot be reused
+            self.close_connection = True
+            response = json.dumps({"status": "ok", "message": "Update initiated"}).encode()
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Length', str(len(response)))
             self.end_headers()
+            self.wfile.write(response)
+            self.wfile.flush()
+            
+            # Schedule git pull and restart after response is sent
+            def do_update():
+                time.sleep(1)  # Give time for response to be sent
+                try:
+                    # Change to the correct directory
+                    os.chdir('/opt/pimic-audio')
+                    
+                    # Pull latest changes
+                    logger.info("Pulling latest changes from git...")
+                    subprocess.run(['git', 'pull', 'origin', 'master'], check=True)
+                    
+                    # Restart the pm2 process
+                    logger.info("Restarting pm2 process...")
+                    subprocess.run(['pm2', 'restart', 'pimic'], check=True)
+                    
+                    logger.info("System update completed successfully")
+                except Exception as e:
+                    logger.error(f"System update failed: {e}")
+            
+            # Run update in background thread
+            threading.Thread(target=do_update, daemon=True).start()
+            
+        except Exception as e:
+            logger.error(f"System update error: {e}")
+            self.send_error(500, "Update failed")
+    
+    def handle_rtp_start(self):
+        """Handle RTP stream start request"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length <= 0:
+                self.send_json_response({'success': False, 'error': 'Invalid request'})
+                return
+            
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data.decode('utf-8'))
+            
+            client_ip = data.get('client_ip')
+            if not client_ip:
+                self.send_json_response({'success': False, 'error': 'Missing client_ip'})
+                return
+            
+            # Get global RTP streamer instance
+            global global_rtp_streamer, global_audio_handler
+            if not global_rtp_streamer:
+                global_rtp_streamer = RTPStreamer()
+            
+            if not global_audio_handler:
+                global_audio_handler = AudioStreamHandler()
+            
+            # Start RTP stream
+            result = global_rtp_streamer.start_rtp_stream(client_ip, global_audio_handler, data.get('destinations'),
+                                                          data.get('codec', 'opus'))
+            self.send_json_response(result)
+            
+        except Exception as e:
+            logger.error(f"RTP start error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
+    
+    def handle_rtp_stop(self):
+        """Handle RTP stream stop request"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length <= 0:
+                self.send_json_response({'success': False, 'error': 'Invalid request'})
+                return
+            
+            post_data = self.rfile.read(content_length)
+            data = json.loads(post_data.decode('utf-8'))
             
-            response = {"status": "ok", "message": "Update initiated"}
-            self.wfile.write(json.dumps(response).encode())
+            client_ip = data.get('client_ip')
+            if not client_ip:
+                self.send_json_response({'success': False, 'error': 'Missing client_ip'})
+                return
             
-            # Schedule git pull and restart after response is sent
-            def do_update():
-                time.sleep(1)  # Give time for response to be sent
-                try:
-                    # Change to the correct directory
-                    os.chdir('/opt/pimic-audio')
-                    
-                    # Pull latest changes
-                    logger.info("Pulling latest changes from git...")
-                    subprocess.run(['git', 'pull', 'origin', 'master'], check=True)
-                    
-                    # Restart the pm2 process
-                    logger.info("Restarting pm2 process...")
-                    subprocess.run(['pm2', 'restart', 'pimic'], check=True)
-                    
-                    logger.info("System update completed successfully")
-                except Exception as e:
-                    logger.error(f"System update failed: {e}")
+            # Get global RTP streamer instance
+            global global_rtp_streamer
+            if not global_rtp_streamer:
+                self.send_json_response({'success': False, 'error': 'RTP streamer not initialized'})
+                return
             
-            # Run update in background thread
-            threading.Thread(target=do_update, daemon=True).start()
+            # Stop RTP stream
+            result = global_rtp_streamer.stop_rtp_stream(client_ip)
+            self.send_json_response(result)
             
         except Exception as e:
-            logger.error(f"System update error: {e}")
-            self.send_error(500, "Update failed")
+            logger.error(f"RTP stop error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
     
-    def handle_rtp_start(self):
-        """Handle RTP stream start request"""
+    def handle_rtp_destinations(self):
+        """Handle runtime add/remove of RTP destinations"""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             if content_length <= 0:
@@ -1443,228 +5153,933 @@ class HTTPHandler(SimpleHTTPRequestHandler):
                 self.send_json_response({'success': False, 'error': 'Missing client_ip'})
                 return
             
-            # Get global RTP streamer instance
-            global global_rtp_streamer, global_audio_handler
+            global global_rtp_streamer
+            if not global_rtp_streamer:
+                self.send_json_response({'success': False, 'error': 'RTP streamer not initialized'})
+                return
+            
+            result = global_rtp_streamer.update_destinations(client_ip, data.get('add'), data.get('remove'))
+            self.send_json_response(result)
+            
+        except Exception as e:
+            logger.error(f"RTP destinations error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
+    
+    def serve_rtp_streams_api(self):
+        """Serve RTP streams API"""
+        try:
+            global global_rtp_streamer
             if not global_rtp_streamer:
                 global_rtp_streamer = RTPStreamer()
             
+            rtp_info = global_rtp_streamer.get_active_streams()
+            self.send_json_response({
+                'success': True,
+                'rtp_streams': rtp_info
+            })
+            
+        except Exception as e:
+            logger.error(f"RTP streams API error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
+
+    def serve_audio_levels_api(self):
+        """Serve real-time audio levels for all active clients"""
+        try:
+            global global_audio_handler
+            if not global_audio_handler:
+                global_audio_handler = AudioStreamHandler()
+            
+            audio_levels = global_audio_handler.get_audio_levels()
+            self.send_json_response({
+                'success': True,
+                'levels': audio_levels,
+                'timestamp': time.time()
+            })
+            
+        except Exception as e:
+            logger.error(f"Audio levels API error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
+
+    def serve_audio_ingest_api(self):
+        """Serve ingest jitter buffer statistics for all clients"""
+        try:
+            global global_audio_handler
             if not global_audio_handler:
                 global_audio_handler = AudioStreamHandler()
             
-            # Start RTP stream
-            result = global_rtp_streamer.start_rtp_stream(client_ip, global_audio_handler)
-            self.send_json_response(result)
+            self.send_json_response({
+                'success': True,
+                'ingest': global_audio_handler.get_ingest_stats(),
+                'timestamp': time.time()
+            })
             
         except Exception as e:
-            logger.error(f"RTP start error: {e}")
+            logger.error(f"Audio ingest API error: {e}")
+            self.send_json_response({'success': False, 'error': str(e)})
+
+    def serve_index(self):
+        """Serve main HTML page"""
+        entry = static_asset_cache.get(TEMPLATES_DIR / 'index.html')
+        if entry is None:
+            logger.error(f"Template file not found: {TEMPLATES_DIR / 'index.html'}")
+            self.send_error(500, "Template not found")
+            return
+        self.send_static_asset(entry)
+    
+    def serve_streams_api(self):
+        """Serve streams API"""
+        streams = get_public_streams()
+        
+        response = {
+            'success': True,
+            'streams': streams,
+            'totalStreams': len(streams)
+        }
+        
+        self.send_json_response(response)
+    
+    def serve_stream_api(self, stream_id: str):
+        """Serve a single stream by id"""
+        stream = active_streams.get(stream_id)
+        if stream is None:
+            self.send_json_response({'success': False, 'error': 'Stream not found'})
+            return
+        
+        self.send_json_response({
+            'success': True,
+            'stream': public_stream_config(stream)
+        })
+    
+    def serve_config_api(self):
+        """Serve configuration API"""
+        response = {
+            'success': True,
+            'config': CONFIG
+        }
+        
+        self.send_json_response(response)
+    
+    def serve_network_api(self):
+        """Serve network information API"""
+        network_info = NetworkInfoService().get_network_info()
+        
+        response = {
+            'success': True,
+            'network': network_info
+        }
+        
+        self.send_json_response(response)
+    
+    def serve_health(self):
+        """Serve health check"""
+        response = {
+            'status': 'healthy',
+            'service': 'pimic-audio-streaming-python',
+            'version': '2.0.0-minimal',
+            'active_streams': len(active_streams),
+            'connected_clients': len(connected_clients),
+            'timestamp': datetime.now().isoformat(),
+            'dependencies': 'python-stdlib-only',
+            'opus_decoder': opus_decoder_backend(),
+            'port_pools': {'rtp': rtp_port_pool.stats(), 'stream': stream_port_pool.stats()}
+        }
+        
+        self.send_json_response(response)
+    
+    def serve_logging_api(self):
+        """Serve log level, rate limits and drop counters"""
+        self.send_json_response({'success': True, 'logging': logging_service.status()})
+    
+    def handle_logging_update(self):
+        """Change log level and rate limits at runtime: ``{"level": "DEBUG", "rate_limits": {...}}``"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length <= 0:
+                self.send_json_response({'success': False, 'error': 'Invalid request'})
+                return
+            
+            data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            if 'level' in data:
+                level = logging_service.set_level(data['level'])
+                logger.warning(f"Log level set to {level}")
+            if isinstance(data.get('rate_limits'), dict):
+                logging_service.rate_limiter.set_rates(data['rate_limits'])
+            
+            self.send_json_response({'success': True, 'logging': logging_service.status()})
+            
+        except (ValueError, TypeError) as e:
+            self.send_json_response({'success': False, 'error': str(e)})
+        except Exception as e:
+            logger.error(f"Logging update error: {e}")
             self.send_json_response({'success': False, 'error': str(e)})
     
-    def handle_rtp_stop(self):
-        """Handle RTP stream stop request"""
+    def serve_static_file(self, path: str):
+        """Serve static files (CSS, JS) from the asset cache"""
+        static_path = (STATIC_DIR / path).resolve()
+        if STATIC_DIR not in static_path.parents:
+            # Reject ../ traversal out of the static directory
+            self.send_error(404)
+            return
+        
+        try:
+            entry = static_asset_cache.get(static_path)
+            if entry is None:
+                self.send_error(404)
+                return
+            self.send_static_asset(entry)
+        except Exception as e:
+            logger.error(f"Error serving static file {path}: {e}")
+            self.send_error(500)
+    
+    def send_static_asset(self, entry: dict):
+        """Send a cached asset, answering If-None-Match, Accept-Encoding and Range"""
+        encoding = static_asset_cache.choose_encoding(entry, self.headers.get('Accept-Encoding', ''))
+        not_modified = static_asset_cache.etag_matches(entry, self.headers.get('If-None-Match', ''))
+        
+        byte_range = None
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and not not_modified and (not if_range or if_range == entry['etags']['identity']):
+            try:
+                byte_range = self.parse_byte_range(range_header, entry['size'])
+            except ValueError:
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{entry['size']}")
+                self.send_header('Content-Length', '0')
+                self.add_cors_headers()
+                self.end_headers()
+                return
+        if byte_range is not None:
+            # Ranges address the file itself, never a compressed variant
+            encoding = 'identity'
+            start, end = byte_range
+        else:
+            start, end = 0, entry['size'] - 1
+        body = entry['bodies'].get(encoding)
+        length = len(body) if body is not None and byte_range is None else end - start + 1
+        
+        if not_modified:
+            self.send_response(304)
+        else:
+            self.send_response(206 if byte_range is not None else 200)
+            self.send_header('Content-type', entry['content_type'])
+            self.send_header('Content-Length', str(length))
+            self.send_header('Accept-Ranges', 'bytes')
+            if byte_range is not None:
+                self.send_header('Content-Range', f"bytes {start}-{end}/{entry['size']}")
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+        self.send_header('ETag', entry['etags'][encoding])
+        self.send_header('Cache-Control', entry['cache_control'])
+        if len(entry['etags']) > 1:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.add_cors_headers()
+        self.end_headers()
+        
+        if not_modified or self.command == 'HEAD' or length == 0:
+            return
+        if body is not None:
+            self.wfile.write(memoryview(body)[start:start + length] if byte_range is not None else body)
+        else:
+            self.send_file_body(entry['path'], start, length)
+    
+    @staticmethod
+    def parse_byte_range(value: str, size: int) -> Optional[tuple]:
+        """Parse a single ``bytes=`` range into inclusive (start, end)
+
+        Returns None for headers that should be ignored (other units,
+        multiple ranges, malformed values) and raises ValueError if the
+        range lies outside the file (416).
+        """
+        unit, _, spec = value.partition('=')
+        if unit.strip().lower() != 'bytes' or ',' in spec:
+            return None
+        first, _, last = (part.strip() for part in spec.partition('-'))
+        if not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0 or size == 0:
+                raise ValueError("Unsatisfiable suffix range")
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or end < start:
+            raise ValueError("Unsatisfiable range")
+        return start, end
+    
+    FILE_BUFFER_SIZE = 64 * 1024
+    
+    def send_file_body(self, path: Path, offset: int, count: int):
+        """Send part of a file with constant memory
+
+        Plain sockets (port 8081) use sendfile, so the data never passes
+        through userspace. TLS sockets read into one reusable buffer.
+        """
+        self.wfile.flush()  # headers before the body
+        with open(path, 'rb') as f:
+            if not isinstance(self.connection, ssl.SSLSocket):
+                sent = self.connection.sendfile(f, offset, count)
+            else:
+                if getattr(self, 'file_buffer', None) is None:
+                    self.file_buffer = memoryview(bytearray(self.FILE_BUFFER_SIZE))
+                f.seek(offset)
+                sent = 0
+                while sent < count:
+                    read = f.readinto(self.file_buffer[:min(count - sent, self.FILE_BUFFER_SIZE)])
+                    if not read:
+                        break
+                    self.connection.sendall(self.file_buffer[:read])
+                    sent += read
+        if sent < count:
+            # File shrank after the headers went out; the framing is broken
+            logger.warning(f"Static file {path.name} truncated: sent {sent} of {count} bytes")
+            self.close_connection = True
+    
+    def get_stream_cursor_param(self, query: str) -> Optional[int]:
+        """Parse the optional ?cursor= parameter of client stream URLs"""
+        values = parse_qs(query).get('cursor')
+        if not values:
+            return None
+        try:
+            return max(0, int(values[0]))
+        except ValueError:
+            return None
+    
+    def add_cors_headers(self):
+        """Add CORS headers to response"""
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, HEAD, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers',
+                         'Content-Type, Accept, Authorization, X-Client-IP, X-Audio-Sequence, X-Audio-Timestamp')
+        self.send_header('Access-Control-Max-Age', '86400')
+
+    def send_json_response(self, data):
+        """Send JSON response"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.add_cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class BufferedHTTPHandler(HTTPHandler):
+    """Runs one HTTPHandler request against in-memory buffers
+
+    Used by AsyncPimicServer for all short request/response routes: the
+    route logic stays in HTTPHandler while the socket stays on the loop.
+    """
+    
+    def __init__(self, raw_request: bytes, client_address, server, requests_served: int = 0):
+        self.raw_request = raw_request
+        self.requests_served = requests_served
+        self.file_body = None
+        super().__init__(None, client_address, server)
+    
+    def setup(self):
+        self.connection = None
+        self.rfile = io.BytesIO(self.raw_request)
+        self.wfile = io.BytesIO()
+    
+    def handle(self):
+        self.handle_one_request()
+    
+    def handle_expect_100(self):
+        # The event loop already sent 100 Continue before reading the body
+        return True
+    
+    def send_file_body(self, path: Path, offset: int, count: int):
+        # Streamed by the event loop after the headers (loop.sendfile)
+        self.file_body = (path, offset, count)
+    
+    def finish(self):
+        # The event loop reads the response from wfile afterwards
+        pass
+
+
+class AsyncWebSocketConnection:
+    """Thread-safe send side of a WebSocket owned by the event loop
+
+    Mirrors the send API of WebSocketConnection so broadcast_message works
+    the same for threaded and asyncio sessions.
+    """
+    
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop):
+        self.writer = writer
+        self.loop = loop
+        self.closed = False
+    
+    def _send_frame(self, opcode: int, payload: bytes) -> bool:
+        if self.closed:
+            return False
+        frame = WebSocketCodec.encode_frame(opcode, payload)
+        try:
+            self.loop.call_soon_threadsafe(self.writer.write, frame)
+        except RuntimeError:
+            # Event loop already closed
+            self.closed = True
+            return False
+        return True
+    
+    def send_text(self, text: str) -> bool:
+        return self._send_frame(WebSocketCodec.OP_TEXT, text.encode('utf-8'))
+    
+    def send_json(self, message: dict) -> bool:
+        return self.send_text(json.dumps(message, ensure_ascii=False))
+    
+    def send_binary(self, data: bytes) -> bool:
+        return self._send_frame(WebSocketCodec.OP_BINARY, bytes(data))
+    
+    def close(self, code: int = WebSocketCodec.CLOSE_NORMAL, reason: str = ''):
+        if self.closed:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.writer.write, WebSocketCodec.encode_close(code, reason))
+        except RuntimeError:
+            pass
+        self.closed = True
+
+
+class AsyncPimicServer:
+    """asyncio event-loop server core (default server mode)
+
+    Streaming routes (chunked audio, SSE, WebSockets) and the TCP stream
+    ports run natively on the loop, so a listener costs a coroutine rather
+    than a thread. All other routes are executed by HTTPHandler on a small
+    bounded thread pool, which keeps a single implementation of every route.
+    """
+    
+    MAX_HEADER_SIZE = 64 * 1024
+    
+    def __init__(self, ssl_context=None):
+        self.ssl_context = ssl_context
+        self.loop = None
+        self.executor = None
+        self.servers = []
+    
+    def run(self, listeners: List[tuple]):
+        """Serve ``(host, port, use_ssl)`` listeners until stop() is called"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.executor = ThreadPoolExecutor(
+            max_workers=CONFIG['async_worker_threads'],
+            thread_name_prefix='pimic-http'
+        )
+        self.loop.set_default_executor(self.executor)
+        try:
+            self.loop.run_until_complete(self._start_listeners(listeners))
+            self.loop.run_forever()
+        finally:
+            for server in self.servers:
+                server.close()
+            # Cancel open connections so streaming coroutines run their cleanup
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.executor.shutdown(wait=False)
+            self.loop.close()
+    
+    async def _start_listeners(self, listeners: List[tuple]):
+        for host, port, use_ssl in listeners:
+            ssl_context = self.ssl_context if use_ssl else None
+            server = await asyncio.start_server(
+                functools.partial(self._handle_connection, port),
+                host, port,
+                ssl=ssl_context,
+                reuse_address=True,
+                limit=self.MAX_HEADER_SIZE
+            )
+            self.servers.append(server)
+            scheme = 'https' if ssl_context else 'http'
+            logger.info(f"Async {scheme} listener started on port {port}")
+    
+    def stop(self):
+        """Stop the event loop (callable from signal handlers and other threads)"""
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+    
+    async def _handle_connection(self, server_port: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes or goes idle"""
+        client_address = writer.get_extra_info('peername')[:2]
+        requests_served = 0
+        try:
+            while server_running:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), CONFIG['http_idle_timeout'])
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_simple(writer, 431, 'Request Header Fields Too Large')
+                    break
+                
+                parsed = self._parse_head(head)
+                if parsed is None:
+                    await self._send_simple(writer, 400, 'Bad Request')
+                    break
+                method, path, headers = parsed
+                content_length = self._content_length(headers)
+                if content_length is None:
+                    # Without a trustworthy length the body cannot be framed
+                    await self._send_simple(writer, 400, 'Bad Request')
+                    break
+                
+                native_route, params = self._native_route(method, path, requests_served)
+                if native_route is not None:
+                    # Streaming routes own the connection until they finish;
+                    # keep_alive routes return whether it may be reused
+                    keep_alive = await native_route(reader, writer, path, headers, client_address, **params)
+                    requests_served += 1
+                    if not keep_alive:
+                        break
+                    continue
+                
+                if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+                    await self._send_simple(writer, 411, 'Length Required')
+                    break
+                
+                body = b''
+                if content_length > CONFIG['max_request_body']:
+                    await self._send_simple(writer, 413, 'Payload Too Large')
+                    break
+                if content_length > 0:
+                    if headers.get('Expect', '').lower() == '100-continue':
+                        writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+                    body = await reader.readexactly(content_length)
+                
+                keep_alive = await self._delegate(head + body, client_address, server_port, writer, requests_served)
+                requests_served += 1
+                if not keep_alive:
+                    break
+                
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.CancelledError):
+            # Cancellation comes from shutdown; finish quietly instead of re-raising
+            pass
+        except Exception as e:
+            logger.error(f"Async connection error from {client_address[0]}: {e}")
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+    
+    def _parse_head(self, head: bytes):
+        """Split a request head into method, path and headers"""
+        try:
+            request_line, _, header_block = head.partition(b'\r\n')
+            method, path, _version = request_line.decode('latin-1').split()
+            headers = http.client.parse_headers(io.BytesIO(header_block))
+            return method, path, headers
+        except (ValueError, http.client.HTTPException):
+            return None
+    
+    @staticmethod
+    def _content_length(headers) -> Optional[int]:
+        """Declared body length (0 if absent), None if malformed or negative"""
+        value = (headers.get('Content-Length') or '0').strip()
+        if not (value.isascii() and value.isdigit()):
+            return None
+        return int(value)
+    
+    def _native_route(self, method: str, path: str, requests_served: int = 0):
+        """Coroutine and path params for routes served on the loop, or (None, {})"""
+        route, params = HTTP_ROUTES.match(urlparse(path).path)
+        native = route['options'].get('native') if route is not None else None
+        if native is None or method == 'HEAD' or method not in route['methods']:
+            return None, {}
+        if route['options'].get('keep_alive'):
+            params = dict(params, requests_served=requests_served)
+        return getattr(self, native), params
+    
+    async def _send_simple(self, writer: asyncio.StreamWriter, status: int, reason: str):
+        """Send an empty-bodied error response and close"""
+        writer.write(
+            f'HTTP/1.1 {status} {reason}\r\n'
+            'Content-Length: 0\r\n'
+            'Connection: close\r\n\r\n'.encode('latin-1')
+        )
+        await writer.drain()
+    
+    async def _delegate(self, raw_request: bytes, client_address, server_port: int,
+                        writer: asyncio.StreamWriter, requests_served: int) -> bool:
+        """Run HTTPHandler for one buffered request on the executor"""
+        server_info = types.SimpleNamespace(server_port=server_port, server_address=('0.0.0.0', server_port))
+        handler = await self.loop.run_in_executor(
+            None, BufferedHTTPHandler, raw_request, client_address, server_info, requests_served
+        )
+        writer.write(handler.wfile.getvalue())
+        await writer.drain()
+        if handler.file_body is not None:
+            # sendfile on plain transports, buffered readinto fallback for TLS
+            path, offset, count = handler.file_body
+            with open(path, 'rb') as f:
+                sent = await self.loop.sendfile(writer.transport, f, offset, count)
+            if sent < count:
+                return False
+        return not handler.close_connection
+    
+    async def _serve_client_audio(self, reader, writer, path, headers, client_address, client_ip):
+        """Chunked audio stream for one listener with its own read cursor"""
+        logger.info(f"Serving chunked audio for client {client_ip}")
+        
+        writer.write(
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: audio/webm\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Transfer-Encoding: chunked\r\n'
+            b'Connection: close\r\n\r\n'
+        )
+        
+        audio_handler = AudioStreamHandler()
+        reader_cursor = None
+        chunk_size = 4096
+        deadline = self.loop.time() + 30  # 30 seconds timeout, as in threaded mode
+        
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length <= 0:
-                self.send_json_response({'success': False, 'error': 'Invalid request'})
-                return
-            
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            while self.loop.time() < deadline and server_running:
+                reader_cursor = audio_handler.refresh_reader(client_ip, reader_cursor)
+                audio_data = reader_cursor.read(chunk_size) if reader_cursor else b''
+                if audio_data:
+                    writer.write(b'%x\r\n' % len(audio_data) + audio_data + b'\r\n')
+                    await writer.drain()
+                    continue
+                await asyncio.sleep(0.05)
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        except ConnectionError as e:
+            logger.debug(f"Chunked audio listener for {client_ip} disconnected: {e}")
+    
+    async def _serve_events(self, reader, writer, path, headers, client_address):
+        """Long-lived SSE stream fed by the event bus"""
+        query = parse_qs(urlparse(path).query)
+        topics = None
+        if query.get('topics'):
+            topics = {topic for topic in query['topics'][0].split(',') if topic}
+        
+        bus = EventBus()
+        subscription = bus.subscribe(topics)
+        wakeup = asyncio.Event()
+        loop = self.loop
+        subscription.wakeup = lambda: loop.call_soon_threadsafe(wakeup.set)
+        
+        try:
+            writer.write(
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: text/event-stream\r\n'
+                b'Cache-Control: no-cache\r\n'
+                b'X-Accel-Buffering: no\r\n'
+                b'Access-Control-Allow-Origin: *\r\n'
+                b'Connection: close\r\n\r\n'
+                b'retry: 3000\n'
+            )
+            writer.write(format_sse_event({'type': 'config', 'config': CONFIG}))
+            if subscription.wants('streams'):
+                writer.write(format_sse_event({'type': 'streams', 'streams': get_public_streams()}))
+            await writer.drain()
             
-            client_ip = data.get('client_ip')
-            if not client_ip:
-                self.send_json_response({'success': False, 'error': 'Missing client_ip'})
+            while server_running and not subscription.closed:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), CONFIG['sse_heartbeat_interval'])
+                except asyncio.TimeoutError:
+                    writer.write(format_sse_event({'type': 'heartbeat', 'timestamp': time.time()}))
+                    await writer.drain()
+                    continue
+                wakeup.clear()
+                for event in subscription.drain():
+                    writer.write(format_sse_event(event))
+                await writer.drain()
+                
+        except ConnectionError as e:
+            logger.debug(f"SSE client {client_address[0]} disconnected: {e}")
+        finally:
+            subscription.wakeup = None
+            bus.unsubscribe(subscription)
+    
+    async def _websocket_handshake(self, writer, headers) -> bool:
+        """Answer the WebSocket upgrade, or reject it with 400"""
+        websocket_key = headers.get('Sec-WebSocket-Key', '')
+        if not websocket_key or headers.get('Sec-WebSocket-Version', '13') != '13':
+            await self._send_simple(writer, 400, 'Bad Request')
+            return False
+        accept_key = SimpleWebSocketHandler.compute_accept_key(websocket_key)
+        writer.write(
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept_key}\r\n\r\n'.encode('latin-1')
+        )
+        await writer.drain()
+        return True
+    
+    async def _read_websocket_events(self, reader, writer, codec: WebSocketCodec):
+        """Read frames and yield data events, answering control frames inline"""
+        while server_running:
+            data = await reader.read(64 * 1024)
+            if not data:
                 return
-            
-            # Get global RTP streamer instance
-            global global_rtp_streamer
-            if not global_rtp_streamer:
-                self.send_json_response({'success': False, 'error': 'RTP streamer not initialized'})
+            try:
+                events = codec.feed(data)
+            except WebSocketError as e:
+                logger.warning(f"WebSocket protocol error: {e}")
+                writer.write(WebSocketCodec.encode_close(e.close_code, str(e)))
                 return
-            
-            # Stop RTP stream
-            result = global_rtp_streamer.stop_rtp_stream(client_ip)
-            self.send_json_response(result)
-            
-        except Exception as e:
-            logger.error(f"RTP stop error: {e}")
-            self.send_json_response({'success': False, 'error': str(e)})
+            for event in events:
+                kind = event[0]
+                if kind == 'ping':
+                    writer.write(WebSocketCodec.encode_frame(WebSocketCodec.OP_PONG, event[1]))
+                elif kind == 'close':
+                    code = event[1] if event[1] != WebSocketCodec.CLOSE_NO_STATUS else WebSocketCodec.CLOSE_NORMAL
+                    writer.write(WebSocketCodec.encode_close(code))
+                    return
+                elif kind in ('text', 'binary'):
+                    yield event
     
-    def serve_rtp_streams_api(self):
-        """Serve RTP streams API"""
-        try:
-            global global_rtp_streamer
-            if not global_rtp_streamer:
-                global_rtp_streamer = RTPStreamer()
-            
-            rtp_info = global_rtp_streamer.get_active_streams()
-            self.send_json_response({
-                'success': True,
-                'rtp_streams': rtp_info
-            })
-            
-        except Exception as e:
-            logger.error(f"RTP streams API error: {e}")
-            self.send_json_response({'success': False, 'error': str(e)})
-
-    def serve_audio_levels_api(self):
-        """Serve real-time audio levels for all active clients"""
+    async def _serve_audio_stream_upload(self, reader, writer, path, headers, client_address):
+        """Persistent ingest POST: the body is fed to the audio handler as it arrives"""
+        client_ip = headers.get('X-Client-IP', '').strip() or client_address[0]
+        audio_handler = AudioStreamHandler()
+        received = 0
+        if headers.get('Expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        logger.info(f"Persistent audio ingest started for {client_ip}")
+        
         try:
-            global global_audio_handler
-            if not global_audio_handler:
-                global_audio_handler = AudioStreamHandler()
-            
-            audio_levels = global_audio_handler.get_audio_levels()
-            self.send_json_response({
-                'success': True,
-                'levels': audio_levels,
-                'timestamp': time.time()
-            })
+            if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+                decoder = ChunkedBodyDecoder()
+                while not decoder.complete and server_running:
+                    data = await asyncio.wait_for(reader.read(64 * 1024), CONFIG['http_idle_timeout'])
+                    if not data:
+                        return
+                    for piece in decoder.feed(data):
+                        received += len(piece)
+                        audio_handler.handle_stream_audio_data(piece, client_ip)
+            else:
+                remaining = self._content_length(headers)
+                while remaining > 0:
+                    data = await asyncio.wait_for(reader.read(min(remaining, 64 * 1024)), CONFIG['http_idle_timeout'])
+                    if not data:
+                        return
+                    remaining -= len(data)
+                    received += len(data)
+                    audio_handler.handle_stream_audio_data(data, client_ip)
             
-        except Exception as e:
-            logger.error(f"Audio levels API error: {e}")
-            self.send_json_response({'success': False, 'error': str(e)})
+            body = json.dumps({'status': 'ok', 'bytes': received}).encode()
+            writer.write(
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: application/json\r\n'
+                b'Access-Control-Allow-Origin: *\r\n'
+                b'Content-Length: %d\r\n'
+                b'Connection: close\r\n\r\n' % len(body) + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ValueError) as e:
+            logger.info(f"Persistent audio ingest for {client_ip} closed: {e!r}")
+        finally:
+            logger.info(f"Persistent audio ingest ended for {client_ip}: {received} bytes")
+    
+    async def _read_upload_body(self, reader, writer, headers, consume) -> Optional[int]:
+        """Read a Content-Length body and pass it to ``consume``
 
-    def serve_index(self):
-        """Serve main HTML page"""
-        try:
-            # Load HTML from template file
-            template_path = Path(__file__).parent / 'templates' / 'index.html'
-            with open(template_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html; charset=utf-8')
-            self.add_cors_headers()
-            self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
-            
-        except FileNotFoundError:
-            logger.error(f"Template file not found: {template_path}")
-            self.send_error(500, "Template not found")
-        except Exception as e:
-            logger.error(f"Error serving index: {e}")
-            self.send_error(500, "Internal server error")
+        Returns the body length, or None after answering an empty or
+        oversized upload with the same errors as the threaded handlers.
+        """
+        content_length = self._content_length(headers)
+        if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            await self._send_simple(writer, 411, 'Length Required')
+            return None
+        if content_length == 0:
+            await self._send_simple(writer, 400, 'No content')
+            return None
+        if content_length > CONFIG['max_request_body']:
+            await self._send_simple(writer, 413, 'Upload too large')
+            return None
+        if headers.get('Expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        
+        # Bounded by max_request_body, so one read (and one timeout) per upload
+        consume(await asyncio.wait_for(reader.readexactly(content_length), CONFIG['http_idle_timeout']))
+        return content_length
     
-    def serve_streams_api(self):
-        """Serve streams API"""
-        streams = [
-            {k: v for k, v in stream.items() if k not in ['server']}
-            for stream in active_streams.values()
-        ]
+    async def _store_uploaded_audio(self, writer, headers, requests_served: int,
+                                    audio_data, client_ip: str, sequence, timestamp) -> bool:
+        """Loop counterpart of HTTPHandler.store_uploaded_audio, returns keep-alive"""
+        if not audio_data:
+            await self._send_simple(writer, 400, 'No audio data found')
+            return False
         
-        response = {
-            'success': True,
-            'streams': streams,
-            'totalStreams': len(streams)
-        }
+        sequence, client_timestamp = parse_upload_metadata(sequence, timestamp)
+        AudioStreamHandler().handle_http_audio_data(audio_data, client_ip, sequence, client_timestamp)
+        logger.debug("HTTP audio upload from %s: %d bytes", client_ip, len(audio_data), extra={'event': 'audio_chunk'})
         
-        self.send_json_response(response)
+        keep_alive = (requests_served + 1 < CONFIG['http_max_keepalive_requests']
+                      and headers.get('Connection', '').lower() != 'close')
+        body = json.dumps({'status': 'ok', 'bytes': len(audio_data)}).encode()
+        writer.write(
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: application/json\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'Content-Length: %d\r\n'
+            b'Connection: %s\r\n\r\n' % (len(body), b'keep-alive' if keep_alive else b'close') + body
+        )
+        await writer.drain()
+        return keep_alive
     
-    def serve_config_api(self):
-        """Serve configuration API"""
-        response = {
-            'success': True,
-            'config': CONFIG
-        }
-        
-        self.send_json_response(response)
+    async def _serve_audio_raw_upload(self, reader, writer, path, headers, client_address, requests_served=0):
+        """Raw chunk upload answered on the loop (no executor round trip)"""
+        audio_data = bytearray()
+        if await self._read_upload_body(reader, writer, headers, audio_data.extend) is None:
+            return False
+        return await self._store_uploaded_audio(
+            writer, headers, requests_served, audio_data,
+            headers.get('X-Client-IP', '').strip() or client_address[0],
+            headers.get('X-Audio-Sequence'),
+            headers.get('X-Audio-Timestamp')
+        )
     
-    def serve_network_api(self):
-        """Serve network information API"""
-        network_info = self.network_discovery.get_network_info()
+    async def _serve_audio_upload(self, reader, writer, path, headers, client_address, requests_served=0):
+        """Multipart chunk upload answered on the loop (no executor round trip)"""
+        try:
+            parser = MultipartFormParser(headers.get_param('boundary', header='Content-Type') or '')
+            if await self._read_upload_body(reader, writer, headers, parser.feed) is None:
+                return False
+        except ValueError as e:
+            await self._send_simple(writer, 400, 'Invalid multipart body')
+            logger.debug(f"Invalid multipart upload from {client_address[0]}: {e}")
+            return False
         
-        response = {
-            'success': True,
-            'network': network_info
-        }
+        # The audio part is named "audio"; accept any file part as fallback
+        audio_data = parser.files.get('audio')
+        if audio_data is None and parser.files:
+            audio_data = next(iter(parser.files.values()))
         
-        self.send_json_response(response)
+        fields = parser.fields
+        return await self._store_uploaded_audio(
+            writer, headers, requests_served, audio_data,
+            fields.get('clientIP', '').strip() or client_address[0],
+            fields.get('sequence'),
+            fields.get('timestamp')
+        )
     
-    def serve_health(self):
-        """Serve health check"""
-        response = {
-            'status': 'healthy',
-            'service': 'pimic-audio-streaming-python',
-            'version': '2.0.0-minimal',
-            'active_streams': len(active_streams),
-            'connected_clients': len(connected_clients),
-            'timestamp': datetime.now().isoformat(),
-            'dependencies': 'python-stdlib-only'
-        }
+    async def _serve_audio_websocket(self, reader, writer, path, headers, client_address):
+        """Audio ingest over WebSocket: JSON config text frame, then binary audio"""
+        if not await self._websocket_handshake(writer, headers):
+            return
         
-        self.send_json_response(response)
+        client_ip = client_address[0]
+        audio_handler = AudioStreamHandler()
+        logger.info(f"Audio WebSocket connected from {client_ip}")
+        codec = WebSocketCodec(CONFIG['websocket_max_message_size'])
+        try:
+            async for kind, payload in self._read_websocket_events(reader, writer, codec):
+                if kind == 'text':
+                    client_ip = audio_handler.handle_config_message(json.loads(payload), client_ip)
+                else:
+                    audio_handler.handle_audio_data(payload, client_ip)
+        except (ConnectionError, ValueError) as e:
+            logger.error(f"WebSocket frame reading error: {e}")
+        finally:
+            audio_handler.remove_client(client_ip)
+            logger.info(f"Audio WebSocket closed for {client_ip}")
     
-    def serve_static_file(self):
-        """Serve static files (CSS, JS)"""
-        file_path = self.path[1:]  # Remove leading /
+    async def _serve_push_websocket(self, reader, writer, path, headers, client_address):
+        """Event-bus push session (same protocol as the threaded /ws session)"""
+        if not await self._websocket_handshake(writer, headers):
+            return
+        
+        websocket_handler = SimpleWebSocketHandler()
+        client_id = f"{client_address[0]}_{client_address[1]}_{int(time.time())}"
+        connection = AsyncWebSocketConnection(writer, self.loop)
+        websocket_handler.add_client(client_id, {
+            'address': client_address,
+            'connected_at': datetime.now(),
+            'connection': connection
+        })
+        
+        bus = EventBus()
+        loop = self.loop
+        wakeup = asyncio.Event()
+        state = {'subscription': None, 'send_network': False, 'audio_client': None, 'closed': False}
+        
+        async def read_loop():
+            codec = WebSocketCodec(CONFIG['websocket_max_message_size'])
+            try:
+                async for kind, payload in self._read_websocket_events(reader, writer, codec):
+                    if kind != 'text':
+                        continue
+                    request = json.loads(payload)
+                    if request.get('type') != 'subscribe':
+                        continue
+                    topics = {t for t in request.get('topics', []) if t in websocket_handler.PUSH_TOPICS}
+                    state['send_network'] = 'network' in topics
+                    topics.discard('network')
+                    if state['subscription'] is not None:
+                        state['subscription'].wakeup = None
+                        bus.unsubscribe(state['subscription'])
+                    subscription = bus.subscribe(topics)
+                    subscription.wakeup = lambda: loop.call_soon_threadsafe(wakeup.set)
+                    state['subscription'] = subscription
+                    state['audio_client'] = request.get('audio')
+                    state['network_sent'] = None
+                    state['network_check'] = 0.0
+                    if 'streams' in topics:
+                        connection.send_json({'type': 'streams', 'streams': get_public_streams(),
+                                              'timestamp': time.time()})
+                    wakeup.set()
+            except (ConnectionError, ValueError) as e:
+                logger.debug(f"WebSocket push client {client_id} read error: {e}")
+            finally:
+                state['closed'] = True
+                wakeup.set()
+        
+        read_task = self.loop.create_task(read_loop())
+        audio_handler = AudioStreamHandler()
+        audio_reader = None
         
         try:
-            # Load from static directory
-            static_path = Path(__file__).parent / file_path
-            
-            if not static_path.exists():
-                self.send_error(404)
-                return
-            
-            # Determine content type
-            if file_path.endswith('.css'):
-                content_type = 'text/css'
-            elif file_path.endswith('.js'):
-                content_type = 'application/javascript'
-            elif file_path.endswith('.html'):
-                content_type = 'text/html'
-            elif file_path.endswith('.json'):
-                content_type = 'application/json'
-            elif file_path.endswith('.png'):
-                content_type = 'image/png'
-            elif file_path.endswith('.jpg') or file_path.endswith('.jpeg'):
-                content_type = 'image/jpeg'
-            elif file_path.endswith('.svg'):
-                content_type = 'image/svg+xml'
-            else:
-                content_type = 'text/plain'
-            
-            # Handle binary files
-            if file_path.endswith(('.png', '.jpg', '.jpeg', '.gif', '.ico')):
-                with open(static_path, 'rb') as f:
-                    content = f.read()
+            while not state['closed'] and server_running:
+                # Audio subscribers are polled at 20 Hz, everything else is event-driven
+                timeout = 0.05 if state['audio_client'] else 1.0
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
                 
-                self.send_response(200)
-                self.send_header('Content-type', content_type)
-                self.send_header('Content-Length', str(len(content)))
-                self.add_cors_headers()
-                self.end_headers()
-                self.wfile.write(content)
-            else:
-                # Handle text files
-                with open(static_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                subscription = state['subscription']
+                if subscription is not None:
+                    for event in subscription.drain():
+                        connection.send_json(event)
                 
-                self.send_response(200)
-                self.send_header('Content-type', content_type)
-                self.send_header('Content-Length', str(len(content.encode('utf-8'))))
-                self.add_cors_headers()
-                self.end_headers()
-                self.wfile.write(content.encode('utf-8'))
-            
-        except Exception as e:
-            logger.error(f"Error serving static file {file_path}: {e}")
-            self.send_error(500)
-    
-    def add_cors_headers(self):
-        """Add CORS headers to response"""
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, HEAD, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Accept, Authorization')
-        self.send_header('Access-Control-Max-Age', '86400')
-
-    def send_json_response(self, data):
-        """Send JSON response"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.add_cors_headers()
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+                now = time.time()
+                if state['send_network'] and now - state.get('network_check', 0.0) >= 30.0:
+                    state['network_check'] = now
+                    network = NetworkInfoService().get_network_info()
+                    if network != state.get('network_sent'):
+                        state['network_sent'] = network
+                        connection.send_json({'type': 'network', 'network': network, 'timestamp': now})
+                
+                if state['audio_client']:
+                    audio_reader = audio_handler.refresh_reader(state['audio_client'], audio_reader)
+                    if audio_reader is not None:
+                        audio_data = audio_reader.read(CONFIG['websocket_max_message_size'])
+                        if audio_data:
+                            connection.send_binary(audio_data)
+                
+                await writer.drain()
+        except ConnectionError as e:
+            logger.debug(f"WebSocket push client {client_id} disconnected: {e}")
+        finally:
+            read_task.cancel()
+            connection.closed = True
+            if state['subscription'] is not None:
+                state['subscription'].wakeup = None
+                bus.unsubscribe(state['subscription'])
+            websocket_handler.remove_client(client_id)
 
 
 class PimicAudioServer:
@@ -1672,7 +6087,9 @@ class PimicAudioServer:
     
     def __init__(self):
         self.http_server = None
+        self.async_server = None
         self.network_discovery = None
+        self.level_publisher = None
     
     def get_server_ip(self):
         """Get the server's IP address"""
@@ -1685,30 +6102,9 @@ class PimicAudioServer:
             return ip
         except Exception:
             return "localhost"
-        
-    def start(self):
-        """Start all server components"""
-        print(f"""
-🎵 PIMIC Audio Streaming Server (Pure Python) 🎵
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Web Interface:  http://localhost:{CONFIG['web_port']}
-🎧 Stream Ports:   {CONFIG['default_stream_port']}+
-🔊 Bitrate Range:  {CONFIG['min_bitrate']}-{CONFIG['max_bitrate']} kbps
-🐍 Runtime:        Python {sys.version.split()[0]}
-🚀 Dependencies:   Standard Library Only
-⚡ Performance:    Raspberry Pi Optimized
-✨ No npm/node:    Pure Python Implementation
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        """)
-        
-        # Start network discovery
-        self.network_discovery = NetworkDiscovery()
-        self.network_discovery.start_discovery()
-        
-        # Start HTTPS server with threading support
-        self.http_server = ThreadingHTTPServer(("0.0.0.0", CONFIG['web_port']), HTTPHandler)
-        
-        # Check for HTTPS certificates and setup SSL context
+    
+    def create_ssl_context(self):
+        """Create the HTTPS context if certificates exist, otherwise None"""
         script_dir = Path(__file__).parent
         cert_file = script_dir / "server.crt"
         key_file = script_dir / "server.key"
@@ -1725,14 +6121,9 @@ Web Interface:  http://localhost:{CONFIG['web_port']}
                 ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
                 ssl_context.set_ciphers('ECDHE+AESGCM:ECDHE+CHACHA20:DHE+AESGCM:DHE+CHACHA20:!aNULL:!MD5:!DSS')
                 
-                # Create HTTPS server by wrapping the socket
-                self.http_server.socket = ssl_context.wrap_socket(
-                    self.http_server.socket,
-                    server_side=True
-                )
-                
                 logger.info(f"🔒 HTTPS enabled on port {CONFIG['web_port']}")
                 print(f"🔒 HTTPS: https://{self.get_server_ip()}:{CONFIG['web_port']}")
+                return ssl_context
                 
             except Exception as e:
                 logger.error(f"HTTPS setup failed: {e}")
@@ -1741,6 +6132,75 @@ Web Interface:  http://localhost:{CONFIG['web_port']}
             logger.info("HTTP server (no SSL certificates found)")
             print(f"⚠️  HTTP only: Microphone access requires HTTPS in modern browsers")
             print(f"💡 For HTTPS, generate certificates or use localhost")
+        return None
+        
+    def start(self):
+        """Start all server components"""
+        if CONFIG['stream_ports'] == 'per_stream':
+            ingest_ports = '{}-{} (per stream)'.format(*CONFIG['stream_port_range'])
+        else:
+            ingest_ports = CONFIG['ingest_port']
+        print(f"""
+🎵 PIMIC Audio Streaming Server (Pure Python) 🎵
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Web Interface:  http://localhost:{CONFIG['web_port']}
+🎧 Ingest Port:    {ingest_ports}
+🔊 Bitrate Range:  {CONFIG['min_bitrate']}-{CONFIG['max_bitrate']} kbps
+🐍 Runtime:        Python {sys.version.split()[0]}
+🔀 Server Mode:    {CONFIG['server_mode']}
+🚀 Dependencies:   Standard Library Only
+⚡ Performance:    Raspberry Pi Optimized
+✨ No npm/node:    Pure Python Implementation
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        """)
+        
+        # Start network discovery
+        self.network_discovery = NetworkDiscovery()
+        self.network_discovery.start_discovery()
+        
+        # Encode and compress static assets once instead of per request
+        static_asset_cache.preload(STATIC_DIR, TEMPLATES_DIR)
+        
+        # Start pushing level events to SSE/WebSocket subscribers
+        self.level_publisher = LevelEventPublisher()
+        self.level_publisher.start()
+        
+        # Setup signal handlers
+        signal.signal(signal.SIGINT, self.signal_handler)
+        signal.signal(signal.SIGTERM, self.signal_handler)
+        
+        if CONFIG['server_mode'] == 'asyncio':
+            self.start_asyncio()
+        else:
+            self.start_threaded()
+    
+    def start_asyncio(self):
+        """Serve HTTPS and the HTTP dashboard port from one event loop"""
+        global global_async_server
+        self.async_server = AsyncPimicServer(self.create_ssl_context())
+        global_async_server = self.async_server
+        
+        print(f"🌍 HTTP Dashboard: http://{self.get_server_ip()}:8081/static/dashboard.html")
+        print(f"🌍 HTTP Access: http://{self.get_server_ip()}:8081/")
+        logger.info("PIMIC Audio Server (Pure Python, asyncio) started successfully")
+        
+        try:
+            self.async_server.run([('0.0.0.0', CONFIG['web_port'], True), ('0.0.0.0', 8081, False)])
+        except KeyboardInterrupt:
+            pass
+    
+    def start_threaded(self):
+        """Thread-per-connection fallback using ThreadingHTTPServer"""
+        # Start HTTPS server with threading support
+        self.http_server = ThreadingHTTPServer(("0.0.0.0", CONFIG['web_port']), HTTPHandler)
+        
+        # Wrap the listening socket when HTTPS certificates are available
+        ssl_context = self.create_ssl_context()
+        if ssl_context is not None:
+            self.http_server.socket = ssl_context.wrap_socket(
+                self.http_server.socket,
+                server_side=True
+            )
         
         # Start additional HTTP server on port 8081 for dashboard access
         def start_http_server():
@@ -1755,14 +6215,9 @@ Web Interface:  http://localhost:{CONFIG['web_port']}
                 logger.error(f"HTTP server failed: {e}")
         
         # Start HTTP server in background thread
-        import threading
         http_thread = threading.Thread(target=start_http_server, daemon=True)
         http_thread.start()
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
-        
         logger.info("PIMIC Audio Server (Pure Python) started successfully")
         
         try:
@@ -1780,10 +6235,15 @@ Web Interface:  http://localhost:{CONFIG['web_port']}
         if self.http_server:
             self.http_server.shutdown()
         
+        if self.async_server:
+            self.async_server.stop()
+        
         # Stop all stream servers
         for stream in active_streams.values():
             if 'server' in stream:
                 stream['server'].stop()
+        if global_ingest_server is not None:
+            global_ingest_server.stop()
         
         logger.info("PIMIC Audio Server stopped")
         sys.exit(0)
@@ -1792,10 +6252,16 @@ Web Interface:  http://localhost:{CONFIG['web_port']}
 if __name__ == "__main__":
     try:
         # Check Python version
-        if sys.version_info < (3, 6):
-            print("❌ Python 3.6+ required")
+        if sys.version_info < (3, 7):
+            print("❌ Python 3.7+ required")
             sys.exit(1)
         
+        # Server mode: asyncio by default, --threaded (or PIMIC_SERVER_MODE=threaded) as fallback
+        if '--threaded' in sys.argv[1:]:
+            CONFIG['server_mode'] = 'threaded'
+        elif '--asyncio' in sys.argv[1:]:
+            CONFIG['server_mode'] = 'asyncio'
+        
         print(f"🐍 Starting with Python {sys.version.split()[0]}")
         print("✅ All dependencies available in standard library")
         
@@ -1807,4 +6273,3 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Server startup failed: {e}")
         print(f"❌ Startup Error: {e}")
-        sys.exit(1)
\ No newline at end of file
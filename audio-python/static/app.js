@@ -9,6 +9,8 @@ class PimicAudioClient {
         this.canvas = null;
         this.ctx = null;
         this.eventSource = null;
+        this.pushSocket = null;
+        this.pollingTimer = null;
         this.lastLevelSendTime = 0;
         this.levelSendInterval = 500; // 500ms = 2 requests per second max
         
@@ -18,7 +20,8 @@ class PimicAudioClient {
         this.recordedChunks = [];
         this.clientIP = null;
         this.streamPort = 9420;
-        // streamWebSocket removed - using HTTP streaming
+        // One WebSocket per microphone session; HTTP uploads are the fallback
+        this.audioSocket = null;
         
         this.init();
     }
@@ -29,6 +32,7 @@ class PimicAudioClient {
         this.connectEventSource();
         await this.detectClientIP();
         this.loadData();
+        this.connectPushSocket();
         this.updateConnectionStatus('🟢 Python Service Aktiv');
     }
     
@@ -54,9 +58,6 @@ class PimicAudioClient {
         document.getElementById('shareStreamBtn').addEventListener('click', () => {
             this.shareStreamUrl();
         });
-        
-        // Refresh data periodically
-        setInterval(() => this.loadData(), 5000);
     }
     
     setupAudioMeter() {
@@ -68,7 +69,9 @@ class PimicAudioClient {
     connectEventSource() {
         // Use Server-Sent Events instead of WebSocket for simplicity
         try {
-            this.eventSource = new EventSource('/api/events');
+            // Streams and network info arrive over the push socket;
+            // the event stream only carries config and heartbeats here
+            this.eventSource = new EventSource('/api/events?topics=config');
             
             this.eventSource.onopen = () => {
                 console.log('Event source connected');
@@ -84,13 +87,61 @@ class PimicAudioClient {
             };
             
             this.eventSource.onerror = () => {
+                // EventSource reconnects on its own (server sends retry: 3000)
                 console.log('Event source error, reconnecting...');
-                setTimeout(() => this.connectEventSource(), 3000);
             };
             
         } catch (error) {
             console.log('Event source not supported, using polling');
-            setInterval(() => this.loadData(), 2000);
+            this.startPolling();
+        }
+    }
+    
+    connectPushSocket() {
+        // One persistent WebSocket replaces the periodic REST polling
+        if (!('WebSocket' in window)) {
+            this.startPolling();
+            return;
+        }
+        
+        const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+        this.pushSocket = new WebSocket(`${protocol}//${location.host}/ws`);
+        
+        this.pushSocket.onopen = () => {
+            console.log('Push socket connected');
+            this.stopPolling();
+            this.pushSocket.send(JSON.stringify({
+                type: 'subscribe',
+                topics: ['streams', 'network']
+            }));
+        };
+        
+        this.pushSocket.onmessage = (event) => {
+            try {
+                this.handleServerEvent(JSON.parse(event.data));
+            } catch (e) {
+                console.log('Non-JSON push message received:', event.data);
+            }
+        };
+        
+        this.pushSocket.onclose = () => {
+            console.log('Push socket closed, polling until reconnect...');
+            this.pushSocket = null;
+            this.startPolling();
+            setTimeout(() => this.connectPushSocket(), 5000);
+        };
+    }
+    
+    startPolling() {
+        if (!this.pollingTimer) {
+            this.pollingTimer = setInterval(() => this.loadData(), 5000);
+        }
+    }
+    
+    stopPolling() {
+        if (this.pollingTimer) {
+            clearInterval(this.pollingTimer);
+            this.pollingTimer = null;
         }
     }
     
@@ -147,6 +198,12 @@ class PimicAudioClient {
             case 'heartbeat':
                 // Keep connection alive
                 break;
+            case 'streams':
+                this.updateStreamsList(data.streams);
+                break;
+            case 'network':
+                this.updateNetworkInfo(data.network);
+                break;
         }
     }
     
@@ -260,9 +317,12 @@ class PimicAudioClient {
     
     async startAudioStreamToPi(port, bitrate) {
         try {
-            // Use HTTP polling for audio streaming instead of WebSocket
-            console.log('Starting HTTP-based audio streaming to Pi');
-            this.useHttpAudioStreaming = true;
+            // Prefer one persistent WebSocket for the whole session
+            this.audioSocket = await this.openAudioSocket();
+            this.useHttpAudioStreaming = !this.audioSocket;
+            console.log(`Starting ${this.useHttpAudioStreaming ? 'HTTP' : 'WebSocket'}-based audio streaming to Pi`);
+            // Uploads may complete out of order; the server reorders them by sequence
+            this.uploadSequence = 0;
             
             // Setup MediaRecorder to send audio to Pi
             this.mediaRecorder = new MediaRecorder(this.mediaStream, {
@@ -273,8 +333,12 @@ class PimicAudioClient {
             this.mediaRecorder.ondataavailable = (event) => {
                 console.log(`MediaRecorder data available: ${event.data.size} bytes`);
                 if (event.data.size > 0) {
-                    // Send audio data via HTTP POST instead of WebSocket
-                    this.sendAudioDataViaHttp(event.data);
+                    if (this.audioSocket && this.audioSocket.readyState === WebSocket.OPEN) {
+                        this.audioSocket.send(event.data);
+                    } else {
+                        // WebSocket unavailable or lost: fall back to HTTP uploads
+                        this.sendAudioDataViaHttp(event.data);
+                    }
                 }
             };
             
@@ -285,7 +349,7 @@ class PimicAudioClient {
             // Start recording in small chunks for live streaming
             this.mediaRecorder.start(100); // 100ms chunks
             
-            console.log(`Audio stream to Pi started: ${bitrate}kbps, format: audio/webm via HTTP`);
+            console.log(`Audio stream to Pi started: ${bitrate}kbps, format: audio/webm via ${this.useHttpAudioStreaming ? 'HTTP' : 'WebSocket'}`);
             console.log(`MediaRecorder state: ${this.mediaRecorder.state}`);
             
         } catch (error) {
@@ -294,16 +358,55 @@ class PimicAudioClient {
         }
     }
     
+    openAudioSocket() {
+        // Resolves with an open ingest socket, or null to use HTTP uploads
+        if (!('WebSocket' in window)) {
+            return Promise.resolve(null);
+        }
+        
+        return new Promise((resolve) => {
+            const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+            const socket = new WebSocket(`${protocol}//${location.host}/ws/audio-stream`);
+            const timeout = setTimeout(() => {
+                socket.close();
+                resolve(null);
+            }, 3000);
+            
+            socket.onopen = () => {
+                clearTimeout(timeout);
+                socket.send(JSON.stringify({
+                    type: 'config',
+                    format: 'audio/webm;codecs=opus',
+                    clientIP: this.clientIP || ''
+                }));
+                resolve(socket);
+            };
+            socket.onerror = () => {
+                clearTimeout(timeout);
+                resolve(null);
+            };
+            socket.onclose = () => {
+                if (this.audioSocket === socket) {
+                    console.warn('Audio WebSocket closed, continuing via HTTP uploads');
+                    this.audioSocket = null;
+                    this.useHttpAudioStreaming = true;
+                }
+            };
+        });
+    }
+    
     async sendAudioDataViaHttp(audioBlob) {
         try {
-            const formData = new FormData();
-            formData.append('audio', audioBlob, 'audio.webm');
-            formData.append('clientIP', this.clientIP);
-            formData.append('timestamp', Date.now());
-            
-            const response = await fetch('/api/audio/upload', {
+            // Raw upload: the blob is the body, metadata goes in headers
+            const response = await fetch('/api/audio/raw', {
                 method: 'POST',
-                body: formData
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-Client-IP': this.clientIP || '',
+                    'X-Audio-Timestamp': String(Date.now()),
+                    'X-Audio-Sequence': String(this.uploadSequence++)
+                },
+                body: audioBlob
             });
             
             if (response.ok) {
@@ -353,7 +456,11 @@ class PimicAudioClient {
             this.mediaRecorder = null;
         }
         
-        // WebSocket cleanup removed - using HTTP streaming
+        if (this.audioSocket) {
+            const socket = this.audioSocket;
+            this.audioSocket = null;
+            socket.close();
+        }
         
         if (this.audioContext) {
             this.audioContext.close();